@@ -4,15 +4,19 @@ load_dotenv()
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .db import Base, engine
+from .db import async_engine
+from .migrate import DB_AUTO_MIGRATE, upgrade_db
 from .router import ingredients, waste, recipes, auth
 from app.services.recipe_ai_service import init_recipe_rag
+from app.services.embed_model import warm_up as warm_up_embed_model
+from fastapi.concurrency import run_in_threadpool
 import os
 print("Loaded API KEY:", os.getenv("GEMINI_API_KEY"))
 
 
-# DB 테이블 생성
-Base.metadata.create_all(bind=engine)
+# DB 스키마를 최신 마이그레이션으로 (테이블 생성 포함)
+if DB_AUTO_MIGRATE:
+    upgrade_db()
 
 app = FastAPI(
     title="Smart Fridge Backend",
@@ -48,6 +52,18 @@ app.include_router(recipes.router)
 #     init_recipe_rag()
 
 
+# 임베딩 모델 워밍업 (EMBED_WARMUP=1 일 때만, 실패해도 서버는 뜬다)
+@app.on_event("startup")
+async def warm_up_models():
+    await run_in_threadpool(warm_up_embed_model)
+
+
+# async DB 커넥션 풀 정리
+@app.on_event("shutdown")
+async def close_async_db():
+    await async_engine.dispose()
+
+
 # 헬스 체크용 엔드포인트
 @app.get("/health")
 def health_check():
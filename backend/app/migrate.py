@@ -0,0 +1,108 @@
+# app/migrate.py
+import os
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from app.db import Base, engine as default_engine
+
+# =====================================
+# 서버 시작 시 스키마를 최신 리비전으로 (alembic upgrade head)
+#  - 마이그레이션 도입 전 create_all 로 만든 DB(alembic_version 없음 + 테이블 있음)는
+#    0001(초기 스키마)로 stamp 한 뒤 이후 리비전만 적용
+#  - uvicorn 워커 여러 개가 동시에 import 해도 한 번만 적용되도록 잠금
+#      SQLite     : DB 파일 옆 <db>.migrate.lock 파일 잠금
+#      PostgreSQL : pg_advisory_xact_lock (트랜잭션 끝나면 자동 해제)
+#    잠금을 잡은 뒤 alembic_version 을 다시 읽어서, 먼저 끝낸 워커가 있으면 건너뜀
+#  - 배포 단계에서 `alembic upgrade head` (backend/ 에서)를 따로 돌린다면 DB_AUTO_MIGRATE=0
+#  - alembic 이 없으면 예전처럼 create_all (서버는 뜬다)
+# =====================================
+
+DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "1") == "1"
+
+BASE_DIR = Path(__file__).resolve().parent  # app/
+ALEMBIC_INI = BASE_DIR.parent / "alembic.ini"
+MIGRATIONS_DIR = BASE_DIR / "migrations"
+BASELINE_REVISION = "0001"
+# pg_advisory_xact_lock 키 (이 앱의 마이그레이션 전용 임의 값)
+MIGRATION_LOCK_KEY = 7321023
+
+
+def _alembic_config():
+    from alembic.config import Config
+
+    cfg = Config(str(ALEMBIC_INI)) if ALEMBIC_INI.exists() else Config()
+    # 실행 위치(cwd)와 무관하게 찾도록 절대 경로로
+    cfg.set_main_option("script_location", str(MIGRATIONS_DIR))
+    cfg.attributes["configure_logger"] = False  # 서버 로깅 설정을 덮어쓰지 않음
+    return cfg
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """프로세스 간 배타 잠금 (다른 프로세스가 풀 때까지 대기)."""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)  # 약 10초 재시도 후 OSError
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _sqlite_lock(engine: Engine):
+    database = engine.url.database
+    if engine.dialect.name != "sqlite" or not database or database == ":memory:":
+        return nullcontext()
+    return _file_lock(Path(database).resolve().with_name(Path(database).name + ".migrate.lock"))
+
+
+def upgrade_db(engine: Engine = default_engine) -> None:
+    try:
+        from alembic import command
+        from alembic.runtime.migration import MigrationContext
+        from alembic.script import ScriptDirectory
+    except ImportError:
+        print("[WARN] alembic 미설치 → create_all 로 테이블만 생성 (인덱스 마이그레이션 없음)")
+        Base.metadata.create_all(bind=engine)
+        return
+
+    cfg = _alembic_config()
+    head = ScriptDirectory.from_config(cfg).get_current_head()
+
+    with _sqlite_lock(engine), engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+
+        # 잠금을 기다리는 동안 다른 워커가 이미 올렸을 수 있음 → 잠금 후 다시 확인
+        if MigrationContext.configure(conn).get_current_revision() == head:
+            return
+
+        cfg.attributes["connection"] = conn
+
+        tables = set(inspect(conn).get_table_names())
+        if "alembic_version" not in tables and "users" in tables:
+            print(f"[INFO] 기존 DB를 마이그레이션 {BASELINE_REVISION} 으로 표시 (stamp)")
+            command.stamp(cfg, BASELINE_REVISION)
+
+        command.upgrade(cfg, "head")
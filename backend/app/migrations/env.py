@@ -0,0 +1,63 @@
+# app/migrations/env.py
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.db import DATABASE_URL, make_engine
+from app import models
+
+# -------------------------------------------------------------------
+# alembic 실행 환경
+#  - 연결: config에 connection이 넘어오면 그대로 (app.migrate.upgrade_db),
+#          아니면 app.db.make_engine() 으로 DATABASE_URL 에 연결 (alembic CLI)
+#  - SQLite는 ALTER 제약이 많아서 batch 모드(테이블 재생성)로 autogenerate
+# -------------------------------------------------------------------
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = models.Base.metadata
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=DATABASE_URL.startswith("sqlite"),
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def _run(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run(connection)
+        return
+
+    engine = make_engine()
+    try:
+        with engine.connect() as connection:
+            _run(connection)
+    finally:
+        engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
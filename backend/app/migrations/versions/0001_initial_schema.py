@@ -0,0 +1,111 @@
+"""initial schema (create_all 시절 테이블 그대로)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+
+마이그레이션 도입 전에 Base.metadata.create_all 로 만들어진 DB는
+app.migrate.upgrade_db() 가 이 리비전으로 stamp 한 뒤 이후 리비전만 적용한다.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("password_hash", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "fridge_ingredients",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("category", sa.String(), nullable=True),
+        sa.Column("quantity", sa.Float(), nullable=True),
+        sa.Column("unit", sa.String(), nullable=True),
+        sa.Column("registered_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+        sa.Column("expected_expiry", sa.Date(), nullable=True),
+        sa.Column(
+            "status",
+            sa.Enum("FRESH", "WARNING", "EXPIRED", name="fridgeingredientstatus"),
+            nullable=False,
+        ),
+        sa.Column("image_path", sa.String(), nullable=True),
+    )
+    op.create_index("ix_fridge_ingredients_id", "fridge_ingredients", ["id"])
+
+    op.create_table(
+        "food_waste",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("ingredient_name", sa.String(), nullable=False),
+        sa.Column("amount_gram", sa.Float(), nullable=False),
+        sa.Column("discarded_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+        sa.Column("reason", sa.String(), nullable=True),
+    )
+    op.create_index("ix_food_waste_id", "food_waste", ["id"])
+
+    op.create_table(
+        "recipes",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("ingredients", sa.JSON(), nullable=False),
+        sa.Column("instructions", sa.String(), nullable=True),
+        sa.Column("source_url", sa.String(), nullable=True),
+        sa.Column("image_url", sa.String(), nullable=True),
+        sa.Column("calories", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+        sa.Column("source_type", sa.String(), nullable=True),
+    )
+    op.create_index("ix_recipes_id", "recipes", ["id"])
+
+    op.create_table(
+        "favorite_recipes",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("recipe_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+    )
+    op.create_index("ix_favorite_recipes_id", "favorite_recipes", ["id"])
+
+    op.create_table(
+        "recipe_history",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("recipe_id", sa.Integer(), nullable=False),
+        sa.Column("cooked_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+        sa.Column("rating", sa.Float(), nullable=True),
+        sa.Column("memo", sa.String(), nullable=True),
+    )
+    op.create_index("ix_recipe_history_id", "recipe_history", ["id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in (
+        "recipe_history",
+        "favorite_recipes",
+        "recipes",
+        "food_waste",
+        "fridge_ingredients",
+        "users",
+    ):
+        op.drop_table(table)
+    sa.Enum(name="fridgeingredientstatus").drop(op.get_bind(), checkfirst=True)
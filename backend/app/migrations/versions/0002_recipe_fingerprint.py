@@ -0,0 +1,152 @@
+"""recipes.fingerprint: 중복 레시피 병합 + unique 인덱스
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+
+create_all 로 이미 컬럼/인덱스가 생긴 DB도 있으므로 있으면 건너뛴다.
+지문/병합 로직은 이 리비전 작성 시점 그대로 아래에 고정 (앱 코드 import 없음).
+  - 재료 정규화는 수량/괄호/수식어/공백 정리까지만 (동의어 사전은 적용하지 않음)
+    → 표기만 다른 중복은 남을 수 있다. 현재 정규화 규칙으로 다시 맞추려면
+      python -m app.scripts.compact_recipes  (backend/ 에서)
+"""
+import hashlib
+import re
+import unicodedata
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SCAN_BATCH = 1000
+
+_BRACKETS = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+# 단위 뒤에 글자가 이어지면 단위가 아니라 다음 단어의 첫 글자 ("1 lemon", "2 large eggs")
+_QUANTITY = re.compile(
+    r"\d+(?:[./]\d+)?\s*"
+    r"(?:(?:kg|mg|g|ml|l|개|컵|큰술|작은술|스푼|숟가락|줌|쪽|장|모|봉지|봉|팩|대|알|마리|조각|cm|인분"
+    r"|tbsp|tsp|cups?|pcs|lbs?|oz)(?![a-z가-힣]))?"
+)
+_AMOUNT_WORDS = re.compile(r"약간|적당량|조금|소량|한줌|반개|to taste")
+_MODIFIERS = {
+    "다진", "채썬", "송송썬", "썬", "깐", "데친", "삶은", "볶은", "말린", "익힌", "남은",
+    "냉동", "냉장", "국산", "수입", "신선한", "손질된", "잘게", "굵게", "큰", "작은",
+    "fresh", "chopped", "minced", "sliced", "diced", "frozen", "large", "medium", "small",
+    "raw", "boiled", "dried", "whole", "organic",
+}
+
+_recipes = sa.table(
+    "recipes",
+    sa.column("id", sa.Integer),
+    sa.column("title", sa.String),
+    sa.column("ingredients", sa.JSON),
+    sa.column("instructions", sa.Text),
+    sa.column("fingerprint", sa.String),
+)
+
+
+def _norm_text(text: Any) -> str:
+    text = unicodedata.normalize("NFKC", str(text or "")).lower()
+    return " ".join(text.split())
+
+
+def _norm_ingredient(name: Any) -> str:
+    text = unicodedata.normalize("NFKC", str(name)).lower()
+    text = _BRACKETS.sub(" ", text)
+    text = _AMOUNT_WORDS.sub(" ", text)
+    text = _QUANTITY.sub(" ", text)
+    return "".join(t for t in text.split() if t not in _MODIFIERS)
+
+
+def _fingerprint(title: Any, ingredients: Any, instructions: Any) -> str:
+    ings = sorted({_norm_ingredient(i) for i in (ingredients or [])} - {""})
+    payload = "\x1f".join([_norm_text(title), "\x1e".join(ings), _norm_text(instructions)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _scan(bind) -> Tuple[List[Tuple[int, int]], List[Tuple[int, str]]]:
+    """id 순 배치 스캔 → ([(중복 id, 대표 id)], [(대표 id, 지문)]). 지문별 가장 작은 id가 대표."""
+    canonical: Dict[str, int] = {}
+    duplicates: List[Tuple[int, int]] = []
+    fingerprints: List[Tuple[int, str]] = []
+
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(_recipes.c.id, _recipes.c.title, _recipes.c.ingredients, _recipes.c.instructions)
+            .where(_recipes.c.id > last_id)
+            .order_by(_recipes.c.id)
+            .limit(SCAN_BATCH)
+        ).all()
+        if not rows:
+            break
+        for rid, title, ingredients, instructions in rows:
+            fp = _fingerprint(title, ingredients, instructions)
+            if fp in canonical:
+                duplicates.append((rid, canonical[fp]))
+            else:
+                canonical[fp] = rid
+                fingerprints.append((rid, fp))
+        last_id = rows[-1][0]
+
+    return duplicates, fingerprints
+
+
+def _merge(bind) -> None:
+    duplicates, fingerprints = _scan(bind)
+
+    if duplicates:
+        # 즐겨찾기는 중복 행 하나씩 순서대로 (삭제 → 이동): 같은 사용자가 중복 행 여러 개를
+        # 즐겨찾기했어도 대표 행에는 하나만 남는다 (병합으로 생긴 중복을 0003 이 막지 않게)
+        for dup, canon in duplicates:
+            params = {"dup": dup, "canon": canon}
+            bind.execute(
+                sa.text(
+                    "DELETE FROM favorite_recipes WHERE recipe_id = :dup AND user_id IN "
+                    "(SELECT user_id FROM favorite_recipes WHERE recipe_id = :canon)"
+                ),
+                params,
+            )
+            bind.execute(sa.text("UPDATE favorite_recipes SET recipe_id = :canon WHERE recipe_id = :dup"), params)
+
+        params = [{"dup": dup, "canon": canon} for dup, canon in duplicates]
+        bind.execute(sa.text("UPDATE recipe_history SET recipe_id = :canon WHERE recipe_id = :dup"), params)
+        bind.execute(sa.text("DELETE FROM recipes WHERE id = :dup"), params)
+        print(f"[INFO] 중복 레시피 {len(duplicates)}개를 대표 행으로 병합")
+
+    # 중복이 지워진 뒤에 채워야 unique 충돌이 없다 (옛 지문은 먼저 비움)
+    if fingerprints:
+        bind.execute(sa.text("UPDATE recipes SET fingerprint = NULL"))
+        bind.execute(
+            sa.text("UPDATE recipes SET fingerprint = :fp WHERE id = :id"),
+            [{"id": rid, "fp": fp} for rid, fp in fingerprints],
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if "fingerprint" not in {c["name"] for c in inspector.get_columns("recipes")}:
+        op.add_column("recipes", sa.Column("fingerprint", sa.String(length=64), nullable=True))
+
+    _merge(bind)
+
+    if "ix_recipes_fingerprint" not in {i["name"] for i in inspector.get_indexes("recipes")}:
+        op.create_index("ix_recipes_fingerprint", "recipes", ["fingerprint"], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_recipes_fingerprint", table_name="recipes")
+    with op.batch_alter_table("recipes") as batch_op:
+        batch_op.drop_column("fingerprint")
@@ -0,0 +1,110 @@
+"""목록 조회용 복합 인덱스 + recipe_id 외래키
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+
+모든 목록 API가 user_id 로 거르고 시간순 정렬하므로 (user_id, 시간) 복합 인덱스로
+사용자 수/기록이 늘어도 전체 테이블 스캔 + 정렬이 생기지 않게 한다.
+  food_waste          (user_id, discarded_at)
+  recipe_history      (user_id, cooked_at), (recipe_id), recipe_id → recipes.id
+  favorite_recipes    (user_id, recipe_id) unique, (recipe_id), recipe_id → recipes.id
+  fridge_ingredients  (user_id, expected_expiry)
+
+unique 인덱스/외래키를 만들 수 없는 행(중복 즐겨찾기, 없는 레시피를 가리키는 행)이 있으면
+자동으로 지우지 않고 멈춘다. 건수를 확인한 뒤 명시적으로 정리하며 적용:
+  alembic -x prune=1 upgrade head   (backend/ 에서)
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 정리 대상: (테이블, 설명, WHERE 조건)
+_BLOCKERS = [
+    (
+        "favorite_recipes",
+        "같은 사용자의 중복 즐겨찾기 (가장 먼저 등록한 것만 남김)",
+        "EXISTS (SELECT 1 FROM favorite_recipes f2"
+        " WHERE f2.user_id = favorite_recipes.user_id"
+        " AND f2.recipe_id = favorite_recipes.recipe_id"
+        " AND f2.id < favorite_recipes.id)",
+    ),
+    ("favorite_recipes", "없는 레시피를 가리키는 즐겨찾기", "recipe_id NOT IN (SELECT id FROM recipes)"),
+    ("recipe_history", "없는 레시피를 가리키는 조리 기록", "recipe_id NOT IN (SELECT id FROM recipes)"),
+]
+
+
+def _resolve_blockers(bind) -> None:
+    """unique/외래키를 막는 행: 기본은 건수만 보고 중단, -x prune=1 이면 삭제."""
+    prune = context.get_x_argument(as_dictionary=True).get("prune") == "1"
+
+    found = []
+    for table, label, cond in _BLOCKERS:
+        count = bind.execute(sa.text(f"SELECT COUNT(*) FROM {table} WHERE {cond}")).scalar()
+        if not count:
+            continue
+        if prune:
+            bind.execute(sa.text(f"DELETE FROM {table} WHERE {cond}"))
+            print(f"[WARN] {table}: {label} {count}건 삭제")
+        else:
+            found.append(f"{table}: {label} {count}건")
+
+    if found:
+        raise RuntimeError(
+            "마이그레이션 0003 을 적용하려면 아래 행을 정리해야 합니다 (자동 삭제하지 않음).\n  "
+            + "\n  ".join(found)
+            + "\n확인 후 backend/ 에서 `alembic -x prune=1 upgrade head` 로 정리하며 적용하세요."
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # unique 인덱스/외래키 전에 걸리는 행 확인 (암묵적으로 지우지 않음)
+    _resolve_blockers(op.get_bind())
+
+    # SQLite는 외래키 추가에 테이블 재생성이 필요 → batch 모드
+    with op.batch_alter_table("favorite_recipes") as batch_op:
+        batch_op.create_foreign_key(
+            "fk_favorite_recipes_recipe_id_recipes", "recipes", ["recipe_id"], ["id"]
+        )
+        batch_op.create_index("ix_favorite_recipes_recipe_id", ["recipe_id"])
+        batch_op.create_index(
+            "ux_favorite_recipes_user_recipe", ["user_id", "recipe_id"], unique=True
+        )
+
+    with op.batch_alter_table("recipe_history") as batch_op:
+        batch_op.create_foreign_key(
+            "fk_recipe_history_recipe_id_recipes", "recipes", ["recipe_id"], ["id"]
+        )
+        batch_op.create_index("ix_recipe_history_recipe_id", ["recipe_id"])
+        batch_op.create_index("ix_recipe_history_user_cooked", ["user_id", "cooked_at"])
+
+    op.create_index("ix_food_waste_user_discarded", "food_waste", ["user_id", "discarded_at"])
+    op.create_index(
+        "ix_fridge_ingredients_user_expiry", "fridge_ingredients", ["user_id", "expected_expiry"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_fridge_ingredients_user_expiry", table_name="fridge_ingredients")
+    op.drop_index("ix_food_waste_user_discarded", table_name="food_waste")
+
+    with op.batch_alter_table("recipe_history") as batch_op:
+        batch_op.drop_index("ix_recipe_history_user_cooked")
+        batch_op.drop_index("ix_recipe_history_recipe_id")
+        batch_op.drop_constraint("fk_recipe_history_recipe_id_recipes", type_="foreignkey")
+
+    with op.batch_alter_table("favorite_recipes") as batch_op:
+        batch_op.drop_index("ux_favorite_recipes_user_recipe")
+        batch_op.drop_index("ix_favorite_recipes_recipe_id")
+        batch_op.drop_constraint("fk_favorite_recipes_recipe_id_recipes", type_="foreignkey")
@@ -0,0 +1,42 @@
+"""키셋 페이지네이션용 (user_id, 시각, id) 인덱스
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+
+목록 API가 (시각, id) 내림차순 + "(시각, id) < 커서" 로 조회하므로 id 까지 인덱스에 넣어
+정렬/범위 조건을 모두 인덱스로 처리 (SQLite는 rowid가 암묵적으로 붙지만 PostgreSQL은 아님).
+즐겨찾기는 최근 등록 순으로 정렬하게 되어 (user_id, created_at, id) 추가.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index("ix_food_waste_user_discarded", table_name="food_waste")
+    op.create_index("ix_food_waste_user_discarded", "food_waste", ["user_id", "discarded_at", "id"])
+
+    op.drop_index("ix_recipe_history_user_cooked", table_name="recipe_history")
+    op.create_index("ix_recipe_history_user_cooked", "recipe_history", ["user_id", "cooked_at", "id"])
+
+    op.create_index("ix_favorite_recipes_user_created", "favorite_recipes", ["user_id", "created_at", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_favorite_recipes_user_created", table_name="favorite_recipes")
+
+    op.drop_index("ix_recipe_history_user_cooked", table_name="recipe_history")
+    op.create_index("ix_recipe_history_user_cooked", "recipe_history", ["user_id", "cooked_at"])
+
+    op.drop_index("ix_food_waste_user_discarded", table_name="food_waste")
+    op.create_index("ix_food_waste_user_discarded", "food_waste", ["user_id", "discarded_at"])
@@ -8,7 +8,9 @@ from sqlalchemy import (
     Date,
     Enum,
     ForeignKey,
+    Index,
 )
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .db import Base
 import enum
@@ -43,6 +45,10 @@ class FridgeIngredient(Base):
     1인 가구 식재료 관리 + 유통기한 자동화의 핵심 테이블
     """
     __tablename__ = "fridge_ingredients"
+    __table_args__ = (
+        # 사용자별 냉장고 조회 + 유통기한 임박 순 정렬
+        Index("ix_fridge_ingredients_user_expiry", "user_id", "expected_expiry"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # ★ 사용자별 냉장고
@@ -68,6 +74,11 @@ class FoodWaste(Base):
     주간/월간 비교, 감소량 분석, 포인트 연동 등에 사용
     """
     __tablename__ = "food_waste"
+    __table_args__ = (
+        Index("ix_food_waste_user_discarded", "user_id", "discarded_at", "id"),  # 키셋 페이지네이션
+    )
+    # INSERT ... RETURNING 으로 discarded_at(서버 기본값)까지 받아옴 → refresh 쿼리 불필요
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # ★ 사용자별 기록
@@ -95,6 +106,8 @@ class Recipe(Base):
     created_at = Column(DateTime, server_default=func.now())
     # AI 생성인지, 외부 검색인지 구분할 수 있는 플래그
     source_type = Column(String, default="ai")          # ai / web / user 등
+    # 같은 레시피 중복 저장 방지용 내용 지문 (제목 + 재료 + 조리 순서 정규화 → sha256)
+    fingerprint = Column(String(64), nullable=True, unique=True, index=True)
 
 
 class FavoriteRecipe(Base):
@@ -102,22 +115,46 @@ class FavoriteRecipe(Base):
     사용자가 즐겨찾기한 레시피.
     """
     __tablename__ = "favorite_recipes"
+    __table_args__ = (
+        # 같은 레시피를 두 번 즐겨찾기할 수 없음 + 사용자별 목록 조회
+        Index("ux_favorite_recipes_user_recipe", "user_id", "recipe_id", unique=True),
+        Index("ix_favorite_recipes_user_created", "user_id", "created_at", "id"),  # 키셋 페이지네이션
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # ★ 사용자별 즐겨찾기
-    recipe_id = Column(Integer, nullable=False)        # Recipe.id 참조
+    recipe_id = Column(
+        Integer,
+        ForeignKey("recipes.id", name="fk_favorite_recipes_recipe_id_recipes"),
+        nullable=False,
+        index=True,
+    )
     created_at = Column(DateTime, server_default=func.now())
 
+    # 목록 조회 시 joinedload 로 함께 읽는다. 실수로 행마다 lazy load(N+1) 하면 바로 에러
+    recipe = relationship("Recipe", lazy="raise")
+
 
 class RecipeHistory(Base):
     """
     실제로 조리한 레시피 기록 (언제, 어떤 레시피, 평점)
     """
     __tablename__ = "recipe_history"
+    __table_args__ = (
+        Index("ix_recipe_history_user_cooked", "user_id", "cooked_at", "id"),  # 키셋 페이지네이션
+    )
+    __mapper_args__ = {"eager_defaults": True}  # cooked_at 도 INSERT 에서 바로
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # ★ 사용자별 히스토리
-    recipe_id = Column(Integer, nullable=False)        # Recipe.id 참조
+    recipe_id = Column(
+        Integer,
+        ForeignKey("recipes.id", name="fk_recipe_history_recipe_id_recipes"),
+        nullable=False,
+        index=True,
+    )
     cooked_at = Column(DateTime, server_default=func.now())
     rating = Column(Float, nullable=True)              # 평점 (1~5 등)
     memo = Column(String, nullable=True)               # 메모 (선택)
+
+    recipe = relationship("Recipe", lazy="raise")
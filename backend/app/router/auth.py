@@ -1,21 +1,23 @@
 # app/router/auth.py
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db import get_db
+from app.db import get_async_db
 from app import models, schemas
-from app.services.auth_service import hash_password, verify_password, get_current_user
+from app.services.auth_service import hash_password, verify_password, get_current_user_async
 from app.services.jwt_service import create_access_token
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/register", response_model=schemas.UserOut)
-def register(user_in: schemas.UserCreate, db: Session = Depends(get_db)):
+async def register(user_in: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     회원가입
     """
-    existed = db.query(models.User).filter(models.User.email == user_in.email).first()
+    existed = await db.scalar(select(models.User).where(models.User.email == user_in.email))
     if existed:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -25,21 +27,22 @@ def register(user_in: schemas.UserCreate, db: Session = Depends(get_db)):
     user = models.User(
         email=user_in.email,
         name=user_in.name,
-        password_hash=hash_password(user_in.password),
+        # bcrypt는 CPU를 오래 쓰므로 이벤트 루프 밖에서
+        password_hash=await run_in_threadpool(hash_password, user_in.password),
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 
 @router.post("/login", response_model=schemas.Token)
-def login(payload: schemas.UserLogin, db: Session = Depends(get_db)):
+async def login(payload: schemas.UserLogin, db: AsyncSession = Depends(get_async_db)):
     """
     로그인 → JWT 토큰 발급
     """
-    user = db.query(models.User).filter(models.User.email == payload.email).first()
-    if not user or not verify_password(payload.password, user.password_hash):
+    user = await db.scalar(select(models.User).where(models.User.email == payload.email))
+    if not user or not await run_in_threadpool(verify_password, payload.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid email or password",
@@ -53,7 +56,7 @@ def login(payload: schemas.UserLogin, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=schemas.UserOut)
-def get_me(current_user: models.User = Depends(get_current_user)):
+async def get_me(current_user: models.User = Depends(get_current_user_async)):
     """
     내 정보 조회
     """
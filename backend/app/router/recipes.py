@@ -1,141 +1,301 @@
 # app/router/recipes.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import asyncio
 
-from app.db import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.db import AsyncSessionLocal, get_async_db
 from app import models, schemas
-from app.services.recipe_ai_service import suggest_recipes_from_ingredients
-from app.services.auth_service import get_current_user
+from app.services.recipe_ai_service import (
+    stream_recipe_suggestions,
+    suggest_recipes_from_ingredients_async,
+)
+from app.services import recipe_cache
+from app.services.recipe_store import save_recipes
+from app.services.auth_service import get_current_user_async
+from app.services.llm_async import run_llm_request
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page
+from app.services.recipe_index import urgency_bonus
+from app.services.sse import SSE_HEADERS, sse_event
 
 router = APIRouter(prefix="/api/recipes", tags=["recipes"])
 
 
+async def _fridge_expiries(db: AsyncSession, user_id: int, names: list[str]) -> dict:
+    """
+    요청 재료 중 사용자 냉장고에 있는 것들의 예상 유통기한 (재료명 → date).
+    같은 이름이 여러 개면 가장 빠른 유통기한을 쓴다.
+    """
+    rows = await db.execute(
+        select(models.FridgeIngredient.name, models.FridgeIngredient.expected_expiry)
+        .where(
+            models.FridgeIngredient.user_id == user_id,
+            models.FridgeIngredient.name.in_(names),
+            models.FridgeIngredient.expected_expiry.isnot(None),
+        )
+    )
+
+    expiries: dict = {}
+    for name, expiry in rows:
+        if name not in expiries or expiry < expiries[name]:
+            expiries[name] = expiry
+    return expiries
+
+
+async def _save_suggestions(
+    db: AsyncSession,
+    suggestions: list[schemas.RecipeSuggestion],
+) -> list[models.Recipe]:
+    # 같은 내용의 레시피는 새로 만들지 않고 기존 행 재사용 (fingerprint unique)
+    # recipe_store는 스크립트와 공유하는 동기 코드 → run_sync로 같은 연결에서 실행
+    return await db.run_sync(save_recipes, suggestions)
+
+
+def _urgent_names(expiries: dict) -> list[str]:
+    """순위에 보너스가 붙는(유통기한 임박) 재료만. 여유 있는 유통기한은 결과에 영향 없음."""
+    return sorted(name for name, expiry in expiries.items() if urgency_bonus(expiry) > 0)
+
+
+async def _cached_recipes(
+    db: AsyncSession,
+    names: list[str],
+    urgent: list[str],
+) -> list[models.Recipe] | None:
+    """
+    같은 재료 조합(+ 같은 임박 재료)의 이전 추천 결과(기존 Recipe 행)를 캐시에서 찾는다.
+    캐시가 가리키는 행이 하나라도 없으면 캐시를 비우고 None.
+    recipe_cache는 SQLite 파일을 읽고 쓰는 동기 코드 → 스레드에서 실행
+    """
+    ids = await asyncio.to_thread(recipe_cache.get_recipe_ids, names, urgent)
+    if not ids:
+        return None
+
+    by_id = {
+        r.id: r
+        for r in await db.scalars(select(models.Recipe).where(models.Recipe.id.in_(ids)))
+    }
+    if len(by_id) != len(set(ids)):
+        await asyncio.to_thread(recipe_cache.invalidate, names, urgent)
+        return None
+    return [by_id[i] for i in ids]
+
+
+async def _remember_suggestions(
+    names: list[str],
+    suggestions: list[schemas.RecipeSuggestion],
+    recipes: list[models.Recipe],
+    urgent: list[str],
+) -> None:
+    """
+    Gemini가 정상 생성한 결과만 캐시 (CSV 대체/기능 불가 안내는 다음 요청에서 다시 시도).
+    임박 재료가 순위에 반영된 결과는 임박 재료 조합을 키에 넣어 따로 저장한다.
+    """
+    if recipes and all(s.source_type == "ai" for s in suggestions):
+        await asyncio.to_thread(recipe_cache.put_recipe_ids, names, [r.id for r in recipes], urgent)
+
+
+async def _save_and_remember(
+    db: AsyncSession,
+    names: list[str],
+    suggestions: list[schemas.RecipeSuggestion],
+    urgent: list[str],
+) -> list[models.Recipe]:
+    recipes = await _save_suggestions(db, suggestions)
+    await _remember_suggestions(names, suggestions, recipes, urgent)
+    return recipes
+
+
 @router.post("/suggest", response_model=list[schemas.RecipeOut])
-def suggest_recipes(
+async def suggest_recipes(
     payload: schemas.RecipeSuggestRequest,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
 ):
     """
     선택한 재료 → AI 레시피 추천 → Recipe 테이블에 저장 (공용)
+    LLM 호출과 DB 조회/저장 모두 async로 기다린다 (스레드풀 점유 없음).
+    같은 재료 조합을 최근에 추천했다면 Gemini 호출 없이 기존 레시피를 돌려준다.
+    (유통기한 임박 재료가 있으면 그 조합까지 같은 요청끼리만 캐시 공유)
     """
     ingredient_names = payload.ingredients
 
     if not ingredient_names:
         raise HTTPException(status_code=400, detail="ingredients 리스트가 비어 있습니다.")
 
-    suggestions = suggest_recipes_from_ingredients(ingredient_names)
-
-    recipe_objs: list[models.Recipe] = []
-    for s in suggestions:
-        r = models.Recipe(
-            title=s.title,
-            ingredients=s.ingredients,
-            instructions=s.instructions,
-            source_url=s.source_url,
-            image_url=s.image_url,
-            calories=s.calories,
-            source_type="ai",
-        )
-        db.add(r)
-        recipe_objs.append(r)
+    # 유통기한 임박 재료를 우선하도록 냉장고 정보 전달
+    expiries = await _fridge_expiries(db, current_user.id, ingredient_names)
+    urgent = _urgent_names(expiries)
+
+    cached = await _cached_recipes(db, ingredient_names, urgent)
+    if cached is not None:
+        return cached
+
+    suggestions = await run_llm_request(
+        request,
+        suggest_recipes_from_ingredients_async(ingredient_names, expiries=expiries),
+    )
+
+    return await _save_and_remember(db, ingredient_names, suggestions, urgent)
+
 
-    db.commit()
-    for r in recipe_objs:
-        db.refresh(r)
+def _recipes_json(recipes: list[models.Recipe]) -> list[dict]:
+    return [jsonable_encoder(schemas.RecipeOut.model_validate(r, from_attributes=True)) for r in recipes]
 
-    return recipe_objs
+
+@router.post("/suggest/stream")
+async def suggest_recipes_stream(
+    payload: schemas.RecipeSuggestRequest,
+    current_user: models.User = Depends(get_current_user_async),
+):
+    """
+    /suggest의 스트리밍(SSE) 버전.
+    event: candidates (참고 CSV 레시피) → event: delta (LLM JSON 조각, 여러 번)
+    → event: recipes (저장된 RecipeOut 리스트) → event: done
+    캐시 hit 이면 바로 event: recipes → event: done (임박 재료 조합까지 같아야 hit)
+    """
+    ingredient_names = payload.ingredients
+
+    if not ingredient_names:
+        raise HTTPException(status_code=400, detail="ingredients 리스트가 비어 있습니다.")
+
+    user_id = current_user.id
+
+    async def events():
+        # 스트리밍 응답 본문은 요청 의존성(get_async_db)이 정리된 뒤에 실행될 수 있으므로 별도 세션.
+        # LLM 스트리밍 동안 DB 연결을 잡고 있지 않도록 조회/저장마다 짧게 연다.
+        try:
+            async with AsyncSessionLocal() as db:
+                expiries = await _fridge_expiries(db, user_id, ingredient_names)
+                urgent = _urgent_names(expiries)
+                cached = await _cached_recipes(db, ingredient_names, urgent)
+            if cached is not None:
+                yield sse_event("recipes", _recipes_json(cached))
+                yield sse_event("done", {})
+                return
+
+            async for event, data in stream_recipe_suggestions(ingredient_names, expiries=expiries):
+                if event == "suggestions":
+                    async with AsyncSessionLocal() as db:
+                        recipes = await _save_and_remember(db, ingredient_names, data, urgent)
+                    yield sse_event("recipes", _recipes_json(recipes))
+                else:
+                    yield sse_event(event, data)
+            yield sse_event("done", {})
+        except asyncio.TimeoutError:
+            yield sse_event("error", {"detail": "AI 응답 시간이 초과되었습니다."})
+        except Exception as e:
+            print(f"[WARN] 레시피 스트리밍 실패: {e}")
+            yield sse_event("error", {"detail": "레시피 추천 중 오류가 발생했습니다."})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
 
 
 @router.post("/favorite/{recipe_id}", response_model=schemas.FavoriteRecipeOut)
-def favorite_recipe(
+async def favorite_recipe(
     recipe_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
 ):
     """
     현재 유저의 즐겨찾기 레시피 등록
     """
-    recipe = db.get(models.Recipe, recipe_id)
+    # (user_id, recipe_id) unique → 이미 즐겨찾기한 레시피면 기존 항목 반환
+    existing = (
+        select(models.FavoriteRecipe)
+        .options(joinedload(models.FavoriteRecipe.recipe))
+        .where(
+            models.FavoriteRecipe.user_id == current_user.id,
+            models.FavoriteRecipe.recipe_id == recipe_id,
+        )
+    )
+    fav = await db.scalar(existing)
+    if fav is not None:
+        return fav
+
+    recipe = await db.get(models.Recipe, recipe_id)
     if not recipe:
         raise HTTPException(status_code=404, detail="Recipe not found")
 
-    fav = models.FavoriteRecipe(user_id=current_user.id, recipe_id=recipe_id)
+    fav = models.FavoriteRecipe(user_id=current_user.id, recipe=recipe)
     db.add(fav)
-    db.commit()
-    db.refresh(fav)
-
-    fav.recipe = recipe
+    try:
+        await db.commit()
+    except IntegrityError:
+        # 동시에 같은 즐겨찾기 요청이 들어온 경우
+        await db.rollback()
+        fav = await db.scalar(existing)
     return fav
 
 
-@router.get("/favorites", response_model=list[schemas.FavoriteRecipeOut])
-def list_favorites(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+@router.get("/favorites", response_model=schemas.Page[schemas.FavoriteRecipeOut])
+async def list_favorites(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
 ):
     """
-    현재 유저의 즐겨찾기 목록 반환
+    현재 유저의 즐겨찾기 목록 (최근 등록 순, 키셋 페이지네이션)
+    레시피는 같은 쿼리에서 JOIN 으로 함께 읽는다.
     """
-    favs = db.query(models.FavoriteRecipe).filter(
-        models.FavoriteRecipe.user_id == current_user.id
-    ).all()
-
-    recipe_map = {
-        r.id: r
-        for r in db.query(models.Recipe).filter(
-            models.Recipe.id.in_([f.recipe_id for f in favs])
-        )
-    }
-    for f in favs:
-        f.recipe = recipe_map.get(f.recipe_id)
-
-    return favs
+    favs, next_cursor = await keyset_page(
+        db,
+        select(models.FavoriteRecipe)
+        .options(joinedload(models.FavoriteRecipe.recipe))
+        .where(models.FavoriteRecipe.user_id == current_user.id),
+        models.FavoriteRecipe.created_at,
+        models.FavoriteRecipe.id,
+        limit,
+        cursor,
+    )
+    return {"items": favs, "next_cursor": next_cursor}
 
 
 @router.post("/history", response_model=schemas.RecipeHistoryOut)
-def add_history(
+async def add_history(
     payload: schemas.RecipeHistoryCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
 ):
-    recipe = db.get(models.Recipe, payload.recipe_id)
+    recipe = await db.get(models.Recipe, payload.recipe_id)
     if not recipe:
         raise HTTPException(status_code=404, detail="Recipe not found")
 
     hist = models.RecipeHistory(
         user_id=current_user.id,
-        recipe_id=payload.recipe_id,
+        recipe=recipe,
         rating=payload.rating,
         memo=payload.memo,
     )
     db.add(hist)
-    db.commit()
-    db.refresh(hist)
-
-    hist.recipe = recipe
+    await db.commit()  # cooked_at 은 INSERT ... RETURNING 으로 채워짐 (eager_defaults)
     return hist
 
 
-@router.get("/history", response_model=list[schemas.RecipeHistoryOut])
-def list_history(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+@router.get("/history", response_model=schemas.Page[schemas.RecipeHistoryOut])
+async def list_history(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
 ):
-    history = (
-        db.query(models.RecipeHistory)
-        .filter(models.RecipeHistory.user_id == current_user.id)
-        .order_by(models.RecipeHistory.cooked_at.desc())
-        .all()
+    """
+    조리 기록 (최근 순, 키셋 페이지네이션)
+    """
+    history, next_cursor = await keyset_page(
+        db,
+        select(models.RecipeHistory)
+        .options(joinedload(models.RecipeHistory.recipe))
+        .where(models.RecipeHistory.user_id == current_user.id),
+        models.RecipeHistory.cooked_at,
+        models.RecipeHistory.id,
+        limit,
+        cursor,
     )
-
-    recipe_map = {
-        r.id: r
-        for r in db.query(models.Recipe).filter(
-            models.Recipe.id.in_([h.recipe_id for h in history])
-        )
-    }
-    for h in history:
-        h.recipe = recipe_map.get(h.recipe_id)
-
-    return history
+    return {"items": history, "next_cursor": next_cursor}
@@ -1,20 +1,27 @@
 # app/router/waste.py
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+import asyncio
 
-from app.db import get_db
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_async_db
 from app import models, schemas
 from app.services import waste_ai_service
-from app.services.auth_service import get_current_user
+from app.services.auth_service import get_current_user_async
+from app.services.llm_async import run_llm_request
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page
+from app.services.sse import SSE_HEADERS, sse_event
 
 router = APIRouter(prefix="/api/waste", tags=["food_waste"])
 
 
 @router.post("/", response_model=schemas.FoodWasteOut)
-def create_waste(
+async def create_waste(
     payload: schemas.FoodWasteCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
 ):
     record = models.FoodWaste(
         user_id=current_user.id,
@@ -23,22 +30,29 @@ def create_waste(
         reason=payload.reason,
     )
     db.add(record)
-    db.commit()
-    db.refresh(record)
+    await db.commit()  # discarded_at 은 INSERT ... RETURNING 으로 채워짐 (eager_defaults)
     return record
 
 
-@router.get("/", response_model=list[schemas.FoodWasteOut])
-def list_waste(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+@router.get("/", response_model=schemas.Page[schemas.FoodWasteOut])
+async def list_waste(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
 ):
-    return (
-        db.query(models.FoodWaste)
-        .filter(models.FoodWaste.user_id == current_user.id)
-        .order_by(models.FoodWaste.discarded_at.desc())
-        .all()
+    """
+    최근 배출 기록부터 limit개. 다음 페이지는 응답의 next_cursor 를 ?cursor= 로 전달.
+    """
+    items, next_cursor = await keyset_page(
+        db,
+        select(models.FoodWaste).where(models.FoodWaste.user_id == current_user.id),
+        models.FoodWaste.discarded_at,
+        models.FoodWaste.id,
+        limit,
+        cursor,
     )
+    return {"items": items, "next_cursor": next_cursor}
 
 
 # -------------------------------------------------------------
@@ -46,14 +60,38 @@ def list_waste(
 # -------------------------------------------------------------
 
 @router.post("/qa", response_model=schemas.WasteAnswerOut)
-def ask_waste_guide(payload: schemas.WasteQuestion):
+async def ask_waste_guide(payload: schemas.WasteQuestion, request: Request):
     """
     분리수거·음식물 쓰레기에 대한 질문 → RAG 기반 답변
     (사용자별 정보와 무관)
+    LLM 응답을 기다리는 동안 스레드풀을 점유하지 않고, 클라이언트가 끊으면 호출을 취소한다.
     """
-    answer, sources = waste_ai_service.answer_waste_question(payload.question)
+    answer, sources = await run_llm_request(
+        request,
+        waste_ai_service.answer_waste_question_async(payload.question),
+    )
     return schemas.WasteAnswerOut(
         question=payload.question,
         answer=answer,
         sources=sources,
     )
+
+
+@router.post("/qa/stream")
+async def ask_waste_guide_stream(payload: schemas.WasteQuestion):
+    """
+    /qa의 스트리밍(SSE) 버전.
+    event: sources → event: delta (답변 조각, 여러 번) → event: done (WasteAnswerOut 형태)
+    클라이언트가 끊으면 스트림과 LLM 호출이 함께 취소된다.
+    """
+    async def events():
+        try:
+            async for event, data in waste_ai_service.stream_waste_answer(payload.question):
+                yield sse_event(event, data)
+        except asyncio.TimeoutError:
+            yield sse_event("error", {"detail": "AI 응답 시간이 초과되었습니다."})
+        except Exception as e:
+            print(f"[WARN] 분리배출 스트리밍 실패: {e}")
+            yield sse_event("error", {"detail": "AI 응답 생성 중 오류가 발생했습니다."})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
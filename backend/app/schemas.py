@@ -1,7 +1,7 @@
 # app/schemas.py
 from pydantic import BaseModel, EmailStr
 from datetime import datetime, date
-from typing import Optional, List, Any
+from typing import Generic, Optional, List, Any, TypeVar
 from .models import FridgeIngredientStatus
 
 
@@ -68,6 +68,16 @@ class FridgeIngredientOut(FridgeIngredientBase):
         orm_mode = True
 
 
+# ---------- 목록 페이지 (키셋 페이지네이션) ----------
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None  # 없으면 마지막 페이지 (다음 요청의 ?cursor= 로 전달)
+
+
 # ---------- 음식물 쓰레기 ----------
 
 class FoodWasteCreate(BaseModel):
@@ -114,6 +124,7 @@ class RecipeSuggestion(BaseModel):
     source_url: str | None = None
     image_url: str | None = None
     calories: float | None = None
+    source_type: str = "ai"  # ai: Gemini 생성 / csv: 파싱 실패 시 CSV 대체 / unavailable: 기능 사용 불가 안내
 
 
 # 즐겨찾기
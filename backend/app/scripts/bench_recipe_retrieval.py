@@ -0,0 +1,151 @@
+# app/scripts/bench_recipe_retrieval.py
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from app.services.ingredient_normalizer import SYNONYMS
+from app.services.recipe_corpus import CorpusState, build_state, parse_recipe_csv
+from app.services.recipe_retrieval import search_recipes
+
+
+# =====================================
+# 레시피 검색 벤치마크: 재료 겹침(overlap) vs 하이브리드(RRF)
+#  - 질의: 각 레시피 재료 일부 + 동의어 치환 + 다른 레시피 재료 1개(잡음)
+#  - 정답: 질의를 만든 레시피 → recall@k, MRR
+#  - 지연시간: --scale 배로 복제한 코퍼스에서 p50 / p95
+#
+# 실행 (backend/ 에서):
+#   python -m app.scripts.bench_recipe_retrieval
+#   python -m app.scripts.bench_recipe_retrieval --scale 1000 --dense
+# =====================================
+
+DEFAULT_CSV = Path(__file__).resolve().parent.parent / "data" / "korean_recipes1.csv"
+
+# 대표 이름 → 변형 목록 (질의에 동의어를 섞기 위해)
+_VARIANTS: Dict[str, List[str]] = {k: v for k, v in SYNONYMS.items() if v}
+_CANONICAL_OF: Dict[str, str] = {name: k for k, vs in SYNONYMS.items() for name in [k, *vs]}
+
+
+def make_queries(
+    records: Sequence[Dict],
+    per_recipe: int,
+    synonym_rate: float,
+    rng: random.Random,
+) -> List[Tuple[List[str], int]]:
+    all_ings = [i for rec in records for i in rec["ingredients_list"]]
+    queries: List[Tuple[List[str], int]] = []
+
+    for row, rec in enumerate(records):
+        ings = rec["ingredients_list"]
+        if not ings:
+            continue
+        for _ in range(per_recipe):
+            k = max(1, (len(ings) + 1) // 2)
+            picked = rng.sample(ings, k)
+
+            query = []
+            for name in picked:
+                variants = _VARIANTS.get(_CANONICAL_OF.get(name, name))
+                if variants and rng.random() < synonym_rate:
+                    name = rng.choice(variants)
+                query.append(name)
+
+            if all_ings:
+                query.append(rng.choice(all_ings))
+            queries.append((query, row))
+    return queries
+
+
+def scaled_state(records: Sequence[Dict], scale: int) -> CorpusState:
+    if scale <= 1:
+        return build_state(list(records))
+    copies = []
+    for n in range(scale):
+        for rec in records:
+            copy = dict(rec)
+            copy["recipe_id"] = f"{rec.get('recipe_id')}-{n}"
+            copies.append(copy)
+    return build_state(copies)
+
+
+def evaluate(
+    state: CorpusState,
+    queries: Sequence[Tuple[List[str], int]],
+    k: int,
+    mode: str,
+    use_dense: bool,
+) -> Dict[str, float]:
+    hits = 0
+    rr = 0.0
+    for query, target in queries:
+        rows = [row for row, _ in search_recipes(state, query, top_k=k, mode=mode, use_dense=use_dense)]
+        if target in rows:
+            hits += 1
+            rr += 1.0 / (rows.index(target) + 1)
+    n = max(len(queries), 1)
+    return {"recall": hits / n, "mrr": rr / n}
+
+
+def latency(
+    state: CorpusState,
+    queries: Sequence[Tuple[List[str], int]],
+    k: int,
+    mode: str,
+    use_dense: bool,
+) -> Dict[str, float]:
+    times: List[float] = []
+    for query, _ in queries:
+        t0 = time.perf_counter()
+        search_recipes(state, query, top_k=k, mode=mode, use_dense=use_dense)
+        times.append((time.perf_counter() - t0) * 1000)
+    times.sort()
+    return {
+        "p50_ms": statistics.median(times) if times else 0.0,
+        "p95_ms": times[int(len(times) * 0.95) - 1] if times else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="레시피 후보 검색 recall/지연시간 비교")
+    parser.add_argument("--csv", type=Path, default=DEFAULT_CSV)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--queries-per-recipe", type=int, default=5)
+    parser.add_argument("--synonym-rate", type=float, default=0.5)
+    parser.add_argument("--scale", type=int, default=1, help="지연시간 측정용 코퍼스 복제 배수")
+    parser.add_argument("--dense", action="store_true", help="Chroma dense 검색 포함 (색인 필요)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    records = parse_recipe_csv(args.csv)
+    rng = random.Random(args.seed)
+    queries = make_queries(records, args.queries_per_recipe, args.synonym_rate, rng)
+
+    t0 = time.perf_counter()
+    state = build_state(records)
+    big = scaled_state(records, args.scale) if args.scale > 1 else state
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    print(f"[INFO] 레시피 {len(records)}개 (지연시간 코퍼스 {len(big.records)}개), 질의 {len(queries)}개")
+    print(f"[INFO] 색인 구축 {build_ms:.1f} ms")
+
+    methods = [("overlap", "overlap", False), ("hybrid", "hybrid", False)]
+    if args.dense:
+        methods.append(("hybrid+dense", "hybrid", True))
+
+    print(f"{'method':<14}{'recall@' + str(args.k):>10}{'MRR':>8}{'p50(ms)':>10}{'p95(ms)':>10}")
+    for label, mode, dense in methods:
+        quality = evaluate(state, queries, args.k, mode, dense)
+        speed = latency(big, queries, args.k, mode, dense)
+        print(
+            f"{label:<14}{quality['recall']:>10.3f}{quality['mrr']:>8.3f}"
+            f"{speed['p50_ms']:>10.3f}{speed['p95_ms']:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
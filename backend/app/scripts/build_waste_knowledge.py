@@ -2,14 +2,19 @@
 
 import os
 import json
-import time
+import hashlib
 from pathlib import Path
-from typing import List, Dict, Iterator
+from typing import List, Dict, Iterable, Iterator, Optional, Set, Tuple
 
 from dotenv import load_dotenv
 from pypdf import PdfReader
 import google.generativeai as genai
 
+from app.scripts.checkpoint_journal import CheckpointJournal
+from app.scripts.embedding_pipeline import EmbedFn, embed_in_batches
+from app.scripts.pdf_extraction import iter_pdf_pages
+from app.services.vector_index import VectorIndex
+
 # -------------------------------------------------------------------
 # 경로 설정
 # -------------------------------------------------------------------
@@ -23,9 +28,17 @@ APP_DIR = BASE_DIR / "app"
 # PDF들이 들어있는 폴더: backend/app/data/waste_guides
 DATA_DIR = APP_DIR / "data" / "waste_guides"
 
-# 출력 파일: backend/app/data/waste_knowledge.json
-OUTPUT_PATH = APP_DIR / "data" / "waste_knowledge.json"
-TMP_OUTPUT_PATH = APP_DIR / "data" / "waste_knowledge.tmp.json"  # 임베딩 저장용
+# 출력 파일: backend/app/data/waste_knowledge.npy + waste_knowledge.meta.json
+#  - .npy: 정규화된 float32 임베딩 행렬 (서비스에서 mmap으로 로딩)
+#  - .meta.json: id/source/title/text 사이드카
+OUTPUT_MATRIX_PATH = APP_DIR / "data" / "waste_knowledge.npy"
+OUTPUT_META_PATH = APP_DIR / "data" / "waste_knowledge.meta.json"
+
+# (구) JSON 포맷: 이어하기 시 바이너리 파일이 없으면 여기서 읽는다
+LEGACY_JSON_PATH = APP_DIR / "data" / "waste_knowledge.json"
+
+# 체크포인트 저널: 빌드 도중 새 chunk를 한 줄씩 append, 빌드 완료 시 compaction 후 삭제
+JOURNAL_PATH = APP_DIR / "data" / "waste_knowledge.journal.jsonl"
 
 EMBED_MODEL = "text-embedding-004"
 
@@ -52,17 +65,14 @@ def load_env_and_configure():
 # PDF → 텍스트
 # -------------------------------------------------------------------
 
-def read_pdf_text(pdf_path: Path) -> str:
+def iter_capped_pages(pages: Iterable[str]) -> Iterator[str]:
     """
-    PDF 전체 텍스트를 문자열로 반환.
-    너무 긴 문서는 MAX_TOTAL_CHARS_DOC 기준으로 앞부분만 사용.
+    페이지 텍스트 스트림에서 빈 페이지를 건너뛰고,
+    문서 전체가 MAX_TOTAL_CHARS_DOC를 넘지 않도록 앞부분만 흘려보낸다.
     """
-    reader = PdfReader(str(pdf_path))
-    texts: List[str] = []
     char_count = 0
 
-    for page in reader.pages:
-        text = page.extract_text() or ""
+    for text in pages:
         text = text.strip()
         if not text:
             continue
@@ -74,14 +84,68 @@ def read_pdf_text(pdf_path: Path) -> str:
         if len(text) > remaining:
             text = text[:remaining]
 
-        texts.append(text)
+        yield text
         char_count += len(text)
 
         if char_count >= MAX_TOTAL_CHARS_DOC:
             break
 
-    full_text = "\n".join(texts)
-    return full_text
+
+def read_pdf_text(pdf_path: Path) -> str:
+    """
+    PDF 전체 텍스트를 문자열로 반환. (단일 프로세스, 순차 추출)
+    너무 긴 문서는 MAX_TOTAL_CHARS_DOC 기준으로 앞부분만 사용.
+    """
+    reader = PdfReader(str(pdf_path))
+    pages = ((page.extract_text() or "") for page in reader.pages)
+    return "\n".join(iter_capped_pages(pages))
+
+
+def iter_chunks_stream(
+    pages: Iterable[str],
+    max_chars: int = 500,
+    overlap: int = 100,
+) -> Iterator[str]:
+    """
+    페이지 텍스트 스트림을 "\n"으로 이어 붙인 것과 같은 chunk들을 yield 한다.
+    페이지가 도착하는 대로 chunk를 내보내고 이미 지난 부분은 버퍼에서 버리므로
+    문서 전체를 문자열로 모으지 않는다. (iter_chunks와 결과 동일)
+    """
+    if overlap >= max_chars:
+        raise ValueError("overlap은 max_chars보다 작아야 합니다.")
+
+    buf = ""
+    start = 0                    # buf 안에서 다음 chunk 시작 위치
+    last_end: Optional[int] = None  # 마지막으로 내보낸 chunk의 끝 위치
+    first = True
+
+    for page in pages:
+        if not page:
+            continue
+        buf += page if first else "\n" + page
+        first = False
+
+        # 꽉 찬 chunk를 만들 수 있는 만큼 내보낸다
+        while start + max_chars <= len(buf):
+            end = start + max_chars
+            chunk = buf[start:end].strip()
+            if chunk:
+                yield chunk
+            last_end = end
+            # 다음 chunk 시작은 약간 겹치게
+            start = end - overlap
+
+        # 이미 지나간 앞부분은 버퍼에서 제거
+        if start > 0:
+            buf = buf[start:]
+            last_end = None if last_end is None else last_end - start
+            start = 0
+
+    # 남은 꼬리 부분 (마지막 chunk가 정확히 끝에서 끝났으면 없음)
+    if buf and (last_end is None or last_end < len(buf)):
+        chunk = buf[start:].strip()
+        if chunk:
+            yield chunk
 
 
 def iter_chunks(
@@ -97,18 +161,7 @@ def iter_chunks(
     if not text:
         return
 
-    length = len(text)
-    start = 0
-
-    while start < length:
-        end = min(start + max_chars, length)
-        chunk = text[start:end].strip()
-        if chunk:
-            yield chunk
-        # 다음 chunk 시작은 약간 겹치게
-        start = end - overlap
-        if start < 0:
-            start = 0
+    yield from iter_chunks_stream([text], max_chars=max_chars, overlap=overlap)
 
 
 # -------------------------------------------------------------------
@@ -125,127 +178,275 @@ def embed_text(text: str) -> List[float]:
     return resp["embedding"]
 
 
+def embed_texts(texts: List[str]) -> List[List[float]]:
+    """여러 chunk를 한 번의 요청으로 임베딩 (multi-content embed_content)."""
+    resp = genai.embed_content(
+        model=EMBED_MODEL,
+        content=texts,
+        task_type="retrieval_document",
+    )
+    return resp["embedding"]
+
+
+# -------------------------------------------------------------------
+# 콘텐츠 해시 (증분 재색인용)
+# -------------------------------------------------------------------
+
+def hash_file(path: Path) -> str:
+    """PDF 파일 전체의 sha256."""
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def hash_text(text: str) -> str:
+    """chunk 텍스트의 sha256."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
 # -------------------------------------------------------------------
 # 체크포인트 로드/저장
 # -------------------------------------------------------------------
 
-def load_existing_entries() -> Dict[str, Dict]:
+def load_existing_entries() -> Tuple[Dict[str, Dict], Dict[str, str]]:
     """
-    이미 생성된 waste_knowledge.json이 있으면 로드해서
-    id -> entry 딕셔너리로 반환.
+    이미 생성된 인덱스(.npy + .meta.json)가 있으면 로드해서
+    (id -> entry 딕셔너리, PDF 파일명 -> 파일 해시) 로 반환.
+    없으면 (구) waste_knowledge.json을 읽는다. (파일 해시 정보 없음)
     """
-    if not OUTPUT_PATH.exists():
-        return {}
-
-    with OUTPUT_PATH.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    sources: Dict[str, str] = {}
+
+    if OUTPUT_MATRIX_PATH.exists() and OUTPUT_META_PATH.exists():
+        index = VectorIndex.load(OUTPUT_MATRIX_PATH, OUTPUT_META_PATH, mmap=False)
+        data = index.to_entries()
+        sources = dict(index.meta.get("sources", {}))
+    elif LEGACY_JSON_PATH.exists():
+        with LEGACY_JSON_PATH.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    else:
+        return {}, sources
 
     existing = {entry["id"]: entry for entry in data}
-    return existing
+    return existing, sources
 
 
-def save_entries(entries: Dict[str, Dict]):
+def replay_journal(journal: CheckpointJournal, entries: Dict[str, Dict]) -> int:
     """
-    entries 딕셔너리를 waste_knowledge.json으로 저장.
-    TMP 파일에 먼저 쓰고 rename해서 파일 깨짐 방지.
+    지난 빌드가 중간에 죽었으면 저널에 남은 엔트리를 entries에 반영.
+    복구된 엔트리 수를 반환.
     """
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    data_list = list(entries.values())
+    recovered = 0
+    for entry in journal.replay():
+        entries[entry["id"]] = entry
+        recovered += 1
+    return recovered
 
-    with TMP_OUTPUT_PATH.open("w", encoding="utf-8") as f:
-        json.dump(data_list, f, ensure_ascii=False, indent=2)
 
-    TMP_OUTPUT_PATH.replace(OUTPUT_PATH)
+def save_entries(entries: Dict[str, Dict], sources: Dict[str, str]):
+    """
+    entries 딕셔너리를 바이너리 인덱스(.npy + .meta.json)로 저장. (compaction)
+    sources(PDF 파일명 -> 파일 해시)는 다음 빌드의 변경 감지용으로 메타에 함께 기록.
+    VectorIndex.save가 TMP 파일에 먼저 쓰고 rename해서 파일 깨짐 방지.
+    """
+    index = VectorIndex.from_entries(list(entries.values()))
+    index.save(OUTPUT_MATRIX_PATH, OUTPUT_META_PATH, sources=sources)
 
 
 # -------------------------------------------------------------------
-# 메인 빌드 함수 (체크포인트 + 재시작 지원)
+# 메인 빌드 함수 (체크포인트 + 재시작 + 증분 재색인 지원)
 # -------------------------------------------------------------------
 
-def build_waste_knowledge(checkpoint_every: int = 20, sleep_sec: float = 0.1):
+def iter_pending_chunks(
+    pdf_paths: List[Path],
+    entries: Dict[str, Dict],
+    by_hash: Dict[str, Dict],
+    live_hashes: Dict[str, str],
+    journal: CheckpointJournal,
+    stats: Dict[str, int],
+    extract_workers: Optional[int] = None,
+) -> Iterator[Tuple[Dict, str]]:
     """
-    PDF → 텍스트 → chunk → 임베딩 → JSON 저장
-    - checkpoint_every: 몇 개 chunk마다 한 번씩 중간 저장할지
-    - sleep_sec: 각 임베딩 호출 사이에 잠깐 쉼 (과부하 방지)
+    변경된 PDF들을 순서대로 읽어 새로 임베딩해야 하는 chunk만 (entry 메타, 텍스트)로 yield.
+    - 텍스트 추출은 프로세스 풀에서 병렬로 미리 진행 (iter_pdf_pages)
+    - 페이지가 도착하는 대로 chunk로 잘라 흘려보내므로 추출과 임베딩이 겹쳐서 진행된다
+    - 같은 id에 같은 텍스트 해시가 이미 있으면 그대로 유지 (unchanged)
+    - 다른 위치에 같은 텍스트가 있으면 임베딩을 재사용 (reused, API 호출 없음)
+    - 처리한 chunk id와 텍스트 해시는 live_hashes에 모은다 (나머지는 빌드 끝에 orphan으로 삭제)
     """
-    load_env_and_configure()
+    for pdf_path, pages in iter_pdf_pages(pdf_paths, max_workers=extract_workers):
+        print(f"\n[*] PDF 처리 시작: {pdf_path.name}")
+        chunk_count = 0
 
-    if not DATA_DIR.exists():
-        raise RuntimeError(f"{DATA_DIR} 디렉토리가 없습니다. PDF들을 여기에 넣어주세요.")
+        # ❗ 여기서 리스트 대신 generator 사용 → 메모리 고정
+        chunks = iter_chunks_stream(iter_capped_pages(pages), max_chars=500, overlap=100)
+        for i, chunk in enumerate(chunks):
+            chunk_count += 1
+            chunk_id = f"{pdf_path.stem}-{i}"
+            text_hash = hash_text(chunk)
+            live_hashes[chunk_id] = text_hash
 
-    # 이미 존재하는 엔트리 로드 (재시작 시 이어하기용)
-    existing_entries = load_existing_entries()
-    existing_ids = set(existing_entries.keys())
+            old = entries.get(chunk_id)
+            if old is not None and old["text_hash"] == text_hash:
+                stats["unchanged"] += 1
+                continue
 
-    print(f"[INFO] 기존 엔트리 수: {len(existing_entries)}")
+            stats["changed" if old is not None else "added"] += 1
 
-    processed_count = 0
-    new_count = 0
+            meta = {
+                "id": chunk_id,
+                "source": pdf_path.name,
+                "title": pdf_path.stem,
+                "text_hash": text_hash,
+            }
 
-    pdf_paths = sorted(DATA_DIR.glob("*.pdf"))
-    if not pdf_paths:
-        raise RuntimeError(f"{DATA_DIR} 안에 PDF 파일이 없습니다.")
+            same_text = by_hash.get(text_hash)
+            if same_text is not None:
+                entry = {**meta, "text": chunk, "embedding": same_text["embedding"]}
+                entries[chunk_id] = entry
+                journal.append(entry)
+                stats["reused"] += 1
+                continue
 
-    for pdf_path in pdf_paths:
-        print(f"\n[*] PDF 처리 시작: {pdf_path.name}")
-        full_text = read_pdf_text(pdf_path)
+            yield meta, chunk
 
-        if not full_text.strip():
+        if chunk_count == 0:
             print(f"    - 텍스트를 추출하지 못해 스킵합니다: {pdf_path.name}")
-            continue
 
-        chunk_counter_for_pdf = 0
 
-        # ❗ 여기서 리스트 대신 generator 사용 → 메모리 고정
-        for i, chunk in enumerate(iter_chunks(full_text, max_chars=500, overlap=100)):
-            chunk_id = f"{pdf_path.stem}-{i}"
+def build_waste_knowledge(
+    checkpoint_every: int = 20,
+    batch_size: int = 32,
+    max_workers: int = 4,
+    requests_per_sec: float = 5.0,
+    max_retries: int = 5,
+    extract_workers: Optional[int] = None,
+    embed_fn: Optional[EmbedFn] = None,
+) -> Dict[str, int]:
+    """
+    PDF → 텍스트 → chunk → 임베딩 → 바이너리 인덱스 저장
+    - checkpoint_every: 몇 개 chunk마다 저널을 fsync할지 (1이어도 부담 없음)
+    - batch_size: 한 번의 임베딩 요청에 담을 chunk 수
+    - max_workers: 동시에 임베딩 요청을 보내는 워커 수
+    - requests_per_sec: 전체 워커가 공유하는 초당 요청 수 제한 (토큰 버킷)
+    - max_retries: 배치별 재시도 횟수 (지수 백오프)
+    - extract_workers: PDF 텍스트 추출 프로세스 수 (기본: CPU 코어 수)
+    - embed_fn: 임베딩 함수 주입 (기본: Gemini embed_texts, 테스트용 fake embedder 가능)
+
+    PDF 파일 해시가 지난 빌드와 같으면 추출부터 건너뛰고, 바뀐 PDF는 chunk 텍스트 해시를
+    비교해 바뀐 chunk만 다시 임베딩한다. 변경 요약(dict)을 반환.
+    """
+    if embed_fn is None:
+        load_env_and_configure()
+        embed_fn = embed_texts
 
-            # 이미 처리된 id이면 스킵 (재실행 이어하기)
-            if chunk_id in existing_ids:
-                continue
+    if not DATA_DIR.exists():
+        raise RuntimeError(f"{DATA_DIR} 디렉토리가 없습니다. PDF들을 여기에 넣어주세요.")
 
-            if not chunk.strip():
-                continue
+    # 이미 존재하는 엔트리 로드 + 저널 replay (재시작 시 이어하기용)
+    existing_entries, old_sources = load_existing_entries()
+    journal = CheckpointJournal(JOURNAL_PATH, fsync_every=checkpoint_every)
+    recovered = replay_journal(journal, existing_entries)
 
-            # 임베딩 생성
-            try:
-                embedding = embed_text(chunk)
-            except Exception as e:
-                print(f"[WARN] 임베딩 실패 (id={chunk_id}): {e}")
-                continue
+    for entry in existing_entries.values():
+        if "text_hash" not in entry:  # (구) 포맷 엔트리
+            entry["text_hash"] = hash_text(entry["text"])
 
-            entry = {
-                "id": chunk_id,
-                "source": pdf_path.name,
-                "title": pdf_path.stem,
-                "text": chunk,
-                "embedding": embedding,
-            }
+    # 텍스트 해시 → 엔트리 (위치가 바뀐 chunk의 임베딩 재사용용)
+    by_hash = {entry["text_hash"]: entry for entry in existing_entries.values()}
 
-            existing_entries[chunk_id] = entry
-            existing_ids.add(chunk_id)
-            new_count += 1
-            processed_count += 1
-            chunk_counter_for_pdf += 1
+    print(f"[INFO] 기존 엔트리 수: {len(existing_entries)} (저널 복구: {recovered})")
+
+    pdf_paths = sorted(DATA_DIR.glob("*.pdf"))
+    if not pdf_paths:
+        raise RuntimeError(f"{DATA_DIR} 안에 PDF 파일이 없습니다.")
 
-            # 약간 쉼 (노트북/데스크탑 과부하 방지)
-            if sleep_sec > 0:
-                time.sleep(sleep_sec)
+    # PDF 단위 변경 감지
+    new_sources = {path.name: hash_file(path) for path in pdf_paths}
+    unchanged_pdfs = {
+        name for name, digest in new_sources.items() if old_sources.get(name) == digest
+    }
+    changed_paths = [path for path in pdf_paths if path.name not in unchanged_pdfs]
+
+    print(f"[INFO] 변경 없는 PDF: {len(unchanged_pdfs)}개, 처리할 PDF: {len(changed_paths)}개")
+
+    stats = {"added": 0, "changed": 0, "unchanged": 0, "reused": 0, "embedded": 0, "failed": 0}
+    live_hashes: Dict[str, str] = {}
+    failed_sources: Set[str] = set()
+
+    with journal:
+        pending = iter_pending_chunks(
+            changed_paths,
+            existing_entries,
+            by_hash,
+            live_hashes,
+            journal,
+            stats,
+            extract_workers=extract_workers,
+        )
+
+        for batch, embeddings, error in embed_in_batches(
+            pending,
+            embed_fn=embed_fn,
+            batch_size=batch_size,
+            max_workers=max_workers,
+            requests_per_sec=requests_per_sec,
+            max_retries=max_retries,
+        ):
+            if error is not None:
+                ids = ", ".join(meta["id"] for meta, _ in batch)
+                print(f"[WARN] 임베딩 실패 (ids={ids}): {error}")
+                stats["failed"] += len(batch)
+                failed_sources.update(meta["source"] for meta, _ in batch)
+                continue
 
-            # 체크포인트 저장
-            if processed_count % checkpoint_every == 0:
-                print(f"    - 체크포인트 저장 중... (총 {len(existing_entries)}개)")
-                save_entries(existing_entries)
+            for (meta, chunk), embedding in zip(batch, embeddings):
+                entry = {**meta, "text": chunk, "embedding": embedding}
+                existing_entries[meta["id"]] = entry
+                by_hash[meta["text_hash"]] = entry
+                stats["embedded"] += 1
+
+                # 체크포인트: 새 chunk 한 줄만 append (checkpoint_every개마다 fsync)
+                journal.append(entry)
+
+    # orphan 정리: 변경된 PDF에서 더 이상 나오지 않는 chunk, 삭제된 PDF의 chunk
+    # (임베딩에 실패한 chunk의 기존 엔트리도 함께 빠지므로 다음 빌드에서 다시 시도)
+    final_entries = {
+        chunk_id: entry
+        for chunk_id, entry in existing_entries.items()
+        if entry["source"] in unchanged_pdfs
+        or live_hashes.get(chunk_id) == entry["text_hash"]
+    }
+    stats["removed"] = sum(
+        1 for chunk_id in existing_entries
+        if chunk_id not in final_entries and chunk_id not in live_hashes
+    )
 
-        print(f"    - 처리된 청크 수: {chunk_counter_for_pdf}")
-        print(f"[*] PDF 처리 완료: {pdf_path.name} (누적 엔트리: {len(existing_entries)})")
-        save_entries(existing_entries)
+    # 임베딩 실패가 있었던 PDF는 해시를 기록하지 않아 다음 빌드에서 다시 처리
+    sources = {
+        name: digest for name, digest in new_sources.items() if name not in failed_sources
+    }
+
+    # 마지막에 한 번만 최종 인덱스로 compaction, 성공하면 저널 삭제
+    print(f"    - 최종 인덱스 저장 중... (총 {len(final_entries)}개)")
+    save_entries(final_entries, sources)
+    journal.remove()
+
+    print(
+        "\n[완료] 변경 요약: "
+        f"추가 {stats['added']} / 변경 {stats['changed']} / 유지 {stats['unchanged']} / "
+        f"삭제 {stats['removed']} / 임베딩 재사용 {stats['reused']} / "
+        f"임베딩 호출 {stats['embedded']} / 실패 {stats['failed']}"
+    )
+    print(f"[완료] 건너뛴 PDF(파일 변경 없음): {len(unchanged_pdfs)}개")
+    print("[완료] 전체 청크 수:", len(final_entries))
+    print(f"[INFO] 최종 파일: {OUTPUT_MATRIX_PATH}, {OUTPUT_META_PATH}")
 
-    print("\n[완료] 새로 생성된 청크 수:", new_count)
-    print("[완료] 전체 청크 수:", len(existing_entries))
-    print(f"[INFO] 최종 파일: {OUTPUT_PATH}")
+    return stats
 
 
 if __name__ == "__main__":
-    # 필요하면 checkpoint_every, sleep_sec 조절 가능
-    build_waste_knowledge(checkpoint_every=20, sleep_sec=0.1)
+    # backend/ 에서 실행: python -m app.scripts.build_waste_knowledge
+    # 필요하면 checkpoint_every, batch_size, max_workers, requests_per_sec 조절 가능
+    build_waste_knowledge(checkpoint_every=20, batch_size=32, max_workers=4, requests_per_sec=5.0)
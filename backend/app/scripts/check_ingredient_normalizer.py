@@ -0,0 +1,80 @@
+# app/scripts/check_ingredient_normalizer.py
+from __future__ import annotations
+
+import sys
+from typing import List, Tuple
+
+from app.services.ingredient_normalizer import normalize_ingredient
+
+# =====================================
+# 재료명 정규화 점검
+#  - 원문 → 기대하는 대표 이름 목록을 normalize_ingredient 에 넣어 비교
+#  - 접두어 오매칭(예: "eggplant" → "달걀", "고추냉이" → "고추")이 다시 생기지 않는지 확인
+#  - 하나라도 다르면 종료 코드 1
+#
+# 실행 (backend/ 에서):
+#   python -m app.scripts.check_ingredient_normalizer
+# =====================================
+
+PROBES: List[Tuple[str, str]] = [
+    # 표기 변형 / 수량 / 수식어
+    ("대파 1대", "파"),
+    ("다진 마늘(약간)", "마늘"),
+    ("다진마늘", "마늘"),
+    ("Eggs", "달걀"),
+    ("onion", "양파"),
+    ("green onion", "파"),
+    ("냉동새우 200g", "새우"),
+    ("양파 1/2개", "양파"),
+    ("2대파", "파"),
+    # 숫자 뒤 단어의 첫 글자를 단위로 먹지 않아야 함
+    ("2 large eggs", "달걀"),
+    ("1 medium onion", "양파"),
+    ("1 lemon", "lemon"),
+    ("2 limes", "limes"),
+    ("3 leeks", "파"),
+    ("1 lb beef", "소고기"),
+    ("200 ml milk", "우유"),
+    # 등록된 재료 + 부위/손질 표현
+    ("대파 흰부분", "파"),
+    ("돼지고기 앞다리", "돼지고기"),
+    ("소고기 국거리", "소고기"),
+    ("닭다리살", "닭고기"),
+    ("chicken thighs", "닭고기"),
+    ("garlic cloves", "마늘"),
+    ("참치캔 1개", "참치"),
+    ("양파 다진것", "양파"),
+    # 짧은 이름의 접두어로 잡히면 안 되는 것들
+    ("파프리카", "파프리카"),
+    ("고추장", "고추장"),
+    ("새우젓", "새우젓"),
+    ("eggplant", "가지"),
+    ("rice vinegar", "식초"),
+    ("buttermilk", "버터밀크"),
+    ("chicken stock", "육수"),
+    ("egg yolk", "달걀노른자"),
+    ("고추냉이", "고추냉이"),
+    ("감자전분", "감자전분"),
+    ("감자 전분", "감자전분"),
+    ("토마토케첩", "케첩"),
+    ("rice wine", "ricewine"),
+    ("egg noodles", "eggnoodles"),
+    ("버터넛스쿼시", "버터넛스쿼시"),
+    ("마늘쫑", "마늘종"),
+]
+
+
+def main() -> int:
+    failed = 0
+    for raw, expected in PROBES:
+        got = normalize_ingredient(raw)
+        ok = got == expected
+        failed += not ok
+        print(f"[{'OK  ' if ok else 'FAIL'}] {raw!r:<24} → {got!r}" + ("" if ok else f" (기대: {expected!r})"))
+
+    print("✅ 모든 재료명이 기대대로 정규화됩니다." if not failed else f"❌ {failed}개 재료명이 기대와 다릅니다.")
+    return 0 if not failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+# app/scripts/check_migrations.py
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+from typing import Callable, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.db import make_engine
+from app.migrate import _alembic_config, upgrade_db
+from app.scripts.compact_recipes import compact
+
+# =====================================
+# 마이그레이션 / 레시피 병합 회귀 점검
+#  - 임시 SQLite 파일마다 0001 스키마(create_all 시절)에 데이터를 넣고 upgrade_db 실행
+#  - 같은 레시피의 중복 행 여러 개를 한 사용자가 즐겨찾기한 경우(병합 후 즐겨찾기 중복),
+#    병합 전에 이미 있던 중복 즐겨찾기(0003 이 자동 삭제하지 않고 멈춰야 함),
+#    최신 스키마에서 compact_recipes.compact 로 같은 경우를 병합하는 것까지 확인
+#  - 하나라도 실패하면 종료 코드 1
+#
+# 실행 (backend/ 에서):
+#   python -m app.scripts.check_migrations
+# =====================================
+
+
+def _engine_at(tmp: str, name: str, revision: str) -> Engine:
+    from alembic import command
+
+    engine = make_engine(f"sqlite:///{os.path.join(tmp, name)}")
+    cfg = _alembic_config()
+    with engine.begin() as conn:
+        cfg.attributes["connection"] = conn
+        command.upgrade(cfg, revision)
+    return engine
+
+
+def _add_recipes(conn, rows: List[Tuple[int, str, List[str]]], stale_fingerprint: bool = False) -> None:
+    for rid, title, ingredients in rows:
+        values = {"id": rid, "title": title, "ings": json.dumps(ingredients, ensure_ascii=False)}
+        if stale_fingerprint:
+            conn.execute(
+                text(
+                    "INSERT INTO recipes (id, title, ingredients, instructions, fingerprint) "
+                    "VALUES (:id, :title, :ings, '끓인다', :fp)"
+                ),
+                dict(values, fp=f"stale-{rid}"),
+            )
+        else:
+            conn.execute(
+                text("INSERT INTO recipes (id, title, ingredients, instructions) VALUES (:id, :title, :ings, '끓인다')"),
+                values,
+            )
+
+
+def _head() -> str:
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(_alembic_config()).get_current_head()
+
+
+def _rows(engine: Engine, sql: str) -> list:
+    with engine.connect() as conn:
+        return [tuple(r) for r in conn.execute(text(sql))]
+
+
+def case_merge_collapses_favorites(tmp: str) -> List[str]:
+    """0001 → head: 중복 레시피 2, 3 을 모두 즐겨찾기한 사용자 → 대표 행 1 에 즐겨찾기 하나."""
+    engine = _engine_at(tmp, "merge.db", "0001")
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (id, email, password_hash) VALUES (1, 'a', 'x'), (2, 'b', 'x')"))
+        _add_recipes(conn, [
+            (1, "김치찌개", ["김치 1/2포기", "돼지고기 200g"]),
+            (2, "김치찌개", ["김치 1/2포기", "돼지고기 200g"]),
+            (3, "김치찌개", ["김치 1/2포기", "돼지고기 200g"]),
+            (4, "계란말이", ["2 large eggs"]),
+            (5, "계란말이", ["eggs"]),  # 수량/수식어만 다름 → 같은 레시피
+        ])
+        conn.execute(text(
+            "INSERT INTO favorite_recipes (user_id, recipe_id) VALUES (1, 2), (1, 3), (2, 1), (2, 3), (2, 5)"
+        ))
+        conn.execute(text("INSERT INTO recipe_history (user_id, recipe_id) VALUES (1, 2), (1, 3)"))
+
+    upgrade_db(engine)
+
+    problems = []
+    version = _rows(engine, "SELECT version_num FROM alembic_version")
+    favorites = _rows(engine, "SELECT user_id, recipe_id FROM favorite_recipes ORDER BY user_id, recipe_id")
+    history = _rows(engine, "SELECT recipe_id FROM recipe_history")
+    recipes = _rows(engine, "SELECT id FROM recipes ORDER BY id")
+    if version != [(_head(),)]:
+        problems.append(f"리비전 {version} (기대: {_head()})")
+    if favorites != [(1, 1), (2, 1), (2, 4)]:
+        problems.append(f"즐겨찾기 {favorites}")
+    if history != [(1,), (1,)]:
+        problems.append(f"조리 기록 {history}")
+    if recipes != [(1,), (4,)]:
+        problems.append(f"레시피 {recipes}")
+    engine.dispose()
+    return problems
+
+
+def case_existing_duplicates_stop(tmp: str) -> List[str]:
+    """병합과 무관한 중복 즐겨찾기는 0003 이 지우지 않고 멈춘다 (DB는 0001 그대로)."""
+    engine = _engine_at(tmp, "blocked.db", "0001")
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (id, email, password_hash) VALUES (1, 'a', 'x')"))
+        _add_recipes(conn, [(1, "된장국", ["된장"])])
+        conn.execute(text("INSERT INTO favorite_recipes (user_id, recipe_id) VALUES (1, 1), (1, 1)"))
+
+    problems = []
+    try:
+        upgrade_db(engine)
+        problems.append("예외 없이 적용됨")
+    except RuntimeError:
+        pass
+
+    version = _rows(engine, "SELECT version_num FROM alembic_version")
+    favorites = _rows(engine, "SELECT COUNT(*) FROM favorite_recipes")
+    if version != [("0001",)]:
+        problems.append(f"리비전 {version} (기대: 0001)")
+    if favorites != [(2,)]:
+        problems.append(f"즐겨찾기 {favorites[0][0]}건 (기대: 2건, 자동 삭제 안 됨)")
+    engine.dispose()
+    return problems
+
+
+def case_compact_at_head(tmp: str) -> List[str]:
+    """최신 스키마(unique 즐겨찾기)에서 compact(): 중복 행 2, 3 을 즐겨찾기한 사용자."""
+    engine = make_engine(f"sqlite:///{os.path.join(tmp, 'compact.db')}")
+    upgrade_db(engine)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (id, email, password_hash) VALUES (1, 'a', 'x')"))
+        _add_recipes(conn, [(i, "김치찌개", ["김치"]) for i in (1, 2, 3)], stale_fingerprint=True)
+        conn.execute(text("INSERT INTO favorite_recipes (user_id, recipe_id) VALUES (1, 2), (1, 3)"))
+
+    problems = []
+    try:
+        with engine.begin() as conn:
+            compact(conn)
+    except Exception as e:
+        problems.append(f"compact 실패: {e.__class__.__name__}")
+
+    favorites = _rows(engine, "SELECT user_id, recipe_id FROM favorite_recipes")
+    if favorites != [(1, 1)]:
+        problems.append(f"즐겨찾기 {favorites}")
+    engine.dispose()
+    return problems
+
+
+CASES: List[Tuple[str, Callable[[str], List[str]]]] = [
+    ("0002: 병합으로 생긴 중복 즐겨찾기 정리", case_merge_collapses_favorites),
+    ("0003: 기존 중복 즐겨찾기는 자동 삭제 안 함", case_existing_duplicates_stop),
+    ("compact_recipes: 최신 스키마에서 중복 즐겨찾기 병합", case_compact_at_head),
+]
+
+
+def main() -> int:
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, case in CASES:
+            problems = case(tmp)
+            print(f"[{'OK  ' if not problems else 'FAIL'}] {name}" + (f": {', '.join(problems)}" if problems else ""))
+            ok = ok and not problems
+
+    print("✅ 마이그레이션 점검 통과" if ok else "❌ 마이그레이션 점검 실패")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
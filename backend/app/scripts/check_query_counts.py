@@ -0,0 +1,208 @@
+# app/scripts/check_query_counts.py
+from __future__ import annotations
+
+import argparse
+import importlib
+import os
+import sys
+import tempfile
+import types
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+
+# =====================================
+# 엔드포인트별 SQL 실행 횟수 점검 (N+1 회귀 방지)
+#  - 엔진의 before_cursor_execute 이벤트로 요청 1번에 나간 SQL 문 수를 센다
+#  - 기록이 적은 사용자 / 많은 사용자로 같은 요청을 보내서
+#      1) 예산(BUDGETS) 이하인지
+#      2) 기록 수와 무관하게 같은지 (행마다 추가 쿼리가 생기면 여기서 걸림)
+#    를 확인하고, 하나라도 어기면 종료 코드 1
+#  - 임시 SQLite 파일에 마이그레이션을 적용해서 실행 (앱 DB는 건드리지 않음)
+#
+# 실행 (backend/ 에서):
+#   python -m app.scripts.check_query_counts
+#   python -m app.scripts.check_query_counts -v     # 실행된 SQL 까지 출력
+# =====================================
+
+# (메서드, 경로 이름) → 허용 SQL 문 수 (인증 사용자 조회 1번 포함)
+BUDGETS: Dict[Tuple[str, str], int] = {
+    ("GET", "/auth/me"): 1,
+    ("POST", "/api/waste/"): 2,
+    ("GET", "/api/waste/"): 2,
+    ("POST", "/api/recipes/favorite/{id} (신규)"): 4,
+    ("POST", "/api/recipes/favorite/{id} (이미 있음)"): 2,
+    ("GET", "/api/recipes/favorites"): 2,
+    ("POST", "/api/recipes/history"): 3,
+    ("GET", "/api/recipes/history"): 2,
+}
+
+SMALL_ROWS = 3
+LARGE_ROWS = 40
+PAGE_LIMIT = 50  # 한 페이지에 모든 기록이 들어오도록 → 기록 수만큼 행이 직렬화됨
+
+
+class QueryCounter:
+    """with 블록 안에서 engine 으로 실행된 SQL 문을 모은다."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements: List[str] = []
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+def _seed(db, models, email: str, rows: int) -> Tuple[int, List[int]]:
+    """사용자 1명 + 레시피/즐겨찾기/히스토리/배출 기록 rows 개씩. (user_id, 즐겨찾기 안 한 레시피 id들)"""
+    user = models.User(email=email, password_hash="x", name=email)
+    db.add(user)
+    db.flush()
+
+    recipes = [
+        models.Recipe(title=f"{email} 레시피 {i}", ingredients=["재료"], fingerprint=f"{email}-{i}")
+        for i in range(rows + 2)
+    ]
+    db.add_all(recipes)
+    db.flush()
+
+    for r in recipes[:rows]:
+        db.add(models.FavoriteRecipe(user_id=user.id, recipe_id=r.id))
+        db.add(models.RecipeHistory(user_id=user.id, recipe_id=r.id, rating=4.0))
+        db.add(models.FoodWaste(user_id=user.id, ingredient_name="양파", amount_gram=10.0))
+    db.commit()
+    return user.id, [r.id for r in recipes[rows:]]
+
+
+def _requests(client, headers, recipe_id: int, favorited_id: int):
+    """(메서드, 이름, 호출) 목록. 목록 요청은 한 페이지에 모든 기록이 오도록 limit 크게."""
+    page = {"limit": PAGE_LIMIT}
+    return [
+        ("GET", "/auth/me", lambda: client.get("/auth/me", headers=headers)),
+        ("POST", "/api/waste/", lambda: client.post(
+            "/api/waste/", headers=headers, json={"ingredient_name": "대파", "amount_gram": 5})),
+        ("GET", "/api/waste/", lambda: client.get("/api/waste/", headers=headers, params=page)),
+        ("POST", "/api/recipes/favorite/{id} (신규)", lambda: client.post(
+            f"/api/recipes/favorite/{recipe_id}", headers=headers)),
+        ("POST", "/api/recipes/favorite/{id} (이미 있음)", lambda: client.post(
+            f"/api/recipes/favorite/{favorited_id}", headers=headers)),
+        ("GET", "/api/recipes/favorites", lambda: client.get(
+            "/api/recipes/favorites", headers=headers, params=page)),
+        ("POST", "/api/recipes/history", lambda: client.post(
+            "/api/recipes/history", headers=headers, json={"recipe_id": recipe_id, "rating": 5})),
+        ("GET", "/api/recipes/history", lambda: client.get(
+            "/api/recipes/history", headers=headers, params=page)),
+    ]
+
+
+def _import_routers(*names: str) -> List[types.ModuleType]:
+    """
+    app.router.<name> 모듈만 import (패키지 __init__ 실행 안 함).
+    __init__ 은 점검 대상이 아닌 라우터(ingredients 등)까지 모두 import 하므로,
+    빈 패키지 모듈을 먼저 등록해서 필요한 라우터 파일만 읽는다.
+    """
+    if "app.router" not in sys.modules:
+        import app
+
+        package = types.ModuleType("app.router")
+        package.__path__ = [str(Path(app.__file__).resolve().parent / "router")]
+        sys.modules["app.router"] = package
+    return [importlib.import_module(f"app.router.{name}") for name in names]
+
+
+def run(verbose: bool = False) -> bool:
+    # app.db 는 import 시점에 DATABASE_URL 로 엔진을 만들므로, 앱 모듈은 환경변수 설정 후 import
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app import models
+    from app.db import SessionLocal, async_engine
+    from app.migrate import upgrade_db
+    auth, recipes, waste = _import_routers("auth", "recipes", "waste")
+    from app.services.jwt_service import create_access_token
+
+    upgrade_db()
+
+    app = FastAPI()
+    for r in (auth.router, waste.router, recipes.router):
+        app.include_router(r)
+
+    db = SessionLocal()
+    try:
+        users = {
+            rows: _seed(db, models, f"user{rows}@example.com", rows)
+            for rows in (SMALL_ROWS, LARGE_ROWS)
+        }
+        # 이미 즐겨찾기한 레시피 id (사용자별 첫 레시피)
+        favorited = {
+            rows: db.query(models.FavoriteRecipe.recipe_id)
+            .filter(models.FavoriteRecipe.user_id == user_id)
+            .order_by(models.FavoriteRecipe.id)
+            .first()[0]
+            for rows, (user_id, _) in users.items()
+        }
+    finally:
+        db.close()
+
+    counts: Dict[Tuple[str, str], Dict[int, int]] = {}
+    ok = True
+    with TestClient(app) as client:
+        for rows, (user_id, free_recipe_ids) in users.items():
+            headers = {"Authorization": f"Bearer {create_access_token(f'user{rows}@example.com')}"}
+            for method, name, call in _requests(client, headers, free_recipe_ids[0], favorited[rows]):
+                with QueryCounter(async_engine.sync_engine) as counter:
+                    res = call()
+                if res.status_code != 200:
+                    print(f"[FAIL] {method} {name}: HTTP {res.status_code} {res.text[:200]}")
+                    ok = False
+                counts.setdefault((method, name), {})[rows] = counter.count
+                if verbose:
+                    print(f"--- {method} {name} (기록 {rows}개): {counter.count}개")
+                    for stmt in counter.statements:
+                        print("    " + " ".join(stmt.split())[:160])
+
+    for key, budget in BUDGETS.items():
+        by_rows = counts.get(key, {})
+        small, large = by_rows.get(SMALL_ROWS), by_rows.get(LARGE_ROWS)
+        problems = []
+        if large is None or small is None:
+            problems.append("실행 안 됨")
+        else:
+            if max(small, large) > budget:
+                problems.append(f"예산 {budget}개 초과")
+            if small != large:
+                problems.append(f"기록 수에 따라 증가 ({SMALL_ROWS}개: {small} → {LARGE_ROWS}개: {large})")
+        status = "OK  " if not problems else "FAIL"
+        print(f"[{status}] {key[0]:<4} {key[1]:<40} SQL {large}/{budget} {', '.join(problems)}")
+        ok = ok and not problems
+
+    print("✅ 모든 엔드포인트가 쿼리 예산 이내입니다." if ok else "❌ 쿼리 수 예산을 넘는 엔드포인트가 있습니다.")
+    return ok
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="엔드포인트별 SQL 실행 횟수(N+1) 점검")
+    parser.add_argument("-v", "--verbose", action="store_true", help="실행된 SQL 출력")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'query_counts.db')}"
+        os.environ.pop("ASYNC_DATABASE_URL", None)
+        ok = run(verbose=args.verbose)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
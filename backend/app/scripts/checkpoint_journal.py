@@ -0,0 +1,94 @@
+# app/scripts/checkpoint_journal.py
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+
+# -------------------------------------------------------------------
+# append-only 체크포인트 저널 (JSON Lines)
+#  - 새 chunk 하나당 한 줄만 append → 체크포인트 비용이 전체 크기와 무관
+#  - fsync는 fsync_every개 단위로 묶어서 수행
+#  - 재시작 시 replay()로 복구, 빌드가 끝나면 최종 인덱스로 compaction 후 삭제
+# -------------------------------------------------------------------
+
+class CheckpointJournal:
+    def __init__(self, path: Path, fsync_every: int = 20):
+        self.path = Path(path)
+        self.fsync_every = max(1, fsync_every)
+        self._file = None
+        self._pending = 0
+
+    # ---------------------------------------------------------------
+    # 복구
+    # ---------------------------------------------------------------
+    def replay(self) -> Iterator[Dict]:
+        """
+        저널에 기록된 엔트리를 순서대로 yield.
+        크래시로 마지막 줄이 잘려 있으면 그 앞까지만 읽고 파일을 잘라낸다.
+        """
+        if not self.path.exists():
+            return
+
+        good_offset = 0
+        truncated = False
+
+        with self.path.open("rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    truncated = True
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    truncated = True
+                    break
+                good_offset += len(line)
+                yield entry
+
+        if truncated:
+            print(f"[WARN] 저널 끝부분이 손상되어 잘라냅니다: {self.path} (offset={good_offset})")
+            with self.path.open("r+b") as f:
+                f.truncate(good_offset)
+
+    # ---------------------------------------------------------------
+    # 기록
+    # ---------------------------------------------------------------
+    def append(self, entry: Dict) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+
+        self._file.write(json.dumps(entry, ensure_ascii=False))
+        self._file.write("\n")
+        self._pending += 1
+
+        if self._pending >= self.fsync_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._file is None or self._pending == 0:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self.flush()
+        self._file.close()
+        self._file = None
+
+    def remove(self) -> None:
+        """compaction이 끝난 뒤 저널 삭제."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "CheckpointJournal":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> Optional[bool]:
+        self.close()
+        return None
@@ -0,0 +1,175 @@
+# app/scripts/compact_recipes.py
+
+import argparse
+import time
+from typing import Dict, List, Tuple
+
+from sqlalchemy import inspect, select, text
+
+from app.db import engine
+from app import models
+from app.migrate import upgrade_db
+from app.services.recipe_store import recipe_fingerprint
+
+# -------------------------------------------------------------------
+# recipes 테이블 중복 정리 (1회성)
+#  1) fingerprint 컬럼이 없으면 추가
+#  2) id 순으로 배치 스캔하며 지문 계산 → 지문별 가장 작은 id를 대표 행으로
+#  3) favorite_recipes / recipe_history 의 recipe_id 를 대표 행으로 변경
+#     (같은 사용자가 둘 다 즐겨찾기했으면 중복 즐겨찾기는 삭제)
+#  4) 중복 행 삭제, 대표 행에 지문 저장, unique 인덱스 생성
+#  전체를 한 트랜잭션으로 실행 → 중간에 실패하면 아무것도 바뀌지 않음
+#
+# 실행 (backend/ 에서):
+#   python -m app.scripts.compact_recipes --dry-run
+#   python -m app.scripts.compact_recipes
+# -------------------------------------------------------------------
+
+SCAN_BATCH = 1000
+WRITE_BATCH = 500
+
+
+def _ensure_fingerprint_column(conn) -> None:
+    columns = {c["name"] for c in inspect(conn).get_columns("recipes")}
+    if "fingerprint" not in columns:
+        conn.execute(text("ALTER TABLE recipes ADD COLUMN fingerprint VARCHAR(64)"))
+        print("[INFO] recipes.fingerprint 컬럼 추가")
+
+
+def _scan(conn) -> Tuple[Dict[str, int], List[Tuple[int, int]], List[Tuple[int, str]]]:
+    """(지문 → 대표 id, [(중복 id, 대표 id)], [(대표 id, 지문)])"""
+    canonical: Dict[str, int] = {}
+    duplicates: List[Tuple[int, int]] = []
+    fingerprints: List[Tuple[int, str]] = []
+
+    t = models.Recipe.__table__
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select(t.c.id, t.c.title, t.c.ingredients, t.c.instructions, t.c.fingerprint)
+            .where(t.c.id > last_id)
+            .order_by(t.c.id)
+            .limit(SCAN_BATCH)
+        ).all()
+        if not rows:
+            break
+
+        for rid, title, ingredients, instructions, old_fp in rows:
+            fp = recipe_fingerprint(title, ingredients, instructions)
+            if fp in canonical:
+                duplicates.append((rid, canonical[fp]))
+            else:
+                canonical[fp] = rid
+                if old_fp != fp:
+                    fingerprints.append((rid, fp))
+        last_id = rows[-1][0]
+
+    return canonical, duplicates, fingerprints
+
+
+def _chunks(items: List, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def compact(conn, dry_run: bool = False) -> Dict[str, int]:
+    """
+    열린 연결(트랜잭션) 위에서 중복 병합 + 지문 저장.
+    fingerprint 컬럼이 이미 있어야 한다.
+    """
+    canonical, duplicates, fingerprints = _scan(conn)
+
+    stats = {
+        "distinct": len(canonical),
+        "duplicates": len(duplicates),
+        "favorites_merged": 0,
+        "favorites_moved": 0,
+        "history_moved": 0,
+    }
+    if dry_run:
+        return stats
+
+    # 즐겨찾기는 중복 행 하나씩 순서대로 (삭제 → 이동):
+    # 한 사용자가 같은 레시피의 중복 행 여러 개를 즐겨찾기했으면, 앞에서 대표 행으로 옮긴
+    # 즐겨찾기를 다음 중복 행의 삭제 조건이 봐야 (user_id, recipe_id) unique 충돌이 없다
+    for dup, canon in duplicates:
+        params = {"dup": dup, "canon": canon}
+
+        # 같은 사용자가 대표 행도 즐겨찾기했으면 중복 행 쪽 즐겨찾기 삭제
+        res = conn.execute(
+            text(
+                "DELETE FROM favorite_recipes WHERE recipe_id = :dup AND user_id IN "
+                "(SELECT user_id FROM favorite_recipes WHERE recipe_id = :canon)"
+            ),
+            params,
+        )
+        stats["favorites_merged"] += max(res.rowcount, 0)
+
+        res = conn.execute(
+            text("UPDATE favorite_recipes SET recipe_id = :canon WHERE recipe_id = :dup"),
+            params,
+        )
+        stats["favorites_moved"] += max(res.rowcount, 0)
+
+    # 조리 기록은 unique 제약이 없으므로 배치로 이동
+    for batch in _chunks(duplicates, WRITE_BATCH):
+        params = [{"dup": dup, "canon": canon} for dup, canon in batch]
+
+        res = conn.execute(
+            text("UPDATE recipe_history SET recipe_id = :canon WHERE recipe_id = :dup"),
+            params,
+        )
+        stats["history_moved"] += max(res.rowcount, 0)
+
+        conn.execute(text("DELETE FROM recipes WHERE id = :dup"), params)
+
+    # 중복이 지워진 뒤에 지문을 채워야 unique 충돌이 없다.
+    # 바꿀 행의 옛 지문을 먼저 모두 비워서 행끼리 잠깐 겹치는 경우도 막는다.
+    for batch in _chunks(fingerprints, WRITE_BATCH):
+        conn.execute(
+            text("UPDATE recipes SET fingerprint = NULL WHERE id = :id"),
+            [{"id": rid} for rid, _ in batch],
+        )
+    for batch in _chunks(fingerprints, WRITE_BATCH):
+        conn.execute(
+            text("UPDATE recipes SET fingerprint = :fp WHERE id = :id"),
+            [{"id": rid, "fp": fp} for rid, fp in batch],
+        )
+    return stats
+
+
+def compact_recipes(dry_run: bool = False) -> Dict[str, int]:
+    started = time.time()
+    if not dry_run:
+        upgrade_db()  # 스키마 최신화 (테이블이 없거나 fingerprint 컬럼이 없는 경우 포함)
+
+    with engine.begin() as conn:
+        _ensure_fingerprint_column(conn)
+        stats = compact(conn, dry_run=dry_run)
+
+        if dry_run:
+            print(f"[DRY-RUN] 고유 레시피 {stats['distinct']}개, 중복 {stats['duplicates']}개 (변경 없음)")
+            conn.rollback()
+            return stats
+
+        for index in models.Recipe.__table__.indexes:
+            if "fingerprint" in index.columns:
+                index.create(bind=conn, checkfirst=True)
+
+    print(
+        f"✅ 레시피 정리 완료 ({time.time() - started:.1f}s): 고유 {stats['distinct']}개, "
+        f"중복 삭제 {stats['duplicates']}개, 즐겨찾기 이동 {stats['favorites_moved']}개 "
+        f"(중복 즐겨찾기 삭제 {stats['favorites_merged']}개), 히스토리 이동 {stats['history_moved']}개"
+    )
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="recipes 테이블 중복 병합 + fingerprint 인덱스 생성")
+    parser.add_argument("--dry-run", action="store_true", help="개수만 세고 변경하지 않음")
+    args = parser.parse_args()
+    compact_recipes(dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
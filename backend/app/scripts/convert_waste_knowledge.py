@@ -0,0 +1,60 @@
+# app/scripts/convert_waste_knowledge.py
+
+import argparse
+import json
+from pathlib import Path
+
+from app.services.vector_index import VectorIndex
+
+# -------------------------------------------------------------------
+# 경로 설정
+# -------------------------------------------------------------------
+
+# backend/app/ 경로
+APP_DIR = Path(__file__).resolve().parents[1]
+
+LEGACY_JSON_PATH = APP_DIR / "data" / "waste_knowledge.json"
+OUTPUT_MATRIX_PATH = APP_DIR / "data" / "waste_knowledge.npy"
+OUTPUT_META_PATH = APP_DIR / "data" / "waste_knowledge.meta.json"
+
+
+# -------------------------------------------------------------------
+# (구) JSON → 바이너리 인덱스 변환
+# -------------------------------------------------------------------
+
+def convert(
+    json_path: Path = LEGACY_JSON_PATH,
+    matrix_path: Path = OUTPUT_MATRIX_PATH,
+    meta_path: Path = OUTPUT_META_PATH,
+) -> int:
+    """
+    기존 waste_knowledge.json(임베딩이 JSON float로 들어있는 포맷)을 읽어
+    .npy 행렬 + .meta.json 사이드카로 저장한다. 변환된 엔트리 수를 반환.
+    """
+    if not json_path.exists():
+        raise RuntimeError(f"{json_path} 파일이 없습니다.")
+
+    with json_path.open("r", encoding="utf-8") as f:
+        entries = json.load(f)
+
+    index = VectorIndex.from_entries(entries)
+    index.save(matrix_path, meta_path)
+
+    skipped = len(entries) - len(index)
+    if skipped:
+        print(f"[WARN] embedding이 없는 엔트리 {skipped}개는 제외했습니다.")
+
+    return len(index)
+
+
+if __name__ == "__main__":
+    # backend/ 에서 실행: python -m app.scripts.convert_waste_knowledge
+    parser = argparse.ArgumentParser(description="waste_knowledge.json → 바이너리 인덱스 변환")
+    parser.add_argument("--json", type=Path, default=LEGACY_JSON_PATH)
+    parser.add_argument("--matrix", type=Path, default=OUTPUT_MATRIX_PATH)
+    parser.add_argument("--meta", type=Path, default=OUTPUT_META_PATH)
+    args = parser.parse_args()
+
+    count = convert(args.json, args.matrix, args.meta)
+    print(f"[완료] {count}개 엔트리 변환: {args.matrix}, {args.meta}")
+    print("[INFO] 변환 확인 후 기존 JSON 파일은 삭제해도 됩니다.")
@@ -0,0 +1,48 @@
+# app/scripts/embed_server.py
+
+import argparse
+import os
+
+from app.services import embed_model
+from app.services.embed_sidecar import serve
+
+# -------------------------------------------------------------------
+# 임베딩 사이드카 실행
+#  - 모델을 이 프로세스에만 올리고 uvicorn 워커들은 EMBED_SERVER_SOCKET 으로 접속
+#
+# 실행 (backend/ 에서):
+#   python -m app.scripts.embed_server --socket /tmp/fridge-embed.sock --backend int8
+#   EMBED_SERVER_SOCKET=/tmp/fridge-embed.sock uvicorn app.main:app --workers 4
+# -------------------------------------------------------------------
+
+DEFAULT_SOCKET = os.getenv("EMBED_SERVER_SOCKET") or "/tmp/fridge-embed.sock"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SentenceTransformer 임베딩 사이드카")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    parser.add_argument("--model", default=embed_model.EMBED_MODEL_NAME)
+    parser.add_argument("--backend", default=embed_model.EMBED_BACKEND, choices=["torch", "int8", "onnx"])
+    parser.add_argument("--max-batch", type=int, default=64, help="한 번에 인코딩할 최대 텍스트 수")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="배치를 모으는 최대 대기 시간")
+    parser.add_argument("--threads", type=int, default=None, help="torch CPU 스레드 수")
+    args = parser.parse_args()
+
+    if args.threads:
+        import torch
+        torch.set_num_threads(args.threads)
+
+    model = embed_model.load_model(args.model, args.backend)
+    model.encode(["워밍업"])  # 첫 요청 전에 준비
+    print(f"[INFO] 모델 로딩 완료: {args.model} ({args.backend})")
+
+    serve(
+        args.socket,
+        lambda texts: model.encode(texts, batch_size=args.max_batch),
+        max_batch=args.max_batch,
+        max_wait_ms=args.max_wait_ms,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# app/scripts/embedding_pipeline.py
+
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# 여러 텍스트를 받아 같은 순서의 임베딩 리스트를 돌려주는 함수
+# (기본은 genai.embed_content, 테스트에서는 로컬 fake embedder 주입)
+EmbedFn = Callable[[List[str]], List[List[float]]]
+
+
+# -------------------------------------------------------------------
+# 토큰 버킷 rate limiter
+# -------------------------------------------------------------------
+
+class TokenBucket:
+    """
+    초당 rate개 토큰이 채워지고 최대 capacity개까지 쌓이는 버킷.
+    acquire()는 토큰이 생길 때까지 블록한다. (여러 스레드에서 공유)
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다.")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+
+                wait_sec = (tokens - self._tokens) / self.rate
+
+            time.sleep(wait_sec)
+
+
+# -------------------------------------------------------------------
+# 배치 + 재시도
+# -------------------------------------------------------------------
+
+def iter_batches(items: Iterable[T], batch_size: int) -> Iterator[List[T]]:
+    """items를 batch_size개씩 묶어서 yield (마지막 배치는 더 작을 수 있음)."""
+    batch: List[T] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def embed_with_retry(
+    embed_fn: EmbedFn,
+    texts: List[str],
+    limiter: Optional[TokenBucket] = None,
+    max_retries: int = 5,
+    base_delay: float = 1.0,
+    max_delay: float = 30.0,
+) -> List[List[float]]:
+    """
+    embed_fn(texts)를 호출하고 실패하면 지수 백오프(+jitter)로 재시도.
+    요청마다(재시도 포함) limiter 토큰을 하나씩 소비한다.
+    """
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            embeddings = embed_fn(texts)
+            if len(embeddings) != len(texts):
+                raise ValueError(
+                    f"임베딩 개수({len(embeddings)})가 입력 개수({len(texts)})와 다릅니다."
+                )
+            return embeddings
+        except Exception:
+            attempt += 1
+            if attempt > max_retries:
+                raise
+            delay = min(max_delay, base_delay * (2 ** (attempt - 1)))
+            time.sleep(delay * (0.5 + random.random() / 2))
+
+
+# -------------------------------------------------------------------
+# 동시 임베딩 파이프라인
+# -------------------------------------------------------------------
+
+def embed_in_batches(
+    items: Iterable[Tuple[T, str]],
+    embed_fn: EmbedFn,
+    batch_size: int = 32,
+    max_workers: int = 4,
+    requests_per_sec: float = 5.0,
+    max_retries: int = 5,
+) -> Iterator[Tuple[List[Tuple[T, str]], Optional[List[List[float]]], Optional[Exception]]]:
+    """
+    (key, text) 스트림을 batch_size개씩 묶어 max_workers개 스레드로 동시에 임베딩한다.
+
+    - items는 lazy하게 소비되며, 동시에 떠 있는 배치는 max_workers * 2개로 제한
+    - 모든 워커가 하나의 토큰 버킷(requests_per_sec)을 공유
+    - 완료된 순서대로 (batch, embeddings, None) 을 yield,
+      재시도까지 모두 실패한 배치는 (batch, None, error) 를 yield
+    """
+    limiter = TokenBucket(requests_per_sec)
+    max_in_flight = max(1, max_workers * 2)
+    batches = iter_batches(items, batch_size)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        in_flight: Dict[Future, List[Tuple[T, str]]] = {}
+
+        def submit_next() -> bool:
+            batch = next(batches, None)
+            if batch is None:
+                return False
+            texts = [text for _, text in batch]
+            fut = pool.submit(embed_with_retry, embed_fn, texts, limiter, max_retries)
+            in_flight[fut] = batch
+            return True
+
+        exhausted = False
+        while True:
+            while not exhausted and len(in_flight) < max_in_flight:
+                exhausted = not submit_next()
+
+            if not in_flight:
+                break
+
+            done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for fut in done:
+                batch = in_flight.pop(fut)
+                try:
+                    yield batch, fut.result(), None
+                except Exception as e:
+                    yield batch, None, e
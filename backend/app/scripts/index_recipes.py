@@ -0,0 +1,227 @@
+# app/scripts/index_recipes.py
+
+import argparse
+import codecs
+import hashlib
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.services.recipe_retrieval import DENSE_SOURCE_CSV
+
+# -------------------------------------------------------------------
+# 레시피 → Chroma(recipes 컬렉션) 대량 색인
+#  - korean_recipes1.csv 와 DB recipes 테이블을 고정 크기 배치로 스트리밍
+#    (전체를 메모리에 올리지 않음: 읽는 배치 1개 + 인코딩 중인 배치 1개)
+#  - 문서별 content_hash(본문 + 임베딩 모델명)가 같으면 건너뜀
+#  - 인코딩/upsert는 별도 스레드에서 진행 → 다음 배치 읽기/해시 비교와 겹침
+#  - persist는 작업 끝에 한 번
+#
+# 실행 (backend/ 에서):
+#   python -m app.scripts.index_recipes
+#   python -m app.scripts.index_recipes --no-db --batch-size 1024 --encode-batch-size 128 --threads 8
+# -------------------------------------------------------------------
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+APP_DIR = BASE_DIR / "app"
+CSV_PATH = APP_DIR / "data" / "korean_recipes1.csv"
+
+DENSE_SOURCE_DB = "db"
+
+Doc = Dict[str, Any]
+
+
+# -------------------------------------------------------------------
+# 문서 만들기
+# -------------------------------------------------------------------
+def _doc_text(name: Any, ingredients: Any, steps: Any) -> str:
+    return f"레시피 이름: {name}\n재료: {ingredients}\n조리 단계: {steps}"
+
+
+def _content_hash(text: str, model_name: str) -> str:
+    return hashlib.sha256(f"{model_name}\n{text}".encode("utf-8")).hexdigest()
+
+
+def _detect_encoding(path: Path, candidates=("cp949", "utf-8")) -> str:
+    """파일 전체를 1MB씩 점진 디코딩해 처음으로 성공하는 인코딩 (메모리 일정)."""
+    for enc in candidates:
+        decoder = codecs.getincrementaldecoder(enc)()
+        try:
+            with path.open("rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    decoder.decode(block)
+            decoder.decode(b"", final=True)
+            return enc
+        except UnicodeDecodeError:
+            continue
+    return "utf-8"
+
+
+def iter_csv_docs(path: Path, batch_size: int, model_name: str) -> Iterator[List[Doc]]:
+    import pandas as pd
+
+    encoding = _detect_encoding(path)
+    reader = pd.read_csv(path, encoding=encoding, chunksize=batch_size)
+    for chunk in reader:
+        chunk = chunk.fillna("")
+        docs: List[Doc] = []
+        for rec in chunk.to_dict(orient="records"):
+            text = _doc_text(rec.get("recipe_name", ""), rec.get("ingredients", ""), rec.get("steps", ""))
+            docs.append(
+                {
+                    "id": f"{DENSE_SOURCE_CSV}-{rec['recipe_id']}",
+                    "text": text,
+                    "meta": {
+                        "source": DENSE_SOURCE_CSV,
+                        "recipe_id": rec["recipe_id"],
+                        "recipe_name": str(rec.get("recipe_name", "")),
+                        "content_hash": _content_hash(text, model_name),
+                    },
+                }
+            )
+        yield docs
+
+
+def iter_db_docs(batch_size: int, model_name: str) -> Iterator[List[Doc]]:
+    """recipes 테이블을 id 기준 keyset 페이지로 읽는다 (OFFSET 없이 일정한 비용)."""
+    from app.db import SessionLocal
+    from app import models
+
+    db = SessionLocal()
+    try:
+        last_id = 0
+        while True:
+            rows = (
+                db.query(models.Recipe)
+                .filter(models.Recipe.id > last_id)
+                .order_by(models.Recipe.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                return
+
+            docs: List[Doc] = []
+            for r in rows:
+                ingredients = ", ".join(map(str, r.ingredients or []))
+                text = _doc_text(r.title, ingredients, r.instructions or "")
+                docs.append(
+                    {
+                        "id": f"{DENSE_SOURCE_DB}-{r.id}",
+                        "text": text,
+                        "meta": {
+                            "source": DENSE_SOURCE_DB,
+                            "recipe_id": r.id,
+                            "recipe_name": r.title,
+                            "content_hash": _content_hash(text, model_name),
+                        },
+                    }
+                )
+            last_id = rows[-1].id
+            db.expunge_all()  # 세션에 ORM 객체가 쌓이지 않도록
+            yield docs
+    finally:
+        db.close()
+
+
+# -------------------------------------------------------------------
+# 색인
+# -------------------------------------------------------------------
+def _changed(store, docs: List[Doc]) -> List[Doc]:
+    existing = store.get_metadatas([d["id"] for d in docs])
+    return [
+        d for d in docs
+        if existing.get(d["id"], {}).get("content_hash") != d["meta"]["content_hash"]
+    ]
+
+
+def index_recipes(
+    csv_path: Optional[Path] = CSV_PATH,
+    include_db: bool = True,
+    batch_size: int = 512,
+    encode_batch_size: int = 64,
+    threads: Optional[int] = None,
+) -> Dict[str, Any]:
+    from app import vectot_store as store
+
+    if threads:
+        try:
+            import torch
+            torch.set_num_threads(threads)
+        except ImportError:
+            print("[WARN] torch가 없어 --threads 설정을 무시합니다.")
+
+    model_name = store._EMBED_MODEL_NAME
+    stats = {"read": 0, "skipped": 0, "upserted": 0}
+    started = time.time()
+
+    sources: List[Iterator[List[Doc]]] = []
+    if csv_path is not None:
+        if csv_path.exists():
+            sources.append(iter_csv_docs(csv_path, batch_size, model_name))
+        else:
+            print(f"[WARN] 레시피 CSV 파일이 없습니다: {csv_path}")
+    if include_db:
+        sources.append(iter_db_docs(batch_size, model_name))
+
+    def _upsert(docs: List[Doc]) -> int:
+        store.upsert_recipes(docs, batch_size=encode_batch_size, persist=False)
+        return len(docs)
+
+    # 인코딩 스레드 1개: torch가 내부적으로 CPU 스레드를 쓰고, 그동안 다음 배치를 준비
+    pending: Optional[Future] = None
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        for source in sources:
+            for docs in source:
+                stats["read"] += len(docs)
+                todo = _changed(store, docs)
+                stats["skipped"] += len(docs) - len(todo)
+                if not todo:
+                    continue
+
+                if pending is not None:
+                    stats["upserted"] += pending.result()
+                pending = pool.submit(_upsert, todo)
+
+                elapsed = time.time() - started
+                print(
+                    f"[INFO] 읽음 {stats['read']} / 건너뜀 {stats['skipped']} / "
+                    f"색인 {stats['upserted']} ({elapsed:.1f}s)"
+                )
+
+        if pending is not None:
+            stats["upserted"] += pending.result()
+
+    if stats["upserted"]:
+        store.persist_store()
+
+    stats["elapsed_sec"] = round(time.time() - started, 2)
+    print(
+        f"✅ 레시피 색인 완료: 읽음 {stats['read']}, 건너뜀 {stats['skipped']}, "
+        f"새로/다시 색인 {stats['upserted']} ({stats['elapsed_sec']}s)"
+    )
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="레시피 CSV/DB → Chroma 대량 색인")
+    parser.add_argument("--csv", type=Path, default=CSV_PATH)
+    parser.add_argument("--no-csv", action="store_true")
+    parser.add_argument("--no-db", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=512, help="읽기/upsert 배치 크기")
+    parser.add_argument("--encode-batch-size", type=int, default=64, help="model.encode 배치 크기")
+    parser.add_argument("--threads", type=int, default=None, help="torch CPU 스레드 수")
+    args = parser.parse_args()
+
+    index_recipes(
+        csv_path=None if args.no_csv else args.csv,
+        include_db=not args.no_db,
+        batch_size=args.batch_size,
+        encode_batch_size=args.encode_batch_size,
+        threads=args.threads,
+    )
+
+
+if __name__ == "__main__":
+    main()
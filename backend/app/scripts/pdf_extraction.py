@@ -0,0 +1,93 @@
+# app/scripts/pdf_extraction.py
+
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Deque, Iterable, Iterator, List, Optional, Tuple
+
+from pypdf import PdfReader
+
+
+# -------------------------------------------------------------------
+# 워커 프로세스에서 실행되는 함수들 (pickle 가능하도록 모듈 최상위에 둔다)
+# -------------------------------------------------------------------
+
+def _count_pages(pdf_path: Path) -> int:
+    try:
+        return len(PdfReader(str(pdf_path)).pages)
+    except Exception as e:
+        print(f"[WARN] PDF 열기 실패 ({pdf_path.name}): {e}")
+        return 0
+
+
+def _extract_pages(pdf_path: Path, start: int, end: int) -> List[str]:
+    """[start, end) 페이지의 텍스트를 추출. 실패한 페이지는 빈 문자열."""
+    reader = PdfReader(str(pdf_path))
+    texts: List[str] = []
+    for page in reader.pages[start:end]:
+        try:
+            texts.append((page.extract_text() or "").strip())
+        except Exception as e:
+            print(f"[WARN] 페이지 추출 실패 ({pdf_path.name}): {e}")
+            texts.append("")
+    return texts
+
+
+# -------------------------------------------------------------------
+# 병렬 추출 → 페이지 스트림
+# -------------------------------------------------------------------
+
+def iter_pdf_pages(
+    pdf_paths: Iterable[Path],
+    max_workers: Optional[int] = None,
+    pages_per_task: int = 8,
+) -> Iterator[Tuple[Path, Iterator[str]]]:
+    """
+    여러 PDF를 프로세스 풀에서 병렬로 추출하고, PDF 순서대로 (pdf_path, 페이지 텍스트 iterator)를 yield.
+
+    - 큰 PDF는 pages_per_task 페이지 단위 작업으로 쪼개 여러 프로세스가 나눠 처리
+    - 미리 제출해 두는 작업 수를 max_workers * 2개로 제한 → 뒤쪽 PDF 추출이
+      앞쪽 PDF의 chunk/임베딩 처리와 겹쳐서 진행되고 메모리도 일정하게 유지
+    - 페이지 iterator는 다음 PDF로 넘어가기 전에 소비해야 하며,
+      중간에 그만 읽으면(문자 수 제한 등) 남은 작업은 취소된다
+    """
+    pdf_paths = list(pdf_paths)
+    if not pdf_paths:
+        return
+
+    workers = max_workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        page_counts = list(pool.map(_count_pages, pdf_paths))
+
+        # (pdf 번호, 경로, 시작 페이지, 끝 페이지)
+        pending: Deque[Tuple[int, Path, int, int]] = deque(
+            (i, path, s, min(s + pages_per_task, n))
+            for i, (path, n) in enumerate(zip(pdf_paths, page_counts))
+            for s in range(0, n, pages_per_task)
+        )
+        window: Deque[Tuple[int, Future]] = deque()
+
+        def fill() -> None:
+            while pending and len(window) < max_in_flight:
+                i, path, s, e = pending.popleft()
+                window.append((i, pool.submit(_extract_pages, path, s, e)))
+
+        def pages_of(doc_idx: int) -> Iterator[str]:
+            while True:
+                fill()
+                if not window or window[0][0] != doc_idx:
+                    return
+                _, fut = window.popleft()
+                yield from fut.result()
+
+        for doc_idx, path in enumerate(pdf_paths):
+            yield path, pages_of(doc_idx)
+
+            # 소비자가 중간에 멈췄으면 이 PDF의 남은 작업은 버린다
+            while window and window[0][0] == doc_idx:
+                window.popleft()[1].cancel()
+            while pending and pending[0][0] == doc_idx:
+                pending.popleft()
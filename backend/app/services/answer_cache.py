@@ -0,0 +1,128 @@
+# app/services/answer_cache.py
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# -------------------------------------------------------------------
+# 의미 기반 답변 캐시
+#  - 질문 임베딩 코사인 유사도가 threshold 이상이고
+#  - 검색된 chunk 집합이 같을 때만 이전 답변을 재사용
+#  - TTL 만료 / 인덱스 버전(build_id)이 바뀌면 전체 무효화
+# -------------------------------------------------------------------
+
+class SemanticAnswerCache:
+    def __init__(self, threshold: float = 0.95, ttl_sec: float = 24 * 3600, max_entries: int = 2000):
+        self.threshold = threshold
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._embs: Optional[np.ndarray] = None  # (N, D) 정규화된 질문 임베딩
+        self._items: List[Dict] = []              # 행과 1:1 (chunk_ids, answer, sources, created_at)
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _unit(q_emb: Sequence[float]) -> Optional[np.ndarray]:
+        q = np.asarray(q_emb, dtype=np.float32).reshape(-1)
+        norm = float(np.linalg.norm(q))
+        if norm == 0.0:
+            return None
+        return q / norm
+
+    def _reset(self, version: Optional[str]) -> None:
+        self._version = version
+        self._embs = None
+        self._items = []
+
+    def _drop_expired(self, now: float) -> None:
+        keep = [i for i, item in enumerate(self._items) if now - item["created_at"] <= self.ttl_sec]
+        if len(keep) == len(self._items):
+            return
+        self._items = [self._items[i] for i in keep]
+        self._embs = self._embs[keep] if keep else None
+
+    # ---------------------------------------------------------------
+    # 조회/저장
+    # ---------------------------------------------------------------
+    def lookup(
+        self,
+        q_emb: Sequence[float],
+        chunk_ids: Sequence[str],
+        version: Optional[str],
+    ) -> Optional[Tuple[str, List[str]]]:
+        """캐시된 (answer, sources) 반환, 없으면 None."""
+        q = self._unit(q_emb)
+        key = frozenset(chunk_ids)
+        now = time.time()
+
+        with self._lock:
+            if version != self._version:
+                self._reset(version)
+
+            self._drop_expired(now)
+
+            if q is None or self._embs is None or self._embs.shape[1] != q.shape[0]:
+                self.misses += 1
+                return None
+
+            scores = self._embs @ q
+            for i in np.argsort(-scores):
+                if scores[i] < self.threshold:
+                    break
+                item = self._items[i]
+                if item["chunk_ids"] == key:
+                    self.hits += 1
+                    return item["answer"], list(item["sources"])
+
+            self.misses += 1
+            return None
+
+    def store(
+        self,
+        q_emb: Sequence[float],
+        chunk_ids: Sequence[str],
+        version: Optional[str],
+        answer: str,
+        sources: List[str],
+    ) -> None:
+        q = self._unit(q_emb)
+        if q is None:
+            return
+
+        with self._lock:
+            if version != self._version:
+                self._reset(version)
+
+            if self._embs is not None and self._embs.shape[1] != q.shape[0]:
+                self._reset(version)
+
+            item = {
+                "chunk_ids": frozenset(chunk_ids),
+                "answer": answer,
+                "sources": list(sources),
+                "created_at": time.time(),
+            }
+            row = q[None, :]
+            self._embs = row if self._embs is None else np.vstack([self._embs, row])
+            self._items.append(item)
+
+            # 가장 오래된 항목부터 제거
+            overflow = len(self._items) - self.max_entries
+            if overflow > 0:
+                self._items = self._items[overflow:]
+                self._embs = self._embs[overflow:]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset(self._version)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._items)}
@@ -1,9 +1,11 @@
 # app/services/auth_service.py
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, Header, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.db import get_async_db, get_db
 from app import models
 from app.services.jwt_service import decode_token
 
@@ -18,13 +20,8 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
-def get_current_user(
-    authorization: str | None = Header(default=None),
-    db: Session = Depends(get_db),
-) -> models.User:
-    """
-    Authorization: Bearer <token> 헤더에서 JWT를 읽어 현재 유저 반환
-    """
+def _email_from_header(authorization: str | None) -> str:
+    """Authorization: Bearer <token> 헤더에서 JWT를 읽어 이메일(sub) 반환"""
     if authorization is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -46,12 +43,37 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload",
         )
+    return email
 
-    user = db.query(models.User).filter(models.User.email == email).first()
+
+def _user_or_401(user: models.User | None) -> models.User:
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
-
     return user
+
+
+def get_current_user(
+    authorization: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+) -> models.User:
+    """
+    Authorization: Bearer <token> 헤더에서 JWT를 읽어 현재 유저 반환 (동기 세션)
+    """
+    email = _email_from_header(authorization)
+    user = db.query(models.User).filter(models.User.email == email).first()
+    return _user_or_401(user)
+
+
+async def get_current_user_async(
+    authorization: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+) -> models.User:
+    """
+    get_current_user의 AsyncSession 버전 (async 라우터용)
+    """
+    email = _email_from_header(authorization)
+    user = await db.scalar(select(models.User).where(models.User.email == email))
+    return _user_or_401(user)
@@ -0,0 +1,113 @@
+# app/services/embed_model.py
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, List, Optional
+
+import numpy as np
+
+from app.services.micro_batcher import MicroBatcher
+
+# =====================================
+# SentenceTransformer 임베딩 모델 관리
+#  - 백엔드 선택 (EMBED_BACKEND)
+#      torch : 기본 fp32
+#      int8  : torch 동적 양자화 (Linear 층 int8) → CPU 메모리/지연 감소
+#      onnx  : sentence-transformers ONNX 백엔드 (optimum[onnxruntime] 필요)
+#  - EMBED_SERVER_SOCKET 이 있으면 모델을 직접 올리지 않고
+#    사이드카 프로세스(scripts/embed_server.py)에 유닉스 소켓으로 요청
+#  - EMBED_WARMUP=1 이면 서버 시작 시 모델 로딩 + 더미 인코딩
+#  - 질의처럼 작은 인코딩 요청은 MicroBatcher로 모아서 한 번에 encode
+#  chromadb 없이도 import 가능 (사이드카는 이 모듈만 사용)
+# =====================================
+
+EMBED_MODEL_NAME = os.getenv("EMBED_MODEL_NAME", "jhgan/ko-sroberta-multitask")
+EMBED_BACKEND = os.getenv("EMBED_BACKEND", "torch")
+EMBED_SERVER_SOCKET = os.getenv("EMBED_SERVER_SOCKET") or None
+EMBED_WARMUP = os.getenv("EMBED_WARMUP", "0") == "1"
+
+# 질의 마이크로 배칭: 이 개수 미만 요청은 모아서 인코딩, 이상이면 바로 인코딩
+QUERY_MAX_BATCH = int(os.getenv("EMBED_QUERY_MAX_BATCH", "32"))
+QUERY_MAX_WAIT_MS = float(os.getenv("EMBED_QUERY_MAX_WAIT_MS", "5"))
+
+_model: Any = None
+_model_lock = threading.Lock()
+_client: Any = None
+
+
+def load_model(name: str = EMBED_MODEL_NAME, backend: str = EMBED_BACKEND):
+    """지정한 백엔드로 SentenceTransformer 로딩. 실패하면 경고 후 torch fp32로."""
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "onnx":
+        try:
+            return SentenceTransformer(name, device="cpu", backend="onnx")
+        except Exception as e:
+            print(f"[WARN] ONNX 백엔드 로딩 실패 → torch로 대체: {e}")
+
+    model = SentenceTransformer(name, device="cpu" if backend == "int8" else None)
+
+    if backend == "int8":
+        try:
+            import torch
+            model = torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        except Exception as e:
+            print(f"[WARN] int8 양자화 실패 → fp32로 사용: {e}")
+
+    return model
+
+
+def get_model():
+    """프로세스 내 모델을 lazy하게 한 번만 로딩."""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = load_model()
+    return _model
+
+
+_query_batcher = MicroBatcher(
+    lambda texts: get_model().encode(texts, batch_size=QUERY_MAX_BATCH),
+    max_batch=QUERY_MAX_BATCH,
+    max_wait_ms=QUERY_MAX_WAIT_MS,
+    name="embed-query-batcher",
+)
+
+
+def _get_client():
+    global _client
+    if _client is None:
+        from app.services.embed_sidecar import EmbedClient
+        _client = EmbedClient(EMBED_SERVER_SOCKET)
+    return _client
+
+
+def encode(texts: List[str], batch_size: int = 64) -> List[List[float]]:
+    """텍스트 리스트 → 임베딩 리스트. 사이드카가 설정돼 있으면 사이드카로."""
+    if EMBED_SERVER_SOCKET:
+        return _get_client().encode(texts).tolist()
+    if len(texts) < QUERY_MAX_BATCH:
+        # 동시에 들어온 다른 질의들과 함께 인코딩
+        return np.asarray(_query_batcher.run(texts)).tolist()
+    return get_model().encode(texts, batch_size=batch_size).tolist()
+
+
+def warm_up(force: Optional[bool] = None) -> bool:
+    """
+    모델(또는 사이드카 연결)을 미리 준비. 첫 사용자 요청이 모델 로딩 시간을 떠안지 않도록.
+    실패해도 서버는 계속 뜨고, 첫 요청 때 다시 시도한다.
+    """
+    if not (EMBED_WARMUP if force is None else force):
+        return False
+    try:
+        encode(["워밍업"])
+        target = EMBED_SERVER_SOCKET or f"{EMBED_MODEL_NAME} ({EMBED_BACKEND})"
+        print(f"[INFO] 임베딩 모델 워밍업 완료: {target}")
+        return True
+    except Exception as e:
+        print(f"[WARN] 임베딩 모델 워밍업 실패: {e}")
+        return False
@@ -0,0 +1,149 @@
+# app/services/embed_sidecar.py
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.services.micro_batcher import MicroBatcher
+
+# -------------------------------------------------------------------
+# 임베딩 사이드카 (유닉스 소켓)
+#  - 모델은 사이드카 프로세스 하나에만 올리고, uvicorn 워커들은 소켓으로 요청
+#  - 프레임: 4바이트 big-endian 길이 + 본문
+#      요청 : JSON {"texts": [...]}
+#      응답 : JSON {"ok": true, "count": N, "dim": D} + float32 행렬 바이트
+#             또는 JSON {"ok": false, "error": "..."}
+#  - 서버는 여러 연결에서 동시에 들어온 요청을 MicroBatcher로 모아(max_wait_ms, max_batch) 한 번에 인코딩
+# -------------------------------------------------------------------
+
+_LEN = struct.Struct(">I")
+
+EncodeFn = Callable[[List[str]], np.ndarray]
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("임베딩 사이드카 연결이 끊어졌습니다.")
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+def send_frame(sock: socket.socket, payload: bytes) -> None:
+    sock.sendall(_LEN.pack(len(payload)) + payload)
+
+
+def recv_frame(sock: socket.socket) -> bytes:
+    (size,) = _LEN.unpack(_recv_exact(sock, _LEN.size))
+    return _recv_exact(sock, size)
+
+
+# -------------------------------------------------------------------
+# 클라이언트 (워커 쪽)
+# -------------------------------------------------------------------
+class EmbedClient:
+    """스레드마다 연결 하나를 재사용. 연결이 끊기면 한 번 다시 연결해서 재시도."""
+
+    def __init__(self, socket_path: str, timeout: float = 30.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        return sock
+
+    def _request(self, texts: List[str]) -> np.ndarray:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = self._local.sock = self._connect()
+
+        send_frame(sock, json.dumps({"texts": texts}, ensure_ascii=False).encode("utf-8"))
+        header = json.loads(recv_frame(sock))
+        if not header.get("ok"):
+            raise RuntimeError(f"임베딩 사이드카 오류: {header.get('error')}")
+
+        body = recv_frame(sock)
+        return np.frombuffer(body, dtype=np.float32).reshape(header["count"], header["dim"])
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        try:
+            return self._request(texts)
+        except (OSError, ConnectionError):
+            self.close()
+            return self._request(texts)
+
+    def close(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            try:
+                sock.close()
+            finally:
+                self._local.sock = None
+
+
+# -------------------------------------------------------------------
+# 서버 (사이드카 쪽)
+# -------------------------------------------------------------------
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        batcher: MicroBatcher = self.server.batcher  # type: ignore[attr-defined]
+        while True:
+            try:
+                request = json.loads(recv_frame(self.request))
+            except (ConnectionError, OSError):
+                return
+
+            try:
+                texts = [str(t) for t in request.get("texts", [])]
+                embs = np.asarray(batcher.run(texts), dtype=np.float32) if texts else np.zeros((0, 0), np.float32)
+                header: Dict[str, Any] = {"ok": True, "count": int(embs.shape[0]), "dim": int(embs.shape[1])}
+                send_frame(self.request, json.dumps(header).encode("utf-8"))
+                send_frame(self.request, np.ascontiguousarray(embs, dtype=np.float32).tobytes())
+            except (ConnectionError, OSError):
+                return
+            except Exception as e:
+                send_frame(self.request, json.dumps({"ok": False, "error": str(e)}).encode("utf-8"))
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 128  # 워커 여러 개가 동시에 접속해도 connect가 거절되지 않도록
+
+
+def serve(
+    socket_path: str,
+    encode_fn: EncodeFn,
+    max_batch: int = 64,
+    max_wait_ms: float = 5.0,
+    ready: Optional[threading.Event] = None,
+) -> None:
+    """socket_path에서 요청을 받아 encode_fn으로 배치 인코딩 (블로킹)."""
+    path = Path(socket_path)
+    if path.exists():
+        path.unlink()  # 이전 실행이 남긴 소켓 파일
+
+    with _Server(str(path), _Handler) as server:
+        server.batcher = MicroBatcher(  # type: ignore[attr-defined]
+            lambda texts: np.asarray(encode_fn(texts), dtype=np.float32),
+            max_batch=max_batch,
+            max_wait_ms=max_wait_ms,
+            name="embed-sidecar",
+        )
+        os.chmod(path, 0o660)
+        print(f"[INFO] 임베딩 사이드카 대기 중: {path} (max_batch={max_batch}, max_wait_ms={max_wait_ms})")
+        if ready is not None:
+            ready.set()
+        server.serve_forever()
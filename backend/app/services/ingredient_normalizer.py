@@ -0,0 +1,223 @@
+# app/services/ingredient_normalizer.py
+from __future__ import annotations
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+
+# =====================================
+# 0. 동의어 사전 (대표 이름 → 변형/영문 표기)
+#    - 레시피 CSV 색인과 사용자 질의(YOLO 영문 라벨 포함) 양쪽에 같은 규칙을 적용
+#    - 다른 재료의 접두어로 잘못 잡히지 않도록 복합어(고추장, 새우젓, 감자전분, eggplant 등)는 따로 등록
+# =====================================
+
+SYNONYMS: Dict[str, List[str]] = {
+    "파": ["대파", "쪽파", "실파", "움파", "green onion", "scallion", "spring onion", "leek", "leeks"],
+    "양파": ["적양파", "자색양파", "onion", "red onion"],
+    "달걀": ["계란", "유정란", "egg", "eggs"],
+    "달걀노른자": ["계란노른자", "노른자", "egg yolk", "egg yolks"],
+    "달걀흰자": ["계란흰자", "흰자", "egg white", "egg whites"],
+    "마늘": ["통마늘", "간마늘", "garlic"],
+    "마늘종": ["마늘쫑"],
+    "생강": ["ginger"],
+    "돼지고기": ["돈육", "삼겹살", "목살", "앞다리살", "pork", "pork belly"],
+    "소고기": ["쇠고기", "우육", "beef"],
+    "닭고기": ["닭", "닭가슴살", "닭다리", "chicken", "chicken breast"],
+    "육수": ["닭육수", "멸치육수", "chicken stock", "chicken broth", "beef stock", "stock", "broth"],
+    "감자": ["potato", "potatoes"],
+    "감자전분": ["전분", "녹말", "녹말가루", "potato starch", "starch"],
+    "고구마": ["sweet potato"],
+    "당근": ["carrot", "carrots"],
+    "두부": ["tofu"],
+    "김치": ["배추김치", "kimchi"],
+    "밥": ["공기밥", "햇반", "cooked rice"],
+    "쌀": ["백미", "rice"],
+    "쌀국수": ["rice noodles"],
+    "쌀가루": ["rice flour"],
+    "우유": ["milk"],
+    "치즈": ["모짜렐라치즈", "체다치즈", "슬라이스치즈", "cheese"],
+    "버섯": ["mushroom", "mushrooms"],
+    "고추": ["청양고추", "풋고추", "홍고추", "오이고추", "chili", "chili pepper"],
+    "고추냉이": ["와사비", "wasabi"],
+    "고추장": ["gochujang"],
+    "고추기름": ["chili oil"],
+    "고춧가루": ["chili powder"],
+    "파프리카": ["피망", "paprika", "bell pepper"],
+    "애호박": ["zucchini"],
+    "오이": ["cucumber"],
+    "토마토": ["방울토마토", "tomato", "tomatoes", "cherry tomato"],
+    "케첩": ["케찹", "토마토케첩", "토마토케찹", "ketchup", "tomato ketchup"],
+    "가지": ["eggplant", "aubergine"],
+    "배추": ["알배추", "napa cabbage"],
+    "양배추": ["cabbage"],
+    "참치": ["참치캔", "참치통조림", "tuna"],
+    "참치액": [],
+    "햄": ["스팸", "통조림햄", "ham"],
+    "어묵": ["오뎅", "fish cake"],
+    "새우": ["칵테일새우", "shrimp"],
+    "새우젓": [],
+    "연어": ["salmon"],
+    "설탕": ["백설탕", "황설탕", "sugar"],
+    "소금": ["굵은소금", "꽃소금", "salt"],
+    "간장": ["진간장", "국간장", "양조간장", "soy sauce"],
+    "된장": ["doenjang"],
+    "참기름": ["sesame oil"],
+    "식용유": ["포도씨유", "카놀라유", "cooking oil", "vegetable oil"],
+    "식초": ["사과식초", "현미식초", "vinegar", "rice vinegar", "apple cider vinegar"],
+    "후추": ["후춧가루", "black pepper"],
+    "사과": ["apple"],
+    "바나나": ["banana"],
+    "밀가루": ["flour"],
+    "버터": ["butter"],
+    "버터밀크": ["buttermilk"],
+    "떡": ["떡볶이떡", "rice cake"],
+    "라면": ["라면사리", "ramen"],
+    "만두": ["dumpling", "dumplings"],
+    "콩나물": ["bean sprouts"],
+    "시금치": ["spinach"],
+    "부추": ["chives", "garlic chives"],
+    "깻잎": ["perilla leaves"],
+}
+
+# 재료명 앞/사이에 붙는 손질·상태 수식어
+MODIFIERS = [
+    "다진", "채썬", "송송썬", "썬", "깐", "데친", "삶은", "볶은", "말린", "익힌", "남은",
+    "냉동", "냉장", "국산", "수입", "신선한", "손질된", "잘게", "굵게", "큰", "작은",
+    "fresh", "chopped", "minced", "sliced", "diced", "frozen", "large", "medium", "small",
+    "raw", "boiled", "dried", "whole", "organic",
+]
+
+_BRACKETS = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+# 단위 뒤에 글자가 이어지면 단위가 아니라 다음 단어의 첫 글자 ("1 lemon", "2 large eggs")
+_QUANTITY = re.compile(
+    r"\d+(?:[./]\d+)?\s*"
+    r"(?:(?:kg|mg|g|ml|l|개|컵|큰술|작은술|스푼|숟가락|줌|쪽|장|모|봉지|봉|팩|대|알|마리|조각|cm|인분"
+    r"|tbsp|tsp|cups?|pcs|lbs?|oz)(?![a-z가-힣]))?"
+)
+_AMOUNT_WORDS = re.compile(r"약간|적당량|조금|소량|한줌|반개|to taste")
+
+# 접두어 매칭 뒤에 남아도 되는 부위/손질 표현
+#  - 사전에 없는 이름은 "등록된 재료 + 이 목록의 조각들"일 때만 그 재료로 본다
+#    ("대파흰부분" → "파", "돼지고기 앞다리" → "돼지고기")
+#  - 그 외 나머지가 붙으면 다른 재료 ("eggplant", "고추냉이", "감자전분")
+#    → 잘못 묶지 않고 원문 그대로 둔다 (자주 쓰는 복합어는 SYNONYMS 에 등록)
+PART_SUFFIXES = [
+    "흰부분", "초록부분", "푸른부분", "줄기", "밑동", "껍질", "알맹이", "살",
+    "가슴살", "다리살", "안심", "등심", "앞다리", "뒷다리", "국거리", "불고기용", "다짐육",
+    "슬라이스", "채", "것", "캔", "통조림", "반모", "반쪽", "한개", "한모",
+    "breast", "breasts", "thigh", "thighs", "leg", "legs", "wing", "wings",
+    "fillet", "fillets", "clove", "cloves", "slice", "slices", "stalk", "stalks",
+]
+
+
+# =====================================
+# 1. 접두어 트라이
+# =====================================
+
+class _Trie:
+    def __init__(self):
+        self._root: Dict[str, dict] = {}
+
+    def insert(self, key: str, value: str) -> None:
+        node = self._root
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node[""] = value  # 빈 문자열 키에 값 저장 (글자 키와 충돌 없음)
+
+    def exact(self, key: str) -> Optional[str]:
+        node = self._root
+        for ch in key:
+            node = node.get(ch)
+            if node is None:
+                return None
+        return node.get("")
+
+    def longest_prefix(self, text: str) -> Optional[Tuple[int, str]]:
+        """text의 접두어 중 가장 긴 등록 키의 (길이, 값)."""
+        node = self._root
+        best: Optional[Tuple[int, str]] = None
+        for i, ch in enumerate(text):
+            node = node.get(ch)
+            if node is None:
+                break
+            if "" in node:
+                best = (i + 1, node[""])
+        return best
+
+
+def _compact(text: str) -> str:
+    return "".join(text.split())
+
+
+def _build_trie() -> _Trie:
+    trie = _Trie()
+    for canonical, variants in SYNONYMS.items():
+        for name in [canonical, *variants]:
+            trie.insert(_compact(name.lower()), canonical)
+    return trie
+
+
+_TRIE = _build_trie()
+_MODIFIER_SET = {m.lower() for m in MODIFIERS}
+_PREFIX_MODIFIERS = sorted((m for m in _MODIFIER_SET if len(m) >= 2), key=len, reverse=True)
+_SUFFIX_TRIE = _Trie()
+for _piece in [*PART_SUFFIXES, *_MODIFIER_SET]:
+    _SUFFIX_TRIE.insert(_piece.lower(), _piece)
+
+
+# =====================================
+# 2. 정규화
+# =====================================
+
+def _is_suffix(rest: str) -> bool:
+    """rest 가 PART_SUFFIXES/MODIFIERS 조각들로만 이루어져 있는지 (가장 긴 조각부터)."""
+    while rest:
+        hit = _SUFFIX_TRIE.longest_prefix(rest)
+        if hit is None:
+            return False
+        rest = rest[hit[0]:]
+    return True
+
+
+def _lookup(key: str) -> Optional[str]:
+    canonical = _TRIE.exact(key)
+    if canonical is not None:
+        return canonical
+
+    hit = _TRIE.longest_prefix(key)
+    if hit is not None and _is_suffix(key[hit[0]:]):
+        return hit[1]
+    return None
+
+
+@lru_cache(maxsize=65536)
+def normalize_ingredient(name: str) -> str:
+    """
+    재료명을 매칭용 대표 이름으로 변환.
+    예) "대파 1대" → "파", "다진 마늘(약간)" → "마늘", "Eggs" → "달걀", "onion" → "양파"
+    사전에 없는 재료는 수량/수식어/공백만 정리한 문자열을 돌려준다.
+    """
+    text = unicodedata.normalize("NFKC", str(name)).lower()
+    text = _BRACKETS.sub(" ", text)
+    text = _AMOUNT_WORDS.sub(" ", text)
+    text = _QUANTITY.sub(" ", text)
+
+    tokens = [t for t in text.split() if t not in _MODIFIER_SET]
+    key = "".join(tokens)
+    if not key:
+        return ""
+
+    canonical = _lookup(key)
+    if canonical is not None:
+        return canonical
+
+    # 붙어 쓴 수식어 제거 ("다진마늘", "냉동새우"): 남은 부분이 사전에 있을 때만 적용
+    for modifier in _PREFIX_MODIFIERS:
+        if key.startswith(modifier) and len(key) > len(modifier):
+            canonical = _lookup(key[len(modifier):])
+            if canonical is not None:
+                return canonical
+
+    return key
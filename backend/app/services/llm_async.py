@@ -0,0 +1,125 @@
+# app/services/llm_async.py
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, TypeVar
+
+from fastapi import HTTPException, Request, status
+
+T = TypeVar("T")
+
+# =====================================
+# 0. 설정
+# =====================================
+
+# LLM 호출 1건당 최대 대기 시간 (초)
+LLM_TIMEOUT_SEC = float(os.getenv("LLM_TIMEOUT_SEC", "60"))
+
+# 업스트림별 동시 호출 수 제한 (워커 1개 기준)
+UPSTREAM_CONCURRENCY: Dict[str, int] = {
+    "gemini-generate": int(os.getenv("GEMINI_GENERATE_CONCURRENCY", "64")),
+    "gemini-embed": int(os.getenv("GEMINI_EMBED_CONCURRENCY", "128")),
+}
+
+# 클라이언트 연결 끊김 확인 주기 (초)
+DISCONNECT_POLL_SEC = 0.5
+
+_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def _semaphore(upstream: str) -> asyncio.Semaphore:
+    sem = _semaphores.get(upstream)
+    if sem is None:
+        sem = asyncio.Semaphore(UPSTREAM_CONCURRENCY.get(upstream, 32))
+        _semaphores[upstream] = sem
+    return sem
+
+
+# =====================================
+# 1. 업스트림 호출 (동시성 제한 + 타임아웃)
+# =====================================
+
+async def call_upstream(
+    upstream: str,
+    make_call: Callable[[], Awaitable[T]],
+    timeout: float | None = None,
+) -> T:
+    """
+    make_call()이 돌려주는 코루틴을 업스트림별 세마포어 안에서 실행.
+    세마포어 대기 시간까지 포함해 timeout(기본 LLM_TIMEOUT_SEC)을 넘기면 asyncio.TimeoutError.
+    """
+    async def _limited() -> T:
+        async with _semaphore(upstream):
+            return await make_call()
+
+    return await asyncio.wait_for(_limited(), timeout or LLM_TIMEOUT_SEC)
+
+
+async def stream_upstream(
+    upstream: str,
+    make_call: Callable[[], Awaitable[Any]],
+    timeout: float | None = None,
+) -> AsyncIterator[Any]:
+    """
+    스트리밍 응답(generate_content_async(..., stream=True))용 call_upstream.
+    스트림이 끝날 때까지 세마포어를 잡고 있고, 첫 응답과 각 chunk 사이 대기에 timeout을 적용한다.
+    """
+    timeout = timeout or LLM_TIMEOUT_SEC
+
+    async with _semaphore(upstream):
+        response = await asyncio.wait_for(make_call(), timeout)
+        chunks = response.__aiter__()
+        while True:
+            try:
+                chunk = await asyncio.wait_for(chunks.__anext__(), timeout)
+            except StopAsyncIteration:
+                return
+            yield chunk
+
+
+# =====================================
+# 2. 라우터용: 연결 끊김 시 취소 + 에러 변환
+# =====================================
+
+async def run_llm_request(request: Request, coro: Awaitable[T]) -> T:
+    """
+    LLM 작업 코루틴을 실행하면서 클라이언트 연결을 감시한다.
+    - 클라이언트가 끊으면 작업을 취소하고 499
+    - 타임아웃이면 504
+    """
+    task = asyncio.ensure_future(coro)
+
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SEC)
+            if done:
+                break
+            if await request.is_disconnected():
+                task.cancel()
+                raise HTTPException(status_code=499, detail="Client closed request")
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+
+    try:
+        return task.result()
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="AI 응답 시간이 초과되었습니다.",
+        )
+
+
+def response_text(response: Any) -> str:
+    """Gemini 응답 객체에서 텍스트 추출."""
+    try:
+        return response.text
+    except (AttributeError, ValueError):
+        # 파트가 없는 응답/스트림 chunk (종료 표시만 있거나 안전 필터로 막힘)는
+        # .text 가 ValueError → 빈 문자열로 취급하고 스트림은 계속
+        candidates = getattr(response, "candidates", None) or []
+        if not candidates:
+            return ""
+        parts = getattr(candidates[0].content, "parts", None) or []
+        return "".join(getattr(p, "text", "") or "" for p in parts)
@@ -0,0 +1,193 @@
+# app/services/local_cache.py
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+
+# -------------------------------------------------------------------
+# 2단 로컬 캐시
+#  - 앞단: 프로세스 내 LRU (OrderedDict)
+#  - 뒷단: SQLite 파일 (워커/재시작 간 공유, WAL 모드)
+#  - 값은 bytes, 크기 제한 초과 시 오래 안 쓰인 항목부터 삭제
+# -------------------------------------------------------------------
+
+class LocalCache:
+    def __init__(
+        self,
+        path: Path,
+        namespace: str,
+        max_entries: int = 10000,
+        memory_entries: int = 1024,
+        ttl_sec: Optional[float] = None,
+    ):
+        self.path = Path(path)
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.ttl_sec = ttl_sec
+
+        # key -> (value, created_at)
+        self._memory: "OrderedDict[str, tuple[bytes, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_count = 0
+
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+
+    # ---------------------------------------------------------------
+    # SQLite 연결 (첫 사용 시 생성)
+    # ---------------------------------------------------------------
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_cache_accessed ON cache (namespace, accessed_at)"
+            )
+            conn.commit()
+            self._disk_count = conn.execute(
+                "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_sec is not None and now - created_at > self.ttl_sec
+
+    def _remember(self, key: str, value: bytes, created_at: float) -> None:
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    # ---------------------------------------------------------------
+    # 조회/저장
+    # ---------------------------------------------------------------
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._lock:
+            item = self._memory.get(key)
+            if item is not None:
+                if not self._expired(item[1], now):
+                    self._memory.move_to_end(key)
+                    self.hits_memory += 1
+                    return item[0]
+                del self._memory[key]
+
+            try:
+                conn = self._connection()
+                row = conn.execute(
+                    "SELECT value, created_at FROM cache WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                ).fetchone()
+
+                if row is not None and self._expired(row[1], now):
+                    conn.execute(
+                        "DELETE FROM cache WHERE namespace = ? AND key = ?",
+                        (self.namespace, key),
+                    )
+                    conn.commit()
+                    self._disk_count -= 1
+                    row = None
+
+                if row is None:
+                    self.misses += 1
+                    return None
+
+                conn.execute(
+                    "UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                    (now, self.namespace, key),
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"[WARN] 캐시 읽기 실패 ({self.path}): {e}")
+                self.misses += 1
+                return None
+
+            value = bytes(row[0])
+            self._remember(key, value, row[1])
+            self.hits_disk += 1
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            try:
+                conn = self._connection()
+                cur = conn.execute(
+                    "UPDATE cache SET value = ?, created_at = ?, accessed_at = ? "
+                    "WHERE namespace = ? AND key = ?",
+                    (value, now, now, self.namespace, key),
+                )
+                if cur.rowcount == 0:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO cache (namespace, key, value, created_at, accessed_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (self.namespace, key, value, now, now),
+                    )
+                    self._disk_count += 1
+                conn.commit()
+
+                if self._disk_count > self.max_entries:
+                    self._evict(conn)
+            except sqlite3.Error as e:
+                print(f"[WARN] 캐시 쓰기 실패 ({self.path}): {e}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """max_entries의 90%까지 오래 안 쓰인 항목부터 삭제 (매번 지우지 않도록 여유를 둠)."""
+        keep = int(self.max_entries * 0.9)
+        conn.execute(
+            """
+            DELETE FROM cache WHERE namespace = ? AND key IN (
+                SELECT key FROM cache WHERE namespace = ?
+                ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.namespace, self.namespace, keep),
+        )
+        conn.commit()
+        self._disk_count = conn.execute(
+            "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            try:
+                conn = self._connection()
+                conn.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+                conn.commit()
+                self._disk_count = 0
+            except sqlite3.Error as e:
+                print(f"[WARN] 캐시 비우기 실패 ({self.path}): {e}")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits_memory": self.hits_memory,
+            "hits_disk": self.hits_disk,
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+            "disk_entries": self._disk_count,
+        }
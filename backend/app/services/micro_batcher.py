@@ -0,0 +1,117 @@
+# app/services/micro_batcher.py
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# -------------------------------------------------------------------
+# 마이크로 배처
+#  - 여러 스레드/요청에서 들어온 작은 인코딩 요청을 max_wait_ms 동안 모아
+#    max_batch 개까지 한 번의 batch_fn 호출로 처리하고, 각자의 Future에 결과를 나눠 준다
+#  - batch_fn(items) 은 items와 같은 길이의 시퀀스(list / np.ndarray)를 돌려줘야 한다
+#  - 작업 스레드는 첫 submit 때 시작 (import만으로 스레드를 만들지 않음, fork 안전)
+#  - async 코드에서는 asyncio.wrap_future(batcher.submit(...)) 로 기다리면 된다
+# -------------------------------------------------------------------
+
+BatchFn = Callable[[List[Any]], Sequence[Any]]
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        batch_fn: BatchFn,
+        max_batch: int = 32,
+        max_wait_ms: float = 5.0,
+        name: str = "micro-batcher",
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+
+        self._queue: "queue.Queue[Tuple[List[Any], Future]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    # ---------------------------------------------------------------
+    # 공개 API
+    # ---------------------------------------------------------------
+    def submit(self, items: List[Any]) -> Future:
+        """items 결과(같은 길이의 시퀀스)를 돌려줄 Future."""
+        fut: Future = Future()
+        if not items:
+            fut.set_result([])
+            return fut
+        self._ensure_started()
+        self._queue.put((list(items), fut))
+        return fut
+
+    def run(self, items: List[Any], timeout: Optional[float] = None) -> Sequence[Any]:
+        """동기 호출용: submit 후 결과를 기다린다."""
+        return self.submit(items).result(timeout)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch": (self.items / self.batches) if self.batches else 0.0,
+        }
+
+    # ---------------------------------------------------------------
+    # 작업 스레드
+    # ---------------------------------------------------------------
+    def _collect(self) -> List[Tuple[List[Any], Future]]:
+        batch = [self._queue.get()]
+        size = len(batch[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            # 취소된 요청(타임아웃 등)은 인코딩하지 않는다
+            batch = [(items, fut) for items, fut in batch if fut.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            flat = [x for items, _ in batch for x in items]
+            try:
+                results = self.batch_fn(flat)
+                if len(results) != len(flat):
+                    raise RuntimeError(f"{self.name}: 결과 개수 불일치 ({len(results)} != {len(flat)})")
+            except Exception as e:
+                for _, fut in batch:
+                    fut.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.items += len(flat)
+
+            offset = 0
+            for items, fut in batch:
+                fut.set_result(results[offset:offset + len(items)])
+                offset += len(items)
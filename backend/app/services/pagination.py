@@ -0,0 +1,89 @@
+# app/services/pagination.py
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import String, cast, literal, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+# -------------------------------------------------------------------
+# 키셋(커서) 페이지네이션: (시각, id) 내림차순
+#  - OFFSET 없이 "마지막으로 본 (시각, id) 보다 작은 것"만 조회
+#    → (user_id, 시각, id) 인덱스 범위 스캔, 몇 번째 페이지든 요청 비용이 일정
+#  - 같은 시각이 여러 개여도 id로 순서가 고정되어 페이지 사이 중복/누락 없음
+#  - 커서: {"t": 저장된 시각 문자열, "id": 마지막 id} 를 base64url 로 감싼 불투명 문자열
+#    SQLite는 시각을 문자열로 저장하고 비교하는데, 서버 기본값(CURRENT_TIMESTAMP)은
+#    마이크로초가 없고 바인딩 값은 있어서 datetime 으로 되돌리면 비교가 어긋난다
+#    → DB에 저장된 문자열을 그대로 커서에 담아 같은 형식으로 비교
+#  - 시각 컬럼은 서버 기본값으로 항상 채워진다고 가정 (NULL 행은 첫 페이지 이후 제외됨)
+# -------------------------------------------------------------------
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(ts: str, row_id: int) -> str:
+    raw = json.dumps({"t": ts, "id": row_id}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return str(data["t"]), int(data["id"])
+    except (ValueError, TypeError, KeyError, UnicodeError):
+        raise HTTPException(status_code=400, detail="잘못된 cursor 입니다.")
+
+
+def _ts_value(dialect_name: str, ts: str, ts_col) -> Any:
+    if dialect_name == "sqlite":
+        return literal(ts, String)  # 저장된 문자열 그대로 비교
+    return cast(literal(ts, String), ts_col.type)
+
+
+def keyset_select(
+    stmt: Select,
+    ts_col,
+    id_col,
+    limit: int,
+    cursor: Optional[str],
+    dialect_name: str,
+) -> Select:
+    """한 페이지 조회문: 커서 조건 + (시각, id) 내림차순 + limit+1 (다음 페이지 존재 여부 판단용)."""
+    if cursor:
+        ts, last_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(ts_col, id_col) < tuple_(_ts_value(dialect_name, ts, ts_col), last_id))
+
+    return (
+        stmt.add_columns(cast(ts_col, String).label("cursor_ts"))
+        .order_by(ts_col.desc(), id_col.desc())
+        .limit(limit + 1)
+    )
+
+
+async def keyset_page(
+    db: AsyncSession,
+    stmt: Select,
+    ts_col,
+    id_col,
+    limit: int,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    stmt(단일 엔티티 select + 사용자 조건)를 (ts_col, id_col) 내림차순으로 한 페이지 조회.
+    반환: (행 목록, 다음 페이지 커서 또는 None)
+    """
+    dialect_name = db.get_bind().dialect.name
+    rows = (await db.execute(keyset_select(stmt, ts_col, id_col, limit, cursor, dialect_name))).all()
+
+    items = [row[0] for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last_item, last_ts = rows[limit - 1]
+        next_cursor = encode_cursor(last_ts, last_item.id)
+    return items, next_cursor
@@ -1,15 +1,19 @@
 # app/services/recipe_ai_service.py
 from __future__ import annotations
 
-from typing import List
+from datetime import date
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from pathlib import Path
+import asyncio
 import os
 import json
 
-import pandas as pd
 import google.generativeai as genai
 
 from app.schemas import RecipeSuggestion
+from app.services.recipe_corpus import RecipeCorpus
+from app.services.recipe_retrieval import search_recipes
+from app.services.llm_async import call_upstream, response_text, stream_upstream
 
 
 # =====================================
@@ -32,64 +36,45 @@ GEMINI_MODEL_NAME = "gemini-2.5-flash"
 # =====================================
 
 DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "korean_recipes1.csv"
+SNAPSHOT_PATH = Path(__file__).resolve().parent.parent / "data" / "cache" / "korean_recipes1.snapshot.pkl"
 
-if not DATA_PATH.exists():
-    raise FileNotFoundError(f"RAG용 CSV 파일을 찾을 수 없습니다: {DATA_PATH}")
-
-
-def _load_csv(path: Path) -> pd.DataFrame:
-    for enc in ("cp949", "utf-8"):
-        try:
-            return pd.read_csv(path, encoding=enc)
-        except UnicodeDecodeError:
-            continue
-    return pd.read_csv(path)
-
-
-_df = _load_csv(DATA_PATH)
-
-_df["ingredients_list"] = (
-    _df["ingredients"]
-    .fillna("")
-    .apply(lambda s: [x.strip() for x in str(s).split(",") if x.strip()])
-)
+# 첫 사용 시 로딩 (import 시점에는 CSV/pandas를 건드리지 않음)
+# 재료 색인은 색인/질의 모두 normalize_ingredient 적용 ("대파"↔"파", "계란"↔"달걀", "onion"↔"양파")
+_corpus = RecipeCorpus(DATA_PATH, SNAPSHOT_PATH)
 
 
 # =====================================
 # 2. RAG 후보 추출 로직
 # =====================================
 
-def _score_row(user_ings: List[str], row_ings: List[str]) -> int:
-    u = set(i.strip().lower() for i in user_ings)
-    r = set(i.strip().lower() for i in row_ings)
-    return len(u & r)
-
+def _retrieve_candidates(
+    ingredients: List[str],
+    top_k: int = 5,
+    expiries: Optional[Dict[str, Optional[date]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    재료 겹침(IDF + 유통기한 임박 보너스) / BM25 / dense 검색을 RRF로 결합해 top_k 추출.
+    expiries: 재료명 → 냉장고의 예상 유통기한 (없으면 IDF만 사용)
+    """
+    state = _corpus.get()
+    records = state.records
 
-def _retrieve_candidates(ingredients: List[str], top_k: int = 5) -> pd.DataFrame:
     if not ingredients:
-        return _df.head(top_k).copy()
-
-    scores = _df["ingredients_list"].apply(
-        lambda row_ings: _score_row(ingredients, row_ings)
-    )
-    df_with_score = _df.copy()
-    df_with_score["score"] = scores
+        return [dict(rec) for rec in records[:top_k]]
 
-    candidates = (
-        df_with_score[df_with_score["score"] > 0]
-        .sort_values("score", ascending=False)
-        .head(top_k)
-    )
+    hits = search_recipes(state, ingredients, top_k=top_k, expiries=expiries)
 
-    if candidates.empty:
-        candidates = df_with_score.sort_values("score", ascending=False).head(top_k)
+    if not hits:
+        # 겹치는 재료가 하나도 없으면 앞쪽 레시피를 score 0으로
+        return [dict(rec, score=0.0) for rec in records[:top_k]]
 
-    return candidates
+    # 선택된 top_k 행만 복사해서 score를 붙인다
+    return [dict(records[row], score=score) for row, score in hits]
 
 
-def _build_context_text(candidates: pd.DataFrame) -> str:
+def _build_context_text(candidates: List[Dict[str, Any]]) -> str:
     lines = []
-    for _, row in candidates.iterrows():
+    for row in candidates:
         name = row.get("recipe_name", "")
         ings = row.get("ingredients", "")
         steps = row.get("steps", "")
@@ -106,36 +91,29 @@ def _build_context_text(candidates: pd.DataFrame) -> str:
 #    (API 키 없어도 서버는 죽지 않음)
 # =====================================
 
-def suggest_recipes_from_ingredients(
-    ingredients: List[str],
-    num_suggestions: int = 3,
-) -> List[RecipeSuggestion]:
+def _unavailable_suggestions(ingredients: List[str]) -> List[RecipeSuggestion]:
+    return [
+        RecipeSuggestion(
+            title="레시피 기능 사용 불가",
+            ingredients=ingredients,
+            instructions="Gemini API Key가 설정되지 않아 레시피 추천 기능을 사용할 수 없습니다.",
+            source_url=None,
+            image_url=None,
+            calories=0.0,
+            source_type="unavailable",
+        )
+    ]
 
-    # -----------------------------
-    # API 키 없으면 fallback 반환
-    # -----------------------------
-    if not GEMINI_API_KEY:
-        return [
-            RecipeSuggestion(
-                title="레시피 기능 사용 불가",
-                ingredients=ingredients,
-                instructions="Gemini API Key가 설정되지 않아 레시피 추천 기능을 사용할 수 없습니다.",
-                source_url=None,
-                image_url=None,
-                calories=0.0,
-            )
-        ]
 
-    # -----------------------------
-    # 정상 로직 (RAG → Gemini)
-    # -----------------------------
-    candidates = _retrieve_candidates(ingredients, top_k=5)
+# 프롬프트/파싱 규칙을 바꾸면 올린다 → 이전 추천 캐시가 자동으로 무효화됨
+PROMPT_VERSION = "1"
+
+
+def _build_prompt(ingredients: List[str], candidates: List[Dict[str, Any]]) -> str:
     context_text = _build_context_text(candidates)
     ingredients_str = ", ".join(ingredients) if ingredients else "(재료 없음)"
 
-    model = genai.GenerativeModel(GEMINI_MODEL_NAME)
-
-    prompt = f"""
+    return f"""
 당신은 요리 레시피를 추천하는 AI 셰프입니다.
 
 [사용자 식재료]
@@ -152,21 +130,19 @@ def suggest_recipes_from_ingredients(
 JSON 배열만 출력해 주세요.
 """.strip()
 
-    response = model.generate_content(prompt)
-
-    # Gemini 응답 텍스트 추출
-    try:
-        text = response.text
-    except AttributeError:
-        text = response.candidates[0].content.parts[0].text
 
+def _parse_suggestions(
+    text: str,
+    candidates: List[Dict[str, Any]],
+    num_suggestions: int,
+) -> List[RecipeSuggestion]:
     # JSON 형태로 파싱
     try:
         data = json.loads(text)
     except json.JSONDecodeError:
         # Gemini 실패 시 fallback
         fallback: List[RecipeSuggestion] = []
-        for _, row in candidates.head(num_suggestions).iterrows():
+        for row in candidates[:num_suggestions]:
             fallback.append(
                 RecipeSuggestion(
                     title=row.get("recipe_name", "레시피"),
@@ -175,6 +151,7 @@ JSON 배열만 출력해 주세요.
                     source_url=None,
                     image_url=None,
                     calories=0.0,
+                    source_type="csv",
                 )
             )
         return fallback
@@ -196,6 +173,93 @@ JSON 배열만 출력해 주세요.
     return suggestions
 
 
+def suggest_recipes_from_ingredients(
+    ingredients: List[str],
+    num_suggestions: int = 3,
+    expiries: Optional[Dict[str, Optional[date]]] = None,
+) -> List[RecipeSuggestion]:
+
+    # -----------------------------
+    # API 키 없으면 fallback 반환
+    # -----------------------------
+    if not GEMINI_API_KEY:
+        return _unavailable_suggestions(ingredients)
+
+    # -----------------------------
+    # 정상 로직 (RAG → Gemini)
+    # -----------------------------
+    candidates = _retrieve_candidates(ingredients, top_k=5, expiries=expiries)
+    prompt = _build_prompt(ingredients, candidates)
+
+    model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+    response = model.generate_content(prompt)
+
+    # Gemini 응답 텍스트 추출
+    text = response_text(response)
+
+    return _parse_suggestions(text, candidates, num_suggestions)
+
+
+async def suggest_recipes_from_ingredients_async(
+    ingredients: List[str],
+    num_suggestions: int = 3,
+    expiries: Optional[Dict[str, Optional[date]]] = None,
+) -> List[RecipeSuggestion]:
+    """
+    suggest_recipes_from_ingredients의 async 버전.
+    Gemini 호출 동안 이벤트 루프/스레드풀을 막지 않는다.
+    """
+    if not GEMINI_API_KEY:
+        return _unavailable_suggestions(ingredients)
+
+    # 검색(첫 코퍼스 로딩, dense 인코딩 포함)은 스레드에서 실행
+    candidates = await asyncio.to_thread(_retrieve_candidates, ingredients, 5, expiries)
+    prompt = _build_prompt(ingredients, candidates)
+
+    model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+    response = await call_upstream(
+        "gemini-generate",
+        lambda: model.generate_content_async(prompt),
+    )
+
+    return _parse_suggestions(response_text(response), candidates, num_suggestions)
+
+
+async def stream_recipe_suggestions(
+    ingredients: List[str],
+    num_suggestions: int = 3,
+    expiries: Optional[Dict[str, Optional[date]]] = None,
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    스트리밍 버전.
+    ("candidates", {...}) → ("delta", {...}) * N → ("suggestions", List[RecipeSuggestion])
+    마지막 suggestions는 파싱된 결과이며, DB 저장은 라우터에서 처리한다.
+    """
+    if not GEMINI_API_KEY:
+        yield "candidates", {"recipes": []}
+        yield "suggestions", _unavailable_suggestions(ingredients)
+        return
+
+    candidates = await asyncio.to_thread(_retrieve_candidates, ingredients, 5, expiries)
+    yield "candidates", {"recipes": [str(row.get("recipe_name", "")) for row in candidates]}
+
+    prompt = _build_prompt(ingredients, candidates)
+    model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+
+    parts: List[str] = []
+    async for chunk in stream_upstream(
+        "gemini-generate",
+        lambda: model.generate_content_async(prompt, stream=True),
+    ):
+        text = response_text(chunk)
+        if not text:
+            continue
+        parts.append(text)
+        yield "delta", {"text": text}
+
+    yield "suggestions", _parse_suggestions("".join(parts), candidates, num_suggestions)
+
+
 # =====================================
 # RAG 초기화 (필요 없음, 빈 함수로 유지)
 # =====================================
@@ -0,0 +1,103 @@
+# app/services/recipe_bm25.py
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+# =====================================
+# 레시피 이름/조리 단계 BM25 색인
+#  - 토큰: 단어(한글/영문/숫자) + 한글 단어의 글자 bigram
+#    (형태소 분석기 없이도 "볶음밥" ↔ "볶아" 같은 부분 일치를 어느 정도 잡기 위함)
+#  - 문서별 BM25 가중치를 구축 시 CSR 행렬로 미리 계산
+#    → 질의는 희소 행렬 × 벡터 한 번
+# =====================================
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_WORD = re.compile(r"[0-9a-z가-힣]+")
+_HANGUL = re.compile(r"^[가-힣]+$")
+
+
+def tokenize(text: str) -> List[str]:
+    text = unicodedata.normalize("NFKC", str(text)).lower()
+    tokens: List[str] = []
+    for word in _WORD.findall(text):
+        tokens.append(word)
+        if len(word) > 2 and _HANGUL.match(word):
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class BM25Index:
+    def __init__(self, docs: Iterable[str], k1: float = BM25_K1, b: float = BM25_B):
+        vocab: Dict[str, int] = {}
+        indptr: List[int] = [0]
+        indices: List[int] = []
+        tfs: List[float] = []
+        lengths: List[int] = []
+
+        for doc in docs:
+            tokens = tokenize(doc)
+            lengths.append(len(tokens))
+            counts: Dict[int, int] = {}
+            for tok in tokens:
+                col = vocab.setdefault(tok, len(vocab))
+                counts[col] = counts.get(col, 0) + 1
+            for col in sorted(counts):
+                indices.append(col)
+                tfs.append(counts[col])
+            indptr.append(len(indices))
+
+        self.vocab = vocab
+        self.size = len(lengths)
+
+        indptr_arr = np.asarray(indptr, dtype=np.int64)
+        indices_arr = np.asarray(indices, dtype=np.int32)
+        tf = np.asarray(tfs, dtype=np.float32)
+
+        # idf = log(1 + (N - df + 0.5) / (df + 0.5))  (항상 0 이상)
+        df = np.bincount(indices_arr, minlength=len(vocab)).astype(np.float32)
+        idf = np.log1p((self.size - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+        dl = np.asarray(lengths, dtype=np.float32)
+        avgdl = float(dl.mean()) if self.size and dl.mean() > 0 else 1.0
+        row_of_entry = np.repeat(np.arange(self.size), np.diff(indptr_arr))
+        norm = k1 * (1.0 - b + b * dl[row_of_entry] / avgdl) if self.size else np.zeros(0, np.float32)
+        weights = idf[indices_arr] * tf * (k1 + 1.0) / (tf + norm)
+
+        self._matrix = sparse.csr_matrix(
+            (weights.astype(np.float32), indices_arr, indptr_arr),
+            shape=(self.size, len(vocab)),
+        )
+
+    def __len__(self) -> int:
+        return self.size
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[int, float]]:
+        """BM25 점수 큰 순으로 (행 번호, score). 점수 0인 행 제외, 동점이면 행 번호 순."""
+        if top_k <= 0 or self.size == 0:
+            return []
+
+        cols = {self.vocab[t] for t in tokenize(query) if t in self.vocab}
+        if not cols:
+            return []
+
+        q = np.zeros(len(self.vocab), dtype=np.float32)
+        q[list(cols)] = 1.0
+
+        scores = self._matrix @ q
+        matched = np.flatnonzero(scores > 0)
+        if matched.size > top_k:
+            part = np.argpartition(-scores[matched], top_k - 1)[:top_k]
+            kth = scores[matched[part]].min()
+            matched = matched[scores[matched] >= kth]
+
+        order = np.lexsort((matched, -scores[matched]))[:top_k]
+        rows = matched[order]
+        return [(int(r), float(scores[r])) for r in rows]
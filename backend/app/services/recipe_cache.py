@@ -0,0 +1,84 @@
+# app/services/recipe_cache.py
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from app.services.ingredient_normalizer import normalize_ingredient
+from app.services.local_cache import LocalCache
+from app.services.recipe_ai_service import PROMPT_VERSION
+
+# -------------------------------------------------------------------
+# 레시피 추천 결과 캐시
+#  - 키: 프롬프트 버전 + 정규화/정렬된 재료 집합 (순서/표기 무관: "계란, 밥" == "밥, 달걀")
+#  - 값: 이미 저장된 models.Recipe id 리스트 → 캐시 hit 시 새 행을 만들지 않고 기존 행 반환
+#  - LocalCache (프로세스 LRU + SQLite), TTL 지나면 다시 Gemini 호출
+#  - Gemini가 만든 결과(source_type="ai")만 저장 (라우터에서 판단)
+#  - 유통기한 임박 재료(urgent)는 검색 순위를 바꾸므로 키에 포함
+#    → 임박 재료 조합이 같은 사용자끼리는 결과를 공유, 다른 사용자에게 섞이지 않음
+#  - 정규화 후 남는 재료 이름이 없으면 키를 만들지 않음 (서로 다른 입력이 한 키로 모이지 않게)
+# -------------------------------------------------------------------
+
+_DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+RECIPE_CACHE_PATH = Path(
+    os.getenv("RECIPE_CACHE_PATH", str(_DATA_DIR / "cache" / "recipe_suggestions.sqlite3"))
+)
+RECIPE_CACHE_TTL_SEC = float(os.getenv("RECIPE_CACHE_TTL_SEC", str(6 * 3600)))
+RECIPE_CACHE_MAX_ENTRIES = 5000
+RECIPE_CACHE_MEMORY_ENTRIES = 512
+
+_CACHE = LocalCache(
+    RECIPE_CACHE_PATH,
+    namespace="recipe-suggestions",
+    max_entries=RECIPE_CACHE_MAX_ENTRIES,
+    memory_entries=RECIPE_CACHE_MEMORY_ENTRIES,
+    ttl_sec=RECIPE_CACHE_TTL_SEC,
+)
+
+
+def _normalized(names: Sequence[str]) -> List[str]:
+    return sorted({normalize_ingredient(n) for n in names} - {""})
+
+
+def cache_key(ingredients: List[str], urgent: Sequence[str] = ()) -> Optional[str]:
+    names = _normalized(ingredients)
+    if not names:
+        return None
+    key = f"v{PROMPT_VERSION}|" + "|".join(names)
+    urgent_names = _normalized(urgent)
+    if urgent_names:
+        key += "#urgent|" + "|".join(urgent_names)
+    return key
+
+
+def get_recipe_ids(ingredients: List[str], urgent: Sequence[str] = ()) -> Optional[List[int]]:
+    key = cache_key(ingredients, urgent)
+    if key is None:
+        return None
+    raw = _CACHE.get(key)
+    if raw is None:
+        return None
+    try:
+        return [int(i) for i in json.loads(raw)]
+    except (ValueError, TypeError):
+        return None
+
+
+def put_recipe_ids(ingredients: List[str], recipe_ids: List[int], urgent: Sequence[str] = ()) -> None:
+    key = cache_key(ingredients, urgent)
+    if key is not None and recipe_ids:
+        _CACHE.set(key, json.dumps(recipe_ids).encode("utf-8"))
+
+
+def invalidate(ingredients: List[str], urgent: Sequence[str] = ()) -> None:
+    """캐시가 가리키는 레시피 행이 사라졌을 때: 빈 값으로 덮어써 다음 요청이 새로 생성하게 한다."""
+    key = cache_key(ingredients, urgent)
+    if key is not None:
+        _CACHE.set(key, b"[]")
+
+
+def get_stats() -> Dict[str, int]:
+    return _CACHE.stats()
@@ -0,0 +1,224 @@
+# app/services/recipe_corpus.py
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from app.services.ingredient_normalizer import normalize_ingredient
+from app.services.recipe_bm25 import BM25Index
+from app.services.recipe_index import IngredientIndex
+
+
+# -------------------------------------------------------------------
+# 레시피 CSV 코퍼스 (지연 로딩 + 스냅샷 캐시 + 핫 리로드)
+#  - import 시에는 아무것도 읽지 않음 → 워커 기동 시간이 CSV 크기와 무관
+#  - 첫 사용 시 로딩: 스냅샷(pickle)이 CSV와 같으면 스냅샷, 아니면 CSV 파싱 후 스냅샷 저장
+#  - 스냅샷 키: CSV mtime + 크기 (다르면 sha256까지 비교 → touch만 된 경우 재파싱 안 함)
+#  - CSV가 바뀌면 다음 사용 시 다시 로딩 (확인 주기 RELOAD_CHECK_SEC)
+#  - 재료/BM25 색인은 정규화 규칙이 바뀔 수 있으므로 스냅샷에 넣지 않고 로딩 때 구축
+# -------------------------------------------------------------------
+
+SNAPSHOT_VERSION = 1
+
+# CSV 변경 여부 확인 주기 (초). 0이면 매 호출마다 stat
+RELOAD_CHECK_SEC = float(os.getenv("RECIPE_CORPUS_RELOAD_SEC", "2"))
+
+Record = Dict[str, Any]
+
+
+class CorpusState(NamedTuple):
+    records: List[Record]
+    index: IngredientIndex  # 재료 겹침 (IDF/유통기한 가중)
+    text_index: BM25Index   # 레시피 이름 + 조리 단계
+    row_of_id: Dict[Any, int]  # recipe_id → 행 번호 (dense 검색 결과 매핑용)
+
+
+def _file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def recipe_text(rec: Record) -> str:
+    """BM25/dense 색인에 쓰는 레시피 본문."""
+    return f"{rec.get('recipe_name', '')} {rec.get('steps', '')}"
+
+
+def build_state(records: List[Record]) -> CorpusState:
+    index = IngredientIndex(
+        (rec["ingredients_list"] for rec in records),
+        normalize=normalize_ingredient,
+    )
+    text_index = BM25Index(recipe_text(rec) for rec in records)
+    row_of_id = {rec["recipe_id"]: row for row, rec in enumerate(records) if "recipe_id" in rec}
+    return CorpusState(records, index, text_index, row_of_id)
+
+
+def _split_ingredients(s: Any) -> List[str]:
+    return [x.strip() for x in str(s).split(",") if x.strip()]
+
+
+def parse_recipe_csv(path: Path) -> List[Record]:
+    """CSV → 레시피 dict 리스트. pandas는 이 함수가 처음 불릴 때만 import."""
+    import pandas as pd
+
+    df = None
+    for enc in ("cp949", "utf-8"):
+        try:
+            df = pd.read_csv(path, encoding=enc)
+            break
+        except UnicodeDecodeError:
+            continue
+    if df is None:
+        df = pd.read_csv(path)
+
+    for col in ("recipe_name", "ingredients", "steps"):
+        if col not in df.columns:
+            df[col] = ""
+    df[["recipe_name", "ingredients", "steps"]] = df[["recipe_name", "ingredients", "steps"]].fillna("")
+
+    records: List[Record] = df.to_dict(orient="records")
+    for rec in records:
+        rec["ingredients_list"] = _split_ingredients(rec["ingredients"])
+    return records
+
+
+class RecipeCorpus:
+    def __init__(self, csv_path: Path, snapshot_path: Path):
+        self.csv_path = Path(csv_path)
+        self.snapshot_path = Path(snapshot_path)
+
+        self._lock = threading.Lock()
+        # 상태 전체를 한 번에 교체 → 리로드 중에도 읽는 쪽은 일관된 상태를 본다
+        self._state: Optional[CorpusState] = None
+        self._stamp: Optional[Tuple[int, int]] = None  # (mtime_ns, size)
+        self._checked_at = 0.0
+
+    # ---------------------------------------------------------------
+    # 공개 API
+    # ---------------------------------------------------------------
+    def get(self) -> CorpusState:
+        """레시피 리스트 + 색인들. 첫 호출 또는 CSV 변경 시 (재)로딩."""
+        state = self._state
+        now = time.monotonic()
+        if state is not None and now - self._checked_at < RELOAD_CHECK_SEC:
+            return state
+
+        with self._lock:
+            self._checked_at = now
+            stamp = self._csv_stamp()
+            if self._state is None or stamp != self._stamp:
+                self._load(stamp)
+            return self._state
+
+    @property
+    def records(self) -> List[Record]:
+        return self.get().records
+
+    @property
+    def index(self) -> IngredientIndex:
+        return self.get().index
+
+    # ---------------------------------------------------------------
+    # 로딩
+    # ---------------------------------------------------------------
+    def _csv_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = self.csv_path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _load(self, stamp: Optional[Tuple[int, int]]) -> None:
+        if stamp is None:
+            if self._state is None:
+                print(f"[WARN] 레시피 CSV 파일을 찾을 수 없습니다: {self.csv_path} → 빈 코퍼스로 동작")
+                self._state = build_state([])
+            else:
+                print(f"[WARN] 레시피 CSV 파일이 사라졌습니다: {self.csv_path} → 기존 데이터 유지")
+            self._stamp = None
+            return
+
+        try:
+            records = self._load_records(stamp)
+        except Exception as e:
+            if self._state is None:
+                print(f"[WARN] 레시피 CSV 로딩 실패 ({self.csv_path}): {e} → 빈 코퍼스로 동작")
+                self._state = build_state([])
+            else:
+                print(f"[WARN] 레시피 CSV 리로드 실패 ({self.csv_path}): {e} → 기존 데이터 유지")
+            self._stamp = stamp
+            return
+
+        state = build_state(records)
+        if self._state is not None:
+            print(f"[INFO] 레시피 CSV 변경 감지 → 리로드 ({len(records)}개)")
+        self._state = state
+        self._stamp = stamp
+
+    def _load_records(self, stamp: Tuple[int, int]) -> List[Record]:
+        snap = self._read_snapshot()
+        if snap is not None:
+            if (snap["mtime_ns"], snap["size"]) == stamp:
+                return snap["records"]
+
+            # mtime만 바뀐 경우(복사/touch): 내용 해시가 같으면 스냅샷 재사용
+            if snap["size"] == stamp[1]:
+                sha = _file_sha256(self.csv_path)
+                if sha == snap["sha256"]:
+                    self._write_snapshot(snap["records"], stamp, sha)
+                    return snap["records"]
+
+        records = parse_recipe_csv(self.csv_path)
+        self._write_snapshot(records, stamp, _file_sha256(self.csv_path))
+        return records
+
+    def _read_snapshot(self) -> Optional[Dict[str, Any]]:
+        if not self.snapshot_path.exists():
+            return None
+        try:
+            with self.snapshot_path.open("rb") as f:
+                snap = pickle.load(f)
+        except Exception as e:
+            print(f"[WARN] 레시피 스냅샷 읽기 실패 ({self.snapshot_path}): {e}")
+            return None
+        if not isinstance(snap, dict) or snap.get("version") != SNAPSHOT_VERSION:
+            return None
+        return snap
+
+    def _write_snapshot(self, records: List[Record], stamp: Tuple[int, int], sha256: str) -> None:
+        snap = {
+            "version": SNAPSHOT_VERSION,
+            "mtime_ns": stamp[0],
+            "size": stamp[1],
+            "sha256": sha256,
+            "records": records,
+        }
+        # 여러 워커가 동시에 다시 만들 수 있으므로 임시 파일 이름은 프로세스마다 다르게
+        tmp: Optional[str] = None
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=self.snapshot_path.parent,
+                prefix=self.snapshot_path.name + ".",
+                suffix=".tmp",
+                delete=False,
+            ) as f:
+                tmp = f.name
+                pickle.dump(snap, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.snapshot_path)
+        except OSError as e:
+            print(f"[WARN] 레시피 스냅샷 저장 실패 ({self.snapshot_path}): {e}")
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
@@ -0,0 +1,145 @@
+# app/services/recipe_index.py
+from __future__ import annotations
+
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+# =====================================
+# 레시피 × 재료 희소 행렬 (CSR)
+#  - 로딩 시 한 번만 구축, 열 방향(CSC) 사본 = 재료별 포스팅 리스트
+#  - 질의 재료의 열(포스팅)만 읽어서 가중치를 누적 → 비용이 전체 nnz가 아니라
+#    질의 재료가 들어간 레시피 수에 비례
+#  - 가중치: IDF (소금처럼 흔한 재료는 낮게) × 유통기한 임박 보너스
+# =====================================
+
+# 유통기한이 이 일수 이내로 남은 재료부터 보너스를 준다 (0일 이하 = 최대 보너스)
+URGENCY_WINDOW_DAYS = 7
+# 최대 보너스: 가중치에 (1 + URGENCY_WEIGHT)배
+URGENCY_WEIGHT = 1.0
+
+
+def _default_normalize(name: str) -> str:
+    return name.strip().lower()
+
+
+def urgency_bonus(expiry: Optional[date], today: Optional[date] = None) -> float:
+    """유통기한까지 남은 일수가 적을수록 0 → URGENCY_WEIGHT 로 선형 증가."""
+    if expiry is None:
+        return 0.0
+    days_left = (expiry - (today or date.today())).days
+    if days_left >= URGENCY_WINDOW_DAYS:
+        return 0.0
+    return URGENCY_WEIGHT * (1.0 - max(days_left, 0) / URGENCY_WINDOW_DAYS)
+
+
+class IngredientIndex:
+    def __init__(
+        self,
+        ingredient_lists: Iterable[Sequence[str]],
+        normalize: Callable[[str], str] = _default_normalize,
+    ):
+        self.normalize = normalize
+
+        vocab: Dict[str, int] = {}
+        indptr: List[int] = [0]
+        indices: List[int] = []
+        for ings in ingredient_lists:
+            cols = {vocab.setdefault(term, len(vocab)) for term in map(normalize, ings) if term}
+            indices.extend(sorted(cols))
+            indptr.append(len(indices))
+
+        self.vocab = vocab
+        self.size = len(indptr) - 1
+
+        self._matrix = sparse.csr_matrix(
+            (
+                np.ones(len(indices), dtype=np.float32),
+                np.asarray(indices, dtype=np.int32),
+                np.asarray(indptr, dtype=np.int64),
+            ),
+            shape=(self.size, len(vocab)),
+        )
+
+        # smoothed IDF: log((N + 1) / (df + 1)) + 1  → 모든 레시피에 있는 재료도 0보다 큼
+        df = np.bincount(self._matrix.indices, minlength=len(vocab)).astype(np.float32)
+        self.idf = np.log((self.size + 1) / (df + 1)).astype(np.float32) + 1.0
+
+        # 열 c 의 행 번호들 = indices[indptr[c]:indptr[c + 1]] (행 번호 오름차순)
+        self._postings = self._matrix.tocsc()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _query_vector(
+        self,
+        ingredients: Iterable[str],
+        expiries: Optional[Dict[str, Optional[date]]],
+        today: Optional[date],
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """질의 재료의 (열 번호들, 가중치들). 사전에 있는 재료가 없으면 None."""
+        # 같은 재료가 여러 이름으로 들어오면 가장 임박한 유통기한 기준
+        bonus: Dict[int, float] = {}
+        expiry_of = {self.normalize(k): v for k, v in (expiries or {}).items()}
+        for name in ingredients:
+            term = self.normalize(name)
+            col = self.vocab.get(term)
+            if col is None:
+                continue
+            b = urgency_bonus(expiry_of.get(term), today)
+            bonus[col] = max(bonus.get(col, 0.0), b)
+
+        if not bonus:
+            return None
+
+        cols = np.fromiter(bonus.keys(), dtype=np.int64, count=len(bonus))
+        weights = self.idf[cols] * (1.0 + np.fromiter(bonus.values(), dtype=np.float32, count=len(bonus)))
+        return cols, weights
+
+    def _accumulate(self, cols: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """질의 열들의 포스팅만 모아 행별 가중치 합. (행 번호 오름차순, 점수)"""
+        indptr, indices = self._postings.indptr, self._postings.indices
+        starts, ends = indptr[cols], indptr[cols + 1]
+        rows = np.concatenate([indices[s:e] for s, e in zip(starts, ends)])
+        if rows.size == 0:
+            return rows, np.zeros(0, dtype=np.float32)
+
+        matched, inverse = np.unique(rows, return_inverse=True)
+        scores = np.bincount(inverse, weights=np.repeat(weights, ends - starts), minlength=matched.size)
+        return matched, scores.astype(np.float32)
+
+    def search(
+        self,
+        ingredients: Iterable[str],
+        top_k: int = 5,
+        expiries: Optional[Dict[str, Optional[date]]] = None,
+        today: Optional[date] = None,
+    ) -> List[Tuple[int, float]]:
+        """
+        가중 점수가 큰 순으로 (행 번호, score) 리스트 반환. 겹치는 재료가 없는 행은 제외.
+        expiries: 재료명 → 예상 유통기한 (있으면 임박한 재료에 보너스)
+        동점이면 행 번호가 작은 쪽이 먼저.
+        """
+        if top_k <= 0 or self.size == 0:
+            return []
+
+        query = self._query_vector(ingredients, expiries, today)
+        if query is None:
+            return []
+
+        matched, scores = self._accumulate(*query)  # 겹치는 재료가 있는 행만
+        if matched.size == 0:
+            return []
+
+        if matched.size > top_k:
+            part = np.argpartition(-scores, top_k - 1)[:top_k]
+            # 경계값 동점 행을 모두 포함해야 행 번호 순 tie-break가 정확하다
+            keep = scores >= scores[part].min()
+            matched, scores = matched[keep], scores[keep]
+
+        order = np.lexsort((matched, -scores))[:top_k]
+        return [(int(matched[i]), float(scores[i])) for i in order]
+
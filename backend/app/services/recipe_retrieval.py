@@ -0,0 +1,150 @@
+# app/services/recipe_retrieval.py
+from __future__ import annotations
+
+import os
+import time
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.services.ingredient_normalizer import normalize_ingredient
+from app.services.recipe_corpus import CorpusState
+
+
+# =====================================
+# 하이브리드 레시피 검색
+#  1) 재료 겹침 (IDF + 유통기한 가중, recipe_index)
+#  2) 레시피 이름/조리 단계 BM25 (recipe_bm25)
+#  3) SentenceTransformer + Chroma dense 검색 (app/vectot_store.py, 선택)
+#  → Reciprocal Rank Fusion 으로 순위 결합
+#  전부 로컬 CPU에서 동작. dense 쪽은 chromadb/sentence-transformers가 없으면
+#  경고 후 빠지고, 검색이 실패하면 잠시 쉬었다가(백오프) 다시 시도한다.
+#  기본은 재료 겹침만 (bench_recipe_retrieval 에서 hybrid 의 recall@5 가 overlap 보다 낮게 나옴)
+# =====================================
+
+# "overlap" (재료 겹침만, 기본) | "hybrid"
+RETRIEVAL_MODE = os.getenv("RECIPE_RETRIEVAL_MODE", "overlap")
+DENSE_ENABLED = os.getenv("RECIPE_DENSE_RETRIEVAL", "1") != "0"
+
+# dense 검색 실패 후 재시도까지 기다리는 시간(초): 실패할 때마다 2배, 최대 MAX
+DENSE_RETRY_SEC = float(os.getenv("RECIPE_DENSE_RETRY_SEC", "30"))
+DENSE_RETRY_MAX_SEC = float(os.getenv("RECIPE_DENSE_RETRY_MAX_SEC", "600"))
+
+# RRF 상수 (순위 r → 1 / (RRF_K + r))
+RRF_K = 60
+# 각 검색기에서 가져올 후보 수 = top_k * CANDIDATE_DEPTH
+CANDIDATE_DEPTH = 10
+# 검색기별 RRF 가중치 (재료 질의에는 재료 겹침 순위가 가장 믿을 만함)
+RRF_WEIGHTS: Dict[str, float] = {"overlap": 1.0, "bm25": 0.5, "dense": 1.0}
+
+# dense 색인 문서 metadata의 source 값 (scripts/index_recipes.py 와 맞춤)
+DENSE_SOURCE_CSV = "csv"
+
+_dense_store: Any = None
+_dense_failed = False  # import 실패 (패키지 없음) → 프로세스 동안 비활성화
+_dense_retry_at = 0.0  # 이 시각(time.monotonic) 전에는 dense 검색을 건너뜀
+_dense_backoff = 0.0
+
+
+def rrf_fuse(
+    rankings: Sequence[Tuple[float, Sequence[int]]],
+    top_k: int,
+    k: int = RRF_K,
+) -> List[Tuple[int, float]]:
+    """
+    (가중치, 순위 리스트[행 번호, 좋은 순]) 들을 가중 RRF로 합쳐 (행 번호, 점수) top_k 반환.
+    동점이면 행 번호가 작은 쪽이 먼저.
+    """
+    fused: Dict[int, float] = {}
+    for weight, ranking in rankings:
+        for rank, row in enumerate(ranking, start=1):
+            fused[row] = fused.get(row, 0.0) + weight / (k + rank)
+    return sorted(fused.items(), key=lambda rs: (-rs[1], rs[0]))[:top_k]
+
+
+# =====================================
+# dense 검색 (app/vectot_store.py 지연 import)
+# =====================================
+
+def _get_dense_store():
+    global _dense_store, _dense_failed
+    if _dense_store is not None or _dense_failed:
+        return _dense_store
+    try:
+        from app import vectot_store
+        _dense_store = vectot_store
+    except Exception as e:
+        _dense_failed = True
+        print(f"[WARN] dense 레시피 검색 비활성화 (vectot_store 로딩 실패): {e}")
+    return _dense_store
+
+
+def dense_search(query: str, top_k: int, row_of_id: Dict[Any, int]) -> List[int]:
+    """Chroma에서 CSV 레시피 문서를 찾아 코퍼스 행 번호 리스트로 변환."""
+    global _dense_retry_at, _dense_backoff
+    if time.monotonic() < _dense_retry_at:
+        return []
+
+    store = _get_dense_store()
+    if store is None:
+        return []
+
+    try:
+        hits = store.query_similar_recipes(query, top_k=top_k)
+    except Exception as e:
+        _dense_backoff = min(max(_dense_backoff * 2, DENSE_RETRY_SEC), DENSE_RETRY_MAX_SEC)
+        _dense_retry_at = time.monotonic() + _dense_backoff
+        print(f"[WARN] dense 레시피 검색 실패 → {_dense_backoff:.0f}초 동안 건너뜀: {e}")
+        return []
+    _dense_backoff = 0.0
+
+    rows: List[int] = []
+    for hit in hits:
+        meta = hit.get("metadata") or {}
+        if meta.get("source") != DENSE_SOURCE_CSV:
+            continue
+        row = row_of_id.get(meta.get("recipe_id"))
+        if row is not None and row not in rows:
+            rows.append(row)
+    return rows
+
+
+# =====================================
+# 결합 검색
+# =====================================
+
+def text_query(ingredients: Sequence[str]) -> str:
+    """BM25 질의: 원래 이름 + 정규화 이름 ("계란" → "계란 달걀")."""
+    names = dict.fromkeys([*ingredients, *(normalize_ingredient(i) for i in ingredients)])
+    return " ".join(n for n in names if n)
+
+
+def search_recipes(
+    state: CorpusState,
+    ingredients: Sequence[str],
+    top_k: int = 5,
+    expiries: Optional[Dict[str, Optional[date]]] = None,
+    mode: Optional[str] = None,
+    use_dense: Optional[bool] = None,
+) -> List[Tuple[int, float]]:
+    """(행 번호, score) 리스트. overlap 모드면 재료 겹침 점수, hybrid 모드면 RRF 점수."""
+    mode = mode or RETRIEVAL_MODE
+    if mode == "overlap":
+        return state.index.search(ingredients, top_k=top_k, expiries=expiries)
+
+    depth = top_k * CANDIDATE_DEPTH
+    rankings: List[Tuple[float, List[int]]] = [
+        (
+            RRF_WEIGHTS["overlap"],
+            [row for row, _ in state.index.search(ingredients, top_k=depth, expiries=expiries)],
+        ),
+        (
+            RRF_WEIGHTS["bm25"],
+            [row for row, _ in state.text_index.search(text_query(ingredients), top_k=depth)],
+        ),
+    ]
+
+    if DENSE_ENABLED if use_dense is None else use_dense:
+        query = f"사용자 재료: {', '.join(ingredients)}"
+        rankings.append((RRF_WEIGHTS["dense"], dense_search(query, depth, state.row_of_id)))
+
+    return rrf_fuse(rankings, top_k)
@@ -0,0 +1,103 @@
+# app/services/recipe_store.py
+from __future__ import annotations
+
+import hashlib
+import unicodedata
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.services.ingredient_normalizer import normalize_ingredient
+
+# -------------------------------------------------------------------
+# 레시피 저장 (중복 제거)
+#  - 내용 지문(fingerprint)이 같은 레시피는 한 행만 유지
+#  - INSERT ... ON CONFLICT (fingerprint) DO NOTHING 으로 한 번에 넣고
+#    지문 목록으로 id를 다시 조회 → 새 행/기존 행 구분 없이 요청 순서대로 반환
+#  - refresh를 행마다 하지 않음 (조회 1번)
+# -------------------------------------------------------------------
+
+
+def _norm_text(text: Any) -> str:
+    text = unicodedata.normalize("NFKC", str(text or "")).lower()
+    return " ".join(text.split())
+
+
+def recipe_fingerprint(title: Any, ingredients: Optional[Sequence[Any]], instructions: Any) -> str:
+    """제목/재료(정규화 + 정렬)/조리 순서(공백 정리)로 만든 sha256 지문."""
+    ings = sorted({normalize_ingredient(str(i)) for i in (ingredients or [])} - {""})
+    payload = "\x1f".join([_norm_text(title), "\x1e".join(ings), _norm_text(instructions)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _insert_ignore(db: Session, rows: List[Dict[str, Any]]) -> None:
+    dialect = db.get_bind().dialect.name
+    table = models.Recipe.__table__
+
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        insert = None
+
+    if insert is not None:
+        stmt = insert(table).on_conflict_do_nothing(index_elements=["fingerprint"])
+        db.execute(stmt, rows)
+        return
+
+    # 그 외 DB: 이미 있는 지문을 빼고 INSERT (동시 삽입 경합은 unique 제약이 막아 줌)
+    existing = set(
+        db.scalars(
+            select(models.Recipe.fingerprint).where(
+                models.Recipe.fingerprint.in_([r["fingerprint"] for r in rows])
+            )
+        )
+    )
+    new_rows = [r for r in rows if r["fingerprint"] not in existing]
+    if new_rows:
+        db.execute(table.insert(), new_rows)
+
+
+def save_recipes(
+    db: Session,
+    suggestions: Sequence[schemas.RecipeSuggestion],
+) -> List[models.Recipe]:
+    """
+    추천 결과를 저장하고 각 추천에 해당하는 Recipe 행을 (요청 순서대로) 반환.
+    이미 같은 지문의 레시피가 있으면 새로 만들지 않고 기존 행을 쓴다.
+    """
+    if not suggestions:
+        return []
+
+    rows: Dict[str, Dict[str, Any]] = {}
+    order: List[str] = []
+    for s in suggestions:
+        fp = recipe_fingerprint(s.title, s.ingredients, s.instructions)
+        order.append(fp)
+        rows.setdefault(
+            fp,
+            {
+                "title": s.title,
+                "ingredients": s.ingredients,
+                "instructions": s.instructions,
+                "source_url": s.source_url,
+                "image_url": s.image_url,
+                "calories": s.calories,
+                "source_type": s.source_type,
+                "fingerprint": fp,
+            },
+        )
+
+    _insert_ignore(db, list(rows.values()))
+    db.commit()
+
+    by_fp = {
+        r.fingerprint: r
+        for r in db.scalars(
+            select(models.Recipe).where(models.Recipe.fingerprint.in_(list(rows)))
+        )
+    }
+    return [by_fp[fp] for fp in order]
@@ -0,0 +1,25 @@
+# app/services/sse.py
+from __future__ import annotations
+
+import json
+from typing import Any
+
+
+# =====================================
+# Server-Sent Events 포맷 헬퍼
+# =====================================
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # nginx 등 프록시 버퍼링 끄기
+}
+
+
+def sse_event(event: str, data: Any) -> str:
+    """
+    event: <이름>
+    data: <JSON>
+    (빈 줄로 이벤트 구분)
+    """
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
@@ -0,0 +1,186 @@
+# app/services/vector_index.py
+from __future__ import annotations
+
+import json
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+
+# -------------------------------------------------------------------
+# 인메모리 벡터 인덱스
+#  - 모든 임베딩을 정규화된 float32 행렬 하나로 묶어두고
+#  - 질의는 행렬-벡터 곱 1번 + argpartition top-k 로 처리
+# -------------------------------------------------------------------
+
+class VectorIndex:
+    """
+    코사인 유사도 검색용 인덱스.
+
+    matrix : (N, D) float32, 각 행은 L2 정규화된 임베딩
+    records: 행과 1:1로 대응하는 메타데이터 dict 리스트 (id/source/text 등)
+    """
+
+    def __init__(
+        self,
+        matrix: np.ndarray,
+        records: Sequence[Dict],
+        normalized: bool = False,
+        meta: Dict[str, Any] | None = None,
+    ):
+        if matrix.ndim != 2:
+            raise ValueError(f"matrix는 2차원이어야 합니다: shape={matrix.shape}")
+        if matrix.shape[0] != len(records):
+            raise ValueError(
+                f"행 수({matrix.shape[0]})와 records 수({len(records)})가 다릅니다."
+            )
+
+        if not normalized:
+            matrix = _normalize_rows(np.asarray(matrix, dtype=np.float32))
+
+        self.matrix = matrix
+        self.records: List[Dict] = list(records)
+        self.ids: List[str] = [r["id"] for r in self.records]
+        # 저장 파일의 부가 정보 (build_id 등)
+        self.meta: Dict[str, Any] = dict(meta or {})
+
+    # ---------------------------------------------------------------
+    # 생성
+    # ---------------------------------------------------------------
+    @classmethod
+    def from_entries(cls, entries: Sequence[Dict]) -> "VectorIndex":
+        """
+        waste_knowledge.json 형식의 엔트리 리스트로부터 인덱스 생성.
+        embedding 필드는 행렬로 옮기고 나머지 필드만 records에 남긴다.
+        """
+        entries = [e for e in entries if e.get("embedding")]
+        if not entries:
+            return cls(np.zeros((0, 0), dtype=np.float32), [], normalized=True)
+
+        matrix = np.asarray([e["embedding"] for e in entries], dtype=np.float32)
+        records = [{k: v for k, v in e.items() if k != "embedding"} for e in entries]
+        return cls(matrix, records)
+
+    def to_entries(self) -> List[Dict]:
+        """from_entries의 역변환. (빌더의 이어하기용, embedding은 정규화된 값)"""
+        return [
+            {**rec, "embedding": self.matrix[i].tolist()}
+            for i, rec in enumerate(self.records)
+        ]
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    @property
+    def dim(self) -> int:
+        return self.matrix.shape[1]
+
+    # ---------------------------------------------------------------
+    # 바이너리 저장/로딩 (.npy 행렬 + .meta.json 사이드카)
+    # ---------------------------------------------------------------
+    def save(self, matrix_path: Path, meta_path: Path, **extra: Any) -> None:
+        """
+        정규화된 float32 행렬은 .npy로, records와 부가 정보는 JSON 사이드카로 저장.
+        각각 TMP 파일에 먼저 쓰고 rename 한다. 행렬 → 메타 순서로 교체하므로
+        로딩 시 count가 맞지 않으면 쓰는 도중인 것으로 판단할 수 있다.
+        """
+        matrix_path = Path(matrix_path)
+        meta_path = Path(meta_path)
+        matrix_path.parent.mkdir(parents=True, exist_ok=True)
+
+        meta = dict(self.meta)
+        meta.update(extra)
+        meta.update(
+            {
+                "version": FORMAT_VERSION,
+                # 저장할 때마다 바뀌는 빌드 식별자 (서비스 쪽 캐시 무효화용)
+                "build_id": uuid.uuid4().hex,
+                "count": len(self),
+                "dim": self.dim,
+                "normalized": True,
+                "records": self.records,
+            }
+        )
+
+        tmp_matrix = matrix_path.with_name(matrix_path.name + ".tmp")
+        with tmp_matrix.open("wb") as f:
+            np.save(f, np.ascontiguousarray(self.matrix, dtype=np.float32))
+        tmp_matrix.replace(matrix_path)
+
+        tmp_meta = meta_path.with_name(meta_path.name + ".tmp")
+        with tmp_meta.open("w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        tmp_meta.replace(meta_path)
+
+        self.meta = {k: v for k, v in meta.items() if k != "records"}
+
+    @classmethod
+    def load(cls, matrix_path: Path, meta_path: Path, mmap: bool = True) -> "VectorIndex":
+        """
+        save()로 저장한 인덱스 로딩.
+        mmap=True면 행렬을 읽기 전용 memory-map으로 열어 여러 워커가 같은 페이지를 공유한다.
+        """
+        with Path(meta_path).open("r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 인덱스 포맷 버전: {meta.get('version')}")
+
+        records = meta.pop("records")
+        count = meta["count"]
+
+        if count == 0:
+            # 빈 배열은 mmap 할 수 없음
+            matrix = np.load(matrix_path)
+        else:
+            matrix = np.load(matrix_path, mmap_mode="r" if mmap else None)
+
+        if matrix.shape != (count, meta["dim"]) or matrix.dtype != np.float32:
+            raise ValueError(
+                f"행렬 파일이 메타데이터와 맞지 않습니다: shape={matrix.shape}, "
+                f"dtype={matrix.dtype}, meta=({count}, {meta['dim']})"
+            )
+
+        return cls(matrix, records, normalized=bool(meta.get("normalized")), meta=meta)
+
+    # ---------------------------------------------------------------
+    # 검색
+    # ---------------------------------------------------------------
+    def search(self, query: Sequence[float], top_k: int = 5) -> List[Tuple[float, Dict]]:
+        """
+        query 임베딩과 코사인 유사도가 높은 순으로 (score, record) 리스트 반환.
+        """
+        n = len(self)
+        if n == 0 or top_k <= 0:
+            return []
+
+        q = np.asarray(query, dtype=np.float32).reshape(-1)
+        if q.shape[0] != self.dim:
+            raise ValueError(f"질의 차원({q.shape[0]})이 인덱스 차원({self.dim})과 다릅니다.")
+
+        norm = float(np.linalg.norm(q))
+        if norm == 0.0:
+            # zero-vector 질의 (API KEY 없음 등) → 유사도 모두 0
+            return []
+        q = q / norm
+
+        scores = self.matrix @ q
+
+        k = min(top_k, n)
+        if k < n:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(n)
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        return [(float(scores[i]), self.records[i]) for i in top]
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0.0] = 1.0
+    return matrix / norms
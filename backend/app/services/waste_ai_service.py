@@ -1,26 +1,72 @@
 # app/services/waste_ai_service.py
 
+import asyncio
 import os
+import re
 import json
+import unicodedata
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from pathlib import Path
-from typing import List, Tuple, Dict
+from typing import Any, AsyncIterator, List, Tuple, Dict
 
+import numpy as np
 import google.generativeai as genai
 from dotenv import load_dotenv
 
+from app.services.answer_cache import SemanticAnswerCache
+from app.services.llm_async import call_upstream, response_text, stream_upstream
+from app.services.local_cache import LocalCache
+from app.services.micro_batcher import MicroBatcher
+from app.services.vector_index import VectorIndex
+
 # -------------------------------------------------------------------
 # 설정
 # -------------------------------------------------------------------
 
 BASE_DIR = Path(__file__).resolve().parents[2]  # backend/
 APP_DIR = BASE_DIR / "app"
-DATA_PATH = APP_DIR / "data" / "waste_knowledge.json"
+DATA_DIR = APP_DIR / "data"
+INDEX_MATRIX_PATH = DATA_DIR / "waste_knowledge.npy"      # 정규화된 float32 임베딩 행렬
+INDEX_META_PATH = DATA_DIR / "waste_knowledge.meta.json"  # id/source/text 사이드카
+DATA_PATH = DATA_DIR / "waste_knowledge.json"              # (구) JSON 포맷
 
 EMBED_MODEL = "text-embedding-004"
 GEN_MODEL = "gemini-2.5-flash"
 
+# 질문 임베딩 캐시 (프로세스 내 LRU + SQLite)
+QUERY_CACHE_PATH = Path(
+    os.getenv("WASTE_QUERY_CACHE_PATH", str(DATA_DIR / "cache" / "query_embeddings.sqlite3"))
+)
+QUERY_CACHE_MAX_ENTRIES = 20000
+QUERY_CACHE_MEMORY_ENTRIES = 1024
+
+# 답변 캐시: 질문 임베딩 유사도 threshold 이상 + 같은 chunk 검색 결과면 이전 답변 재사용
+ANSWER_CACHE_THRESHOLD = float(os.getenv("WASTE_ANSWER_CACHE_THRESHOLD", "0.95"))
+ANSWER_CACHE_TTL_SEC = float(os.getenv("WASTE_ANSWER_CACHE_TTL_SEC", str(24 * 3600)))
+ANSWER_CACHE_MAX_ENTRIES = 2000
+
+# 질문 임베딩 마이크로 배칭: 동시에 들어온 질문들을 embed_content 한 번으로
+EMBED_MAX_BATCH = int(os.getenv("WASTE_EMBED_MAX_BATCH", "32"))
+EMBED_MAX_WAIT_MS = float(os.getenv("WASTE_EMBED_MAX_WAIT_MS", "5"))
+# 배처 결과를 기다리는 최대 시간(초): 넘기면 배처를 거치지 않고 직접 호출
+EMBED_BATCH_TIMEOUT_SEC = float(os.getenv("WASTE_EMBED_BATCH_TIMEOUT_SEC", "10"))
+# embed_content 요청 자체의 타임아웃(초): 멈춘 호출이 배처 스레드를 계속 잡고 있지 않게
+EMBED_REQUEST_TIMEOUT_SEC = float(os.getenv("WASTE_EMBED_REQUEST_TIMEOUT_SEC", "15"))
+
 # 전역 변수
-_WASTE_CHUNKS: List[Dict] = []
+_WASTE_INDEX: VectorIndex | None = None
+_QUERY_CACHE = LocalCache(
+    QUERY_CACHE_PATH,
+    namespace=EMBED_MODEL,
+    max_entries=QUERY_CACHE_MAX_ENTRIES,
+    memory_entries=QUERY_CACHE_MEMORY_ENTRIES,
+)
+_ANSWER_CACHE = SemanticAnswerCache(
+    threshold=ANSWER_CACHE_THRESHOLD,
+    ttl_sec=ANSWER_CACHE_TTL_SEC,
+    max_entries=ANSWER_CACHE_MAX_ENTRIES,
+)
+_INDEX_STAMP: int | None = None  # 로딩한 인덱스 메타 파일의 mtime (재빌드 감지용)
 _GEN_MODEL = None
 _GEMINI_API_KEY = None
 
@@ -45,21 +91,59 @@ def _load_env_and_model():
 
 # -------------------------------------------------------------------
 # 2) waste chunks 로딩 (파일 없으면 서버 안죽음)
+#    - 바이너리 인덱스(.npy + .meta.json)를 mmap으로 열어 워커 간 페이지 공유
+#    - 없으면 (구) waste_knowledge.json 으로 fallback
 # -------------------------------------------------------------------
+def _index_stamp() -> int | None:
+    try:
+        return INDEX_META_PATH.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
 def _load_waste_chunks():
-    global _WASTE_CHUNKS
+    global _WASTE_INDEX, _INDEX_STAMP
+
+    _INDEX_STAMP = _index_stamp()
+
+    if INDEX_MATRIX_PATH.exists() and INDEX_META_PATH.exists():
+        try:
+            _WASTE_INDEX = VectorIndex.load(INDEX_MATRIX_PATH, INDEX_META_PATH, mmap=True)
+            return
+        except Exception as e:
+            print(f"[WARN] waste_knowledge 인덱스 읽기 실패: {e}")
 
     if not DATA_PATH.exists():
-        print(f"[WARN] {DATA_PATH} 파일이 없어 waste AI 기능 비활성화됨.")
-        _WASTE_CHUNKS = []
+        print(f"[WARN] {INDEX_MATRIX_PATH} 파일이 없어 waste AI 기능 비활성화됨.")
+        _WASTE_INDEX = None
         return
 
+    print(
+        "[WARN] (구) waste_knowledge.json 포맷을 사용합니다. "
+        "python -m app.scripts.convert_waste_knowledge 로 변환하세요."
+    )
     try:
         with DATA_PATH.open("r", encoding="utf-8") as f:
-            _WASTE_CHUNKS = json.load(f)
+            entries = json.load(f)
+        # 로딩 시 한 번만 정규화된 float32 행렬로 묶어둔다
+        _WASTE_INDEX = VectorIndex.from_entries(entries)
+        _WASTE_INDEX.meta["build_id"] = f"json-{DATA_PATH.stat().st_mtime_ns}"
     except Exception as e:
         print(f"[WARN] waste_knowledge.json 읽기 실패: {e}")
-        _WASTE_CHUNKS = []
+        _WASTE_INDEX = None
+
+
+def _maybe_reload_waste_chunks():
+    """빌더가 인덱스를 다시 저장했으면(메타 파일 mtime 변경) 새로 로딩."""
+    if _index_stamp() != _INDEX_STAMP:
+        print("[INFO] waste_knowledge 인덱스 변경 감지 → 다시 로딩합니다.")
+        _load_waste_chunks()
+
+
+def _index_version() -> str | None:
+    if _WASTE_INDEX is None:
+        return None
+    return _WASTE_INDEX.meta.get("build_id")
 
 
 # -------------------------------------------------------------------
@@ -69,67 +153,106 @@ try:
     if _GEN_MODEL is None:
         _load_env_and_model()
 
-    if not _WASTE_CHUNKS:
+    if _WASTE_INDEX is None:
         _load_waste_chunks()
 
 except Exception as e:
     print(f"[WARN] waste AI 초기화 실패: {e}")
     print("[WARN] waste 기능 비활성화됨 (서버는 정상 작동)")
-    _WASTE_CHUNKS = []
+    _WASTE_INDEX = None
     _GEN_MODEL = None
 
 
 # -------------------------------------------------------------------
 # 3) 임베딩 (API KEY 없어도 zero-vector 반환)
+#    같은 질문은 캐시에서 꺼내 네트워크 호출 생략
 # -------------------------------------------------------------------
-def _embed_query(text: str) -> List[float]:
-    if not _GEMINI_API_KEY:
-        return [0.0] * 768  # fallback
+_TRAILING_PUNCT = re.compile(r"[\s?？!！.。~]+$")
+
 
+def _normalize_question(text: str) -> str:
+    """캐시 키용 질문 정규화: NFKC, 소문자, 공백 정리, 끝 문장부호 제거."""
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = " ".join(text.split())
+    return _TRAILING_PUNCT.sub("", text)
+
+
+def _embed_batch(texts: List[str]) -> List[np.ndarray]:
+    """질문 여러 개를 embed_content 한 번으로 (MicroBatcher 작업 스레드에서 호출)."""
     resp = genai.embed_content(
         model=EMBED_MODEL,
-        content=text,
+        content=texts,
         task_type="retrieval_query",
+        request_options={"timeout": EMBED_REQUEST_TIMEOUT_SEC},
     )
-    return resp["embedding"]
+    return [np.asarray(e, dtype=np.float32) for e in resp["embedding"]]
 
 
-# -------------------------------------------------------------------
-# 4) 코사인 유사도 (numpy 없이)
-# -------------------------------------------------------------------
-def _cosine_similarity(a: List[float], b: List[float]) -> float:
-    import math
+async def _embed_batch_async(texts: List[str]) -> List[np.ndarray]:
+    """_embed_batch 의 async 버전 (배처를 거치지 않는 직접 호출용)."""
+    resp = await genai.embed_content_async(
+        model=EMBED_MODEL,
+        content=texts,
+        task_type="retrieval_query",
+        request_options={"timeout": EMBED_REQUEST_TIMEOUT_SEC},
+    )
+    return [np.asarray(e, dtype=np.float32) for e in resp["embedding"]]
+
 
-    dot = sum(x * y for x, y in zip(a, b))
-    na = math.sqrt(sum(x * x for x in a))
-    nb = math.sqrt(sum(y * y for y in b))
+_EMBED_BATCHER = MicroBatcher(
+    _embed_batch,
+    max_batch=EMBED_MAX_BATCH,
+    max_wait_ms=EMBED_MAX_WAIT_MS,
+    name="waste-embed-batcher",
+)
 
-    if na == 0.0 or nb == 0.0:
-        return 0.0
-    return dot / (na * nb)
+
+def _embed_query(text: str) -> np.ndarray:
+    if not _GEMINI_API_KEY:
+        return np.zeros(768, dtype=np.float32)  # fallback
+
+    key = _normalize_question(text)
+    cached = _QUERY_CACHE.get(key)
+    if cached is not None:
+        return np.frombuffer(cached, dtype=np.float32)
+
+    fut = _EMBED_BATCHER.submit([text])
+    try:
+        emb = fut.result(EMBED_BATCH_TIMEOUT_SEC)[0]
+    except FutureTimeoutError:
+        # 배처 스레드가 앞선 느린 배치에 묶여 있으면 무한정 기다리지 않는다
+        fut.cancel()  # 아직 대기열에 있으면 배치에서 빠짐
+        print(f"[WARN] 임베딩 배처 응답 {EMBED_BATCH_TIMEOUT_SEC:g}초 초과 → 직접 호출합니다.")
+        emb = _embed_batch([text])[0]
+    _QUERY_CACHE.set(key, emb.tobytes())
+    return emb
+
+
+def get_query_cache_stats() -> Dict[str, int]:
+    """질문 임베딩 캐시 hit/miss 카운터."""
+    return _QUERY_CACHE.stats()
+
+
+def get_answer_cache_stats() -> Dict[str, int]:
+    """답변 캐시 hit/miss 카운터."""
+    return _ANSWER_CACHE.stats()
 
 
 # -------------------------------------------------------------------
-# 5) 유사 chunk 검색
+# 4) 유사 chunk 검색 (VectorIndex: 행렬-벡터 곱 + argpartition)
 # -------------------------------------------------------------------
-def _search_similar_chunks(question: str, top_k: int = 5) -> List[Dict]:
-    q_emb = _embed_query(question)
-    scored = [
-        (_cosine_similarity(q_emb, ch["embedding"]), ch)
-        for ch in _WASTE_CHUNKS
-    ]
-    scored.sort(key=lambda x: x[0], reverse=True)
-    return [ch for sim, ch in scored[:top_k]]
+def _search_similar_chunks(q_emb: np.ndarray, top_k: int = 5) -> List[Dict]:
+    if _WASTE_INDEX is None:
+        return []
+
+    return [ch for sim, ch in _WASTE_INDEX.search(q_emb, top_k=top_k)]
 
 
 # -------------------------------------------------------------------
-# 6) 메인 함수 — AI 키 없어도 정상 동작
+# 5) 공통 단계 (동기/비동기 버전이 함께 사용)
 # -------------------------------------------------------------------
-def answer_waste_question(question: str) -> Tuple[str, List[str]]:
-    """
-    분리수거 질문 처리.
-    AI 모델/데이터 없으면 fallback 안내문만 반환.
-    """
+def _unavailable_answer() -> Tuple[str, List[str]] | None:
+    """AI 키/데이터가 없으면 fallback 안내문, 정상이면 None."""
 
     # API KEY 없으면 fallback
     if not _GEMINI_API_KEY:
@@ -140,24 +263,27 @@ def answer_waste_question(question: str) -> Tuple[str, List[str]]:
             []
         )
 
+    _maybe_reload_waste_chunks()
+
     # 데이터 없으면 fallback
-    if not _WASTE_CHUNKS:
+    if _WASTE_INDEX is None or len(_WASTE_INDEX) == 0:
         return (
             "공식 분리배출 문서 데이터가 없어 분석할 수 없습니다.\n"
-            "관리자에게 waste_knowledge.json 파일 생성을 요청하세요.",
+            "관리자에게 waste_knowledge 인덱스 생성을 요청하세요.",
             []
         )
 
-    # 정상 처리
-    top_chunks = _search_similar_chunks(question, top_k=5)
+    return None
 
-    if not top_chunks:
-        return (
-            "등록된 공식 문서에서 관련 정보를 찾지 못했습니다.\n"
-            "거주하시는 지자체의 생활폐기물 안내를 참고해주세요.",
-            []
-        )
 
+_NO_CHUNKS_ANSWER = (
+    "등록된 공식 문서에서 관련 정보를 찾지 못했습니다.\n"
+    "거주하시는 지자체의 생활폐기물 안내를 참고해주세요.",
+    []
+)
+
+
+def _build_prompt(question: str, top_chunks: List[Dict]) -> str:
     # 문맥 구성
     context_list = [
         f"[출처: {ch['source']}]\n{ch['text']}"
@@ -184,15 +310,160 @@ def answer_waste_question(question: str) -> Tuple[str, List[str]]:
 을 자세히 설명해 주세요.
 """
 
-    full_prompt = system_prompt + "\n\n" + user_prompt
+    return system_prompt + "\n\n" + user_prompt
+
+
+def _sources_of(top_chunks: List[Dict]) -> List[str]:
+    return list({ch["source"] for ch in top_chunks})
+
+
+# -------------------------------------------------------------------
+# 6) 메인 함수 — AI 키 없어도 정상 동작
+# -------------------------------------------------------------------
+def answer_waste_question(question: str) -> Tuple[str, List[str]]:
+    """
+    분리수거 질문 처리.
+    AI 모델/데이터 없으면 fallback 안내문만 반환.
+    """
+    unavailable = _unavailable_answer()
+    if unavailable is not None:
+        return unavailable
+
+    # 정상 처리
+    q_emb = _embed_query(question)
+    top_chunks = _search_similar_chunks(q_emb, top_k=5)
+
+    if not top_chunks:
+        return _NO_CHUNKS_ANSWER
+
+    # 비슷한 질문 + 같은 검색 결과로 이미 답한 적 있으면 LLM 호출 생략
+    chunk_ids = [ch["id"] for ch in top_chunks]
+    version = _index_version()
+    cached = _ANSWER_CACHE.lookup(q_emb, chunk_ids, version)
+    if cached is not None:
+        return cached
 
     # 모델 응답
-    response = _GEN_MODEL.generate_content(full_prompt)
+    response = _GEN_MODEL.generate_content(_build_prompt(question, top_chunks))
+    answer = response_text(response).strip()
+    sources = _sources_of(top_chunks)
+
+    if answer:  # 안전 필터 등으로 빈 응답이면 캐시하지 않음
+        _ANSWER_CACHE.store(q_emb, chunk_ids, version, answer, sources)
+
+    return answer, sources
+
+
+# -------------------------------------------------------------------
+# 7) 비동기 버전 — 이벤트 루프를 막지 않고 LLM 호출 대기
+#    (업스트림별 동시성 제한 + 타임아웃은 llm_async.call_upstream)
+# -------------------------------------------------------------------
+async def _embed_query_async(text: str) -> np.ndarray:
+    if not _GEMINI_API_KEY:
+        return np.zeros(768, dtype=np.float32)  # fallback
+
+    # 질문 캐시는 SQLite 파일 I/O → 이벤트 루프 밖(스레드)에서 읽고 쓴다
+    key = _normalize_question(text)
+    cached = await asyncio.to_thread(_QUERY_CACHE.get, key)
+    if cached is not None:
+        return np.frombuffer(cached, dtype=np.float32)
+
+    emb = await call_upstream("gemini-embed", lambda: _embed_via_batcher_async(text))
+    await asyncio.to_thread(_QUERY_CACHE.set, key, emb.tobytes())
+    return emb
+
+
+async def _embed_via_batcher_async(text: str) -> np.ndarray:
+    """배처 결과를 EMBED_BATCH_TIMEOUT_SEC 까지만 기다리고, 넘으면 async 직접 호출."""
+    fut = _EMBED_BATCHER.submit([text])
     try:
-        answer = response.text.strip()
-    except AttributeError:
-        answer = response.candidates[0].content.parts[0].text.strip()
+        embs = await asyncio.wait_for(asyncio.wrap_future(fut), EMBED_BATCH_TIMEOUT_SEC)
+    except asyncio.TimeoutError:
+        fut.cancel()  # 아직 대기열에 있으면 배치에서 빠짐
+        print(f"[WARN] 임베딩 배처 응답 {EMBED_BATCH_TIMEOUT_SEC:g}초 초과 → 직접 호출합니다.")
+        embs = await _embed_batch_async([text])
+    return embs[0]
+
 
-    sources = list({ch["source"] for ch in top_chunks})
+async def answer_waste_question_async(question: str) -> Tuple[str, List[str]]:
+    """answer_waste_question의 async 버전."""
+    # 인덱스 변경 확인/재로딩은 파일 I/O → 스레드에서
+    unavailable = await asyncio.to_thread(_unavailable_answer)
+    if unavailable is not None:
+        return unavailable
+
+    q_emb = await _embed_query_async(question)
+    top_chunks = _search_similar_chunks(q_emb, top_k=5)
+
+    if not top_chunks:
+        return _NO_CHUNKS_ANSWER
+
+    chunk_ids = [ch["id"] for ch in top_chunks]
+    version = _index_version()
+    cached = _ANSWER_CACHE.lookup(q_emb, chunk_ids, version)
+    if cached is not None:
+        return cached
+
+    prompt = _build_prompt(question, top_chunks)
+    response = await call_upstream(
+        "gemini-generate",
+        lambda: _GEN_MODEL.generate_content_async(prompt),
+    )
+    answer = response_text(response).strip()
+    sources = _sources_of(top_chunks)
+
+    if answer:  # 안전 필터 등으로 빈 응답이면 캐시하지 않음
+        _ANSWER_CACHE.store(q_emb, chunk_ids, version, answer, sources)
 
     return answer, sources
+
+
+# -------------------------------------------------------------------
+# 8) 스트리밍 버전 — 검색된 출처를 먼저, 이후 답변 조각을 순서대로 yield
+#    ("sources", {...}) → ("delta", {...}) * N → ("done", {...})
+# -------------------------------------------------------------------
+async def stream_waste_answer(question: str) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    unavailable = await asyncio.to_thread(_unavailable_answer)
+    if unavailable is None:
+        q_emb = await _embed_query_async(question)
+        top_chunks = _search_similar_chunks(q_emb, top_k=5)
+        if not top_chunks:
+            unavailable = _NO_CHUNKS_ANSWER
+
+    # fallback 안내문도 같은 이벤트 순서로 보낸다
+    if unavailable is not None:
+        answer, sources = unavailable
+        yield "sources", {"sources": sources}
+        yield "delta", {"text": answer}
+        yield "done", {"question": question, "answer": answer, "sources": sources}
+        return
+
+    sources = _sources_of(top_chunks)
+    yield "sources", {"sources": sources}
+
+    chunk_ids = [ch["id"] for ch in top_chunks]
+    version = _index_version()
+    cached = _ANSWER_CACHE.lookup(q_emb, chunk_ids, version)
+    if cached is not None:
+        answer, sources = cached
+        yield "delta", {"text": answer}
+        yield "done", {"question": question, "answer": answer, "sources": sources}
+        return
+
+    prompt = _build_prompt(question, top_chunks)
+    parts: List[str] = []
+    async for chunk in stream_upstream(
+        "gemini-generate",
+        lambda: _GEN_MODEL.generate_content_async(prompt, stream=True),
+    ):
+        text = response_text(chunk)
+        if not text:
+            continue
+        parts.append(text)
+        yield "delta", {"text": text}
+
+    answer = "".join(parts).strip()
+    if answer:  # 안전 필터 등으로 빈 응답이면 캐시하지 않음
+        _ANSWER_CACHE.store(q_emb, chunk_ids, version, answer, sources)
+
+    yield "done", {"question": question, "answer": answer, "sources": sources}
@@ -8,6 +8,8 @@ import chromadb
 from chromadb.config import Settings
 from sentence_transformers import SentenceTransformer
 
+from app.services import embed_model
+
 
 # =====================================
 # 0. Chroma 클라이언트 & 컬렉션 설정
@@ -28,28 +30,40 @@ _collection = _client.get_or_create_collection(name="recipes")
 
 # =====================================
 # 1. 임베딩 모델 (한국어 지원)
+#    로딩/양자화/사이드카 선택은 app/services/embed_model.py
 # =====================================
 
-_EMBED_MODEL_NAME = "jhgan/ko-sroberta-multitask"
-_embed_model: SentenceTransformer | None = None
+_EMBED_MODEL_NAME = embed_model.EMBED_MODEL_NAME
+
+# model.encode 내부 배치 크기 (CPU 메모리/속도 trade-off)
+ENCODE_BATCH_SIZE = 64
 
 
 def get_embed_model() -> SentenceTransformer:
     """
     SentenceTransformer 모델을 lazy하게 한 번만 로딩.
     """
-    global _embed_model
-    if _embed_model is None:
-        _embed_model = SentenceTransformer(_EMBED_MODEL_NAME)
-    return _embed_model
+    return embed_model.get_model()
+
+
+def encode_texts(texts: List[str], batch_size: int = ENCODE_BATCH_SIZE) -> List[List[float]]:
+    """텍스트 리스트 → 임베딩 리스트 (EMBED_SERVER_SOCKET 설정 시 사이드카에서 인코딩)."""
+    return embed_model.encode(texts, batch_size=batch_size)
 
 
 # =====================================
 # 2. 레시피 문서 upsert
 # =====================================
 
-def upsert_recipes(docs: List[Dict[str, Any]]) -> None:
+def upsert_recipes(
+    docs: List[Dict[str, Any]],
+    batch_size: int = ENCODE_BATCH_SIZE,
+    persist: bool = True,
+) -> None:
     """
+    batch_size: 인코딩 배치 크기
+    persist: False면 디스크 반영을 미룬다 (대량 색인 시 마지막에 persist_store() 한 번)
+
     docs 예시:
     [
       {
@@ -63,12 +77,11 @@ def upsert_recipes(docs: List[Dict[str, Any]]) -> None:
     if not docs:
         return
 
-    model = get_embed_model()
     texts = [d["text"] for d in docs]
     ids = [d["id"] for d in docs]
     metadatas = [d.get("meta", {}) for d in docs]
 
-    embeddings = model.encode(texts).tolist()  # List[List[float]]
+    embeddings = encode_texts(texts, batch_size=batch_size)  # List[List[float]]
 
     _collection.upsert(
         ids=ids,
@@ -77,7 +90,23 @@ def upsert_recipes(docs: List[Dict[str, Any]]) -> None:
         documents=texts,
     )
 
-    _client.persist()
+    if persist:
+        persist_store()
+
+
+def persist_store() -> None:
+    """컬렉션 변경 사항을 디스크에 반영 (persist가 없는 클라이언트 버전이면 아무 것도 안 함)."""
+    persist = getattr(_client, "persist", None)
+    if persist is not None:
+        persist()
+
+
+def get_metadatas(ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """이미 색인된 문서들의 metadata (id → meta). 없는 id는 빠진다."""
+    if not ids:
+        return {}
+    res = _collection.get(ids=ids, include=["metadatas"])
+    return {i: (m or {}) for i, m in zip(res.get("ids", []), res.get("metadatas") or [])}
 
 
 # =====================================
@@ -99,8 +128,7 @@ def query_similar_recipes(query: str, top_k: int = 5) -> List[Dict[str, Any]]:
       ...
     ]
     """
-    model = get_embed_model()
-    q_emb = model.encode([query]).tolist()[0]
+    q_emb = encode_texts([query])[0]
 
     res = _collection.query(
         query_embeddings=[q_emb],